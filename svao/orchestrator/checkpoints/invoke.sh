@@ -166,55 +166,30 @@ build_file_overlap() {
     local prd_file="$1"
     local state_file="$2"
 
-    local ready_tasks
-    ready_tasks=$(jq -r '.queue.ready[]?' "$state_file" 2>/dev/null || echo "")
-    local in_progress
-    in_progress=$(jq -r '.queue.in_progress[]?' "$state_file" 2>/dev/null || echo "")
-
-    if [[ -z "$ready_tasks" || -z "$in_progress" ]]; then
-        echo "No potential file conflicts detected."
-        return
-    fi
-
-    # Get files for in-progress tasks
-    local active_files=""
-    while IFS= read -r task_id; do
-        [[ -z "$task_id" ]] && continue
-        local files
-        files=$(jq -r --arg id "$task_id" '.sections[]?.tasks[]? | select(.id == $id) | .files[]?' "$prd_file" 2>/dev/null || true)
-        active_files="$active_files"$'\n'"$files"
-    done <<< "$in_progress"
-    active_files=$(echo "$active_files" | grep -v '^$' | sort -u || true)
-
-    if [[ -z "$active_files" ]]; then
-        echo "No potential file conflicts detected."
-        return
-    fi
-
-    echo "**In-progress files:** $(echo "$active_files" | tr '\n' ', ' | sed 's/,$//')"
-    echo ""
-    echo "**Conflicts with ready tasks:**"
-
-    local has_conflicts=false
-    while IFS= read -r task_id; do
-        [[ -z "$task_id" ]] && continue
-        local task_files
-        task_files=$(jq -r --arg id "$task_id" '.sections[]?.tasks[]? | select(.id == $id) | .files[]?' "$prd_file" 2>/dev/null || true)
-
-        if [[ -n "$task_files" && -n "$active_files" ]]; then
-            local overlap
-            overlap=$(comm -12 <(echo "$active_files" | sort) <(echo "$task_files" | sort) 2>/dev/null || true)
-
-            if [[ -n "$overlap" ]]; then
-                has_conflicts=true
-                echo "- Task $task_id conflicts: $(echo "$overlap" | tr '\n' ', ' | sed 's/,$//')"
-            fi
-        fi
-    done <<< "$ready_tasks"
-
-    if [[ "$has_conflicts" == "false" ]]; then
-        echo "- None detected"
-    fi
+    # One pass over prd.json: a ready task can only conflict on a file in
+    # file_index (files more than one task edits), so only those are compared
+    jq -r --slurpfile state "$state_file" '
+        ($state[0].queue.ready // []) as $ready
+        | ($state[0].queue.in_progress // []) as $in_progress
+        | ([.sections[]?.tasks[]? | {key: .id, value: (.files // [])}] | from_entries) as $files
+        | (.file_index // ([.sections[]?.tasks[]? | .id as $id | (.files // [])[] | {file: ., id: $id}]
+                           | group_by(.file) | map(select(length > 1) | {key: .[0].file, value: map(.id)})
+                           | from_entries)) as $index
+        | ([$in_progress[] | $files[.] // [] | .[]] | unique) as $active_files
+        | if ($ready | length) == 0 or ($in_progress | length) == 0 or ($active_files | length) == 0 then
+            "No potential file conflicts detected."
+          else
+            ([$ready[] as $id
+              | [($files[$id] // [])[] | select($index[.] != null and IN($active_files[]))]
+              | unique
+              | select(length > 0)
+              | "- Task \($id) conflicts: \(join(","))"]) as $conflicts
+            | "**In-progress files:** \($active_files | join(","))",
+              "",
+              "**Conflicts with ready tasks:**",
+              (if ($conflicts | length) > 0 then $conflicts[] else "- None detected" end)
+          end
+    ' "$prd_file" 2>/dev/null || echo "No potential file conflicts detected."
 }
 
 # Build section tasks for completion review
@@ -0,0 +1,681 @@
+#!/usr/bin/env python3
+"""
+SVAO PRD Compiler
+Compiles OpenSpec (tasks.md, proposal.md) into prd.json and prd-state.json
+in a single process: parse, infer, merge, and write each file once.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import re
+import sys
+import time
+from collections import Counter
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stderr, redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+
+import jsonio
+from compile_cache import CompileCache, source_digest
+from inference import (
+    STRATEGIES,
+    STRATEGY_EXECUTORS,
+    DependencyGraph,
+    build_dependency_graph,
+    build_file_index,
+    infer_dependencies,
+)
+from model import EdgeTable
+from parser import parse_tasks_file, section_to_dict, validate_dependencies
+
+# Colors
+RED = '\033[0;31m'
+GREEN = '\033[0;32m'
+YELLOW = '\033[1;33m'
+BLUE = '\033[0;34m'
+NC = '\033[0m'
+
+PRD_VERSION = "1.0.0"
+
+# Inferred dependencies at or above this confidence are applied automatically
+CONFIDENCE_THRESHOLD = 70
+
+# Modules whose source makes up the compile cache's tool version
+TOOL_SOURCES = ("compile.py", "parser.py", "inference.py", "model.py")
+
+# The compiled_at line of a prd.json, restamped when reusing a cached compile
+COMPILED_AT_PATTERN = re.compile(r'"compiled_at": ?"[^"]*"')
+
+# Where compile.sh looks for change directories, in lookup order
+CHANGE_ROOTS = ("openspec/changes", ".claude/changes", "changes")
+
+# prd.json writes source_hash near the top; batch mode only reads this much
+SOURCE_HASH_PATTERN = re.compile(r'"source_hash": ?"(sha256:[0-9a-f]+)"')
+SOURCE_HASH_PREFIX_BYTES = 4096
+
+# orchestrator.inference.strategies.<name>.enabled switches strategies off
+REGISTRY_FILE = Path(__file__).resolve().parent.parent / "agents" / "registry.json"
+
+# Agent type inference (only applied when agent_type is not set explicitly)
+# Note: test-writer removed - with TDD, frontend-coder/api-builder write tests first
+# Phase-level test review is handled by phase-reviewer at section completion
+API_FILE_PATTERNS = re.compile(
+    r'convex/|schema\.ts|mutations\.ts|queries\.ts|/api/|\.api\.(ts|js)$|functions/|server/'
+)
+API_DESCRIPTION_PATTERNS = re.compile(
+    r'\bapi\b|\bmutation|\bquery|\bschema\b|\bconvex\b|\bendpoint|\bbackend\b|\bdatabase\b'
+)
+
+
+def log(message: str = "") -> None:
+    print(message)
+
+
+def log_info(message: str) -> None:
+    print(f"{BLUE}i{NC} {message}")
+
+
+def log_success(message: str) -> None:
+    print(f"{GREEN}✓{NC} {message}")
+
+
+def log_warn(message: str) -> None:
+    print(f"{YELLOW}!{NC} {message}")
+
+
+def log_error(message: str) -> None:
+    print(f"{RED}x{NC} {message}", file=sys.stderr)
+
+
+class CompileError(Exception):
+    """Raised when a change cannot be compiled."""
+
+    def __init__(self, message: str, details: list[str] | None = None, exit_code: int = 2):
+        super().__init__(message)
+        self.details = details or []
+        self.exit_code = exit_code
+
+
+def report_compile_error(e: CompileError) -> None:
+    log_error(str(e))
+    for detail in e.details:
+        print(f"   - {detail}", file=sys.stderr)
+
+
+def file_hash(path: Path) -> str:
+    """Return the sha256 of a file in the 'sha256:<hex>' form used by the PRD."""
+    digest = hashlib.sha256()
+    with path.open('rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return f"sha256:{digest.hexdigest()}"
+
+
+def extract_context_summary(proposal_file: Path) -> str:
+    """Return the first paragraph lines after the '# ' heading, whitespace-collapsed."""
+    lines: list[str] = []
+    found = False
+    with proposal_file.open() as f:
+        for line in f:
+            if line.startswith('# '):
+                found = True
+                continue
+            if line.startswith('## '):
+                break
+            if found:
+                lines.append(line)
+                if len(lines) == 5:
+                    break
+    return ' '.join(' '.join(lines).split())
+
+
+def load_enabled_strategies(registry_file: Path) -> list[str]:
+    """Return the inference strategies not disabled in registry.json."""
+    config = {}
+    if registry_file.is_file():
+        try:
+            registry = json.loads(registry_file.read_text())
+            config = registry.get('orchestrator', {}).get('inference', {}).get('strategies', {})
+        except (OSError, json.JSONDecodeError) as e:
+            log_warn(f"Could not read {registry_file}, running all inference strategies ({e})")
+
+    for name in config:
+        if name not in STRATEGIES:
+            log_warn(f"Unknown inference strategy in registry: {name}")
+
+    return [name for name in STRATEGIES if config.get(name, {}).get('enabled', True)]
+
+
+def report_strict_failure(pending: Iterable[dict]) -> None:
+    pending = list(pending)
+    log_error(f"Strict mode: {len(pending)} dependencies need review")
+    for dep in pending:
+        print(json.dumps(dep, indent=2, ensure_ascii=False))
+
+
+def log_strategy_stats(strategy_stats: list[dict]) -> None:
+    for stats in strategy_stats:
+        if not stats['enabled']:
+            log(f"  {stats['name']:<18} disabled")
+            continue
+        memory = ""
+        if stats['peak_memory_bytes'] is not None:
+            memory = f", peak {stats['peak_memory_bytes'] // 1024} KB"
+        log(f"  {stats['name']:<18} {stats['edges']:>8} edges  {stats['seconds']:.3f}s ({stats['cost_class']}{memory})")
+
+
+def infer_agent_type(task: dict) -> str:
+    """Pick api-builder for backend work, frontend-coder otherwise."""
+    if any(API_FILE_PATTERNS.search(f) for f in task.get('files') or []):
+        return "api-builder"
+    if API_DESCRIPTION_PATTERNS.search((task.get('description') or '').lower()):
+        return "api-builder"
+    # Default to frontend-coder (handles components, hooks, pages, AND writes tests via TDD)
+    return "frontend-coder"
+
+
+def apply_dependencies(sections: list[dict], inferred: EdgeTable) -> tuple[list[dict], DependencyGraph]:
+    """
+    Merge inferred dependencies into each task's depends_on and fill in blocks.
+
+    Returns the explicit dependency list (taken from depends_on before
+    merging) and the merged dependency graph.
+    """
+    tasks = [task for section in sections for task in section['tasks']]
+
+    explicit = [{"from": task['id'], "to": dep} for task in tasks for dep in task['depends_on']]
+
+    graph = build_dependency_graph(tasks, inferred.pairs())
+    for task in tasks:
+        task['depends_on'] = list(graph.forward[task['id']])
+        task['blocks'] = list(graph.reverse[task['id']])
+        if not task.get('agent_type'):
+            task['agent_type'] = infer_agent_type(task)
+
+    return explicit, graph
+
+
+def build_prd(
+    change_id: str,
+    timestamp: str,
+    source_hash: str,
+    summary: str,
+    sections: list[dict],
+    inferred: dict,
+) -> dict:
+    """Assemble prd.json from parsed sections and inference results."""
+    explicit, graph = apply_dependencies(sections, inferred['auto_apply'])
+
+    return {
+        "$schema": "../../../.claude/svao/schemas/prd.schema.json",
+        "version": PRD_VERSION,
+        "change_id": change_id,
+        "compiled_at": timestamp,
+        "source_hash": source_hash,
+        "context": {
+            "summary": summary,
+            "proposal_file": "proposal.md",
+            "design_file": "design.md"
+        },
+        "success_criteria": {
+            "tests_pass": "pnpm test",
+            "lint_clean": "pnpm lint",
+            "type_check": "pnpm type-check"
+        },
+        "sections": sections,
+        "dependencies": {
+            "explicit": explicit,
+            "inferred": inferred['auto_apply'],
+            "pending_review": inferred['pending_review']
+        },
+        "dependency_graph": graph.to_dict(),
+        "file_index": build_file_index([task for section in sections for task in section['tasks']]),
+        "summary": {
+            "total_sections": len(sections),
+            "total_tasks": sum(len(s['tasks']) for s in sections),
+            "explicit_dependencies": len(explicit),
+            "inferred_dependencies": len(inferred['auto_apply']),
+            "pending_review": len(inferred['pending_review'])
+        }
+    }
+
+
+def build_state(prd: dict, prd_hash: str, timestamp: str) -> dict:
+    """Initialize prd-state.json, respecting tasks pre-completed in tasks.md."""
+    tasks = [task for section in prd['sections'] for task in section['tasks']]
+
+    completed = [t['id'] for t in tasks if t['completed']]
+    ready = [t['id'] for t in tasks if not t['completed'] and not t['depends_on']]
+    blocked = [t['id'] for t in tasks if not t['completed'] and t['depends_on']]
+    total = prd['summary']['total_tasks']
+
+    return {
+        "$schema": "../../../.claude/svao/schemas/prd-state.schema.json",
+        "version": PRD_VERSION,
+        "change_id": prd['change_id'],
+        "prd_file": "prd.json",
+        "prd_hash": prd_hash,
+        "session": {
+            "id": f"svao-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
+            "started_at": timestamp,
+            "updated_at": timestamp,
+            "iteration": 0,
+            "status": "pending"
+        },
+        "tasks": {
+            t['id']: {"status": "completed" if t['completed'] else "pending", "retries": 0}
+            for t in tasks
+        },
+        "queue": {
+            "ready": ready,
+            "in_progress": [],
+            "blocked": blocked,
+            "completed": completed
+        },
+        "discovered_dependencies": [],
+        "checkpoints": {
+            "last_queue_planning": None,
+            "last_iteration_at_checkpoint": 0,
+            "history": []
+        },
+        "metrics": {
+            "tasks_completed": 0,
+            "tasks_failed": 0,
+            "total_retries": 0,
+            "agents_used": {},
+            "avg_task_duration_seconds": 0,
+            "parallel_utilization": 0
+        },
+        "summary": {
+            "total_tasks": total,
+            "completed": len(completed),
+            "in_progress": 0,
+            "blocked": len(blocked),
+            "ready": len(ready),
+            "pending": total - len(ready) - len(blocked) - len(completed),
+            "progress_percent": len(completed) * 100 // total if total > 0 else 0
+        }
+    }
+
+
+def print_counts(state: dict, auto_count: int, ready_note: str) -> None:
+    summary = state['summary']
+    log(f"  Progress:     {summary['progress_percent']}% ({summary['completed']}/{summary['total_tasks']} completed)")
+    log(f"  Ready:        {summary['ready']} ({ready_note})")
+    log(f"  Blocked:      {summary['blocked']} (waiting on dependencies)")
+    log(f"  Dependencies: {auto_count} applied automatically")
+    log()
+
+
+def compile_change(
+    change_dir: Path,
+    change_id: str,
+    dry_run: bool = False,
+    skip_inference: bool = False,
+    strict: bool = False,
+    keyword_window: int | None = None,
+    keyword_same_section: bool = False,
+    reduce: bool = True,
+    parallel: str | None = None,
+    trace_memory: bool = False,
+    registry_file: Path = REGISTRY_FILE,
+    confidence_threshold: int = CONFIDENCE_THRESHOLD,
+    no_cache: bool = False,
+    pretty: bool = True,
+) -> int:
+    """Compile one change directory. Returns the process exit code."""
+    tasks_file = change_dir / "tasks.md"
+    proposal_file = change_dir / "proposal.md"
+    prd_file = change_dir / "prd.json"
+    state_file = change_dir / "prd-state.json"
+    parse_cache_file = change_dir / "prd.parse-cache.json"
+
+    if not tasks_file.is_file():
+        raise CompileError(f"Required file not found: {tasks_file}", exit_code=1)
+
+    log_info(f"Compiling: {change_id}")
+    log_info(f"Source: {change_dir}")
+
+    # Calculate source hash (also keys the per-section parse cache)
+    source_hash = file_hash(tasks_file)
+    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    strategies = [] if skip_inference else load_enabled_strategies(registry_file)
+
+    # Unchanged input under the same compiler and options: reuse the finished prd.json
+    cache = None if no_cache else CompileCache.from_env()
+    cache_key = None
+    cached_json = None
+    if cache is not None:
+        cache_key = CompileCache.key({
+            "tool": source_digest([Path(__file__).resolve().parent / name for name in TOOL_SOURCES]),
+            "change_id": change_id,
+            "source_hash": source_hash,
+            "proposal_hash": file_hash(proposal_file) if proposal_file.is_file() else None,
+            "confidence_threshold": confidence_threshold,
+            "skip_inference": skip_inference,
+            "keyword_window": keyword_window,
+            "keyword_same_section": keyword_same_section,
+            "reduce": reduce,
+            "strategies": strategies,
+            "pretty": pretty,
+        })
+        cached_json = cache.get(cache_key)
+
+    if cached_json is not None:
+        separator = ": " if pretty else ":"
+        prd_json = COMPILED_AT_PATTERN.sub(f'"compiled_at"{separator}"{timestamp}"', cached_json, count=1)
+        prd = jsonio.loads(prd_json)
+        sections = prd['sections']
+        auto_count = prd['summary']['inferred_dependencies']
+        pending_count = prd['summary']['pending_review']
+        log_success(f"Reused cached compile of unchanged input ({auto_count} inferred, {pending_count} need review)")
+
+        if strict and pending_count > 0:
+            report_strict_failure(prd['dependencies']['pending_review'])
+            return 2
+    else:
+        # Parse tasks.md (only sections changed since the last compile are re-tokenized)
+        log("Parsing tasks.md...")
+        parsed = parse_tasks_file(tasks_file, None if dry_run else parse_cache_file, source_hash)
+        parsed.errors.extend(validate_dependencies(parsed.sections))
+        if parsed.errors:
+            raise CompileError("Failed to parse tasks.md", parsed.errors)
+
+        sections = [section_to_dict(s) for s in parsed.sections]
+        task_count = sum(len(s['tasks']) for s in sections)
+        log_success(f"Parsed {len(sections)} sections, {task_count} tasks")
+
+        # Infer dependencies
+        inferred = {"auto_apply": EdgeTable(), "pending_review": EdgeTable(), "pruned": 0, "strategies": []}
+        inference_failed = False
+        if not skip_inference:
+            log("Inferring dependencies...")
+            try:
+                inferred = infer_dependencies(
+                    {"sections": sections},
+                    confidence_threshold=confidence_threshold,
+                    keyword_window=keyword_window,
+                    keyword_same_section=keyword_same_section,
+                    reduce=reduce,
+                    columnar=True,
+                    parallel=parallel,
+                    strategies=strategies,
+                    trace_memory=trace_memory
+                )
+            except Exception as e:
+                inference_failed = True
+                log_warn(f"Dependency inference failed, continuing without ({e})")
+
+            auto_count = len(inferred['auto_apply'])
+            review_count = len(inferred['pending_review'])
+            pruned = f" ({inferred['pruned']} redundant pruned)" if inferred['pruned'] else ""
+            log_success(f"Inferred {auto_count} high-confidence{pruned}, {review_count} need review")
+            log_strategy_stats(inferred['strategies'])
+
+            if strict and review_count > 0:
+                report_strict_failure(inferred['pending_review'].iter_dicts())
+                return 2
+
+        # Extract context from proposal.md
+        summary = ""
+        if proposal_file.is_file():
+            summary = extract_context_summary(proposal_file)
+            log_success("Extracted context from proposal.md")
+
+        prd = build_prd(change_id, timestamp, source_hash, summary, sections, inferred)
+        log("Inferring agent types...")
+        agent_counts = Counter(t['agent_type'] for s in sections for t in s['tasks'])
+        log_success(f"Agent types: {json.dumps(dict(sorted(agent_counts.items())))}")
+
+        auto_count = len(inferred['auto_apply'])
+        pending_count = len(inferred['pending_review'])
+        prd_json = None  # Streamed straight to prd.json below
+
+    if dry_run:
+        state = build_state(prd, "", timestamp)
+        log()
+        log("━" * 60)
+        log_info("Dry run - compilation preview")
+        log()
+        print_counts(state, auto_count, "can execute immediately")
+        log("  Would write:")
+        log(f"    - {prd_file}")
+        log(f"    - {state_file}")
+        log("━" * 60)
+
+        # Show first few ready tasks (incomplete only)
+        ready = state['queue']['ready']
+        tasks_by_id = {t['id']: t for s in sections for t in s['tasks']}
+        log()
+        log_info("First tasks ready to execute:")
+        for task_id in ready[:5]:
+            log(f"  {task_id}: {tasks_by_id[task_id]['description']}")
+        if len(ready) > 5:
+            log(f"  ... and {len(ready) - 5} more")
+
+        if pending_count > 0:
+            log()
+            log_info(f"{pending_count} low-confidence dependencies available for optional review")
+
+        log()
+        log_info("Run without --dry-run to compile")
+        return 0
+
+    # Write PRD file; its hash covers prd.json itself (dispatch.sh verifies prd.json, not tasks.md)
+    if prd_json is not None:
+        prd_hash = f"sha256:{jsonio.write_text(prd_file, prd_json)}"
+    else:
+        prd_hash = f"sha256:{jsonio.write(prd_file, prd, pretty)}"
+        # A failed inference must not be replayed from the cache
+        if cache is not None and not inference_failed:
+            cache.put_file(cache_key, prd_file)
+    log_success(f"Written: {prd_file}")
+
+    state = build_state(prd, prd_hash, timestamp)
+    jsonio.write(state_file, state, pretty)
+    log_success(f"Initialized: {state_file}")
+
+    # Summary
+    log()
+    log("━" * 60)
+    log_success("Compilation complete!")
+    log()
+    print_counts(state, auto_count, "can execute now")
+    log(f"  PRD:   {prd_file}")
+    log(f"  State: {state_file}")
+    log("━" * 60)
+    log()
+    log_success("Ready to execute!")
+    log_info(f"Run: svao.sh dispatch {change_id}")
+
+    if pending_count > 0:
+        log()
+        log_info(f"Optional: {pending_count} low-confidence dependencies available for review")
+        log_info(f"Run: svao.sh deps review {change_id}")
+
+    return 0
+
+
+def discover_changes(base: Path = Path(".")) -> list[tuple[str, Path]]:
+    """
+    Find every change directory containing a tasks.md.
+
+    Roots are searched in compile.sh's lookup order; if a change ID exists
+    under several roots, the first one wins, as it would for a single compile.
+    """
+    found: dict[str, Path] = {}
+    for root in CHANGE_ROOTS:
+        root_dir = base / root
+        if not root_dir.is_dir():
+            continue
+        for change_dir in sorted(root_dir.iterdir()):
+            if change_dir.name not in found and (change_dir / "tasks.md").is_file():
+                found[change_dir.name] = change_dir
+    return list(found.items())
+
+
+def compiled_source_hash(prd_file: Path) -> str | None:
+    """Read source_hash from an existing prd.json, parsing only its head when possible."""
+    try:
+        with prd_file.open() as f:
+            head = f.read(SOURCE_HASH_PREFIX_BYTES)
+        match = SOURCE_HASH_PATTERN.search(head)
+        if match:
+            return match.group(1)
+        return jsonio.load(prd_file).get('source_hash')
+    except (OSError, ValueError):
+        return None
+
+
+def is_up_to_date(change_dir: Path) -> bool:
+    """True if prd.json and prd-state.json exist and prd.json matches the current tasks.md."""
+    if not (change_dir / "prd-state.json").is_file():
+        return False
+    return compiled_source_hash(change_dir / "prd.json") == file_hash(change_dir / "tasks.md")
+
+
+def compile_captured(change_dir: Path, change_id: str, options: dict) -> tuple[int, float, str]:
+    """
+    Pool worker: compile one change with its log captured.
+
+    Returns (exit code, seconds, output) so the parent can print each
+    change's log as one block instead of interleaving workers.
+    """
+    output = io.StringIO()
+    started = time.perf_counter()
+    with redirect_stdout(output), redirect_stderr(output):
+        try:
+            exit_code = compile_change(change_dir, change_id, **options)
+        except CompileError as e:
+            report_compile_error(e)
+            exit_code = e.exit_code
+        except Exception as e:
+            # One broken change must not take down the rest of the batch
+            log_error(f"Unexpected error: {e}")
+            exit_code = 1
+    return exit_code, time.perf_counter() - started, output.getvalue()
+
+
+def compile_all(options: dict, jobs: int | None = None, force: bool = False) -> int:
+    """
+    Compile every discovered change, skipping those whose prd.json already
+    matches tasks.md. Stale changes compile in parallel across a process
+    pool. Returns the process exit code (2 if any change failed).
+    """
+    changes = discover_changes()
+    if not changes:
+        raise CompileError(
+            "No change directories found",
+            [f"Looked in: {', '.join(root + '/' for root in CHANGE_ROOTS)}"],
+            exit_code=1
+        )
+
+    results: dict[str, tuple[str, float]] = {}
+    stale = []
+    for change_id, change_dir in changes:
+        if not force and is_up_to_date(change_dir):
+            results[change_id] = ("unchanged", 0.0)
+        else:
+            stale.append((change_id, change_dir))
+
+    log_info(f"Batch compile: {len(stale)} of {len(changes)} changes need compiling")
+
+    started = time.perf_counter()
+    if stale:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                pool.submit(compile_captured, change_dir, change_id, options): change_id
+                for change_id, change_dir in stale
+            }
+            for future in as_completed(futures):
+                change_id = futures[future]
+                exit_code, seconds, output = future.result()
+                results[change_id] = ("compiled" if exit_code == 0 else "failed", seconds)
+                log()
+                log(f"── {change_id} " + "─" * max(0, 56 - len(change_id)))
+                print(output, end="")
+    elapsed = time.perf_counter() - started
+
+    counts = Counter(status for status, _ in results.values())
+    width = max(len(change_id) for change_id, _ in changes)
+    log()
+    log("━" * 60)
+    summary = (f"Batch compile: {counts['compiled']} compiled, {counts['unchanged']} unchanged, "
+               f"{counts['failed']} failed ({elapsed:.2f}s)")
+    if counts['failed']:
+        log_warn(summary)
+    else:
+        log_success(summary)
+    log()
+    for change_id, _ in changes:
+        status, seconds = results[change_id]
+        timing = f"{seconds:6.2f}s" if status != "unchanged" else ""
+        log(f"  {change_id:<{width}}  {status:<9}  {timing}".rstrip())
+    log("━" * 60)
+
+    return 2 if counts['failed'] else 0
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compile an OpenSpec change into prd.json")
+    arg_parser.add_argument("change_dir", type=Path, nargs="?", help="Change directory containing tasks.md")
+    arg_parser.add_argument("--change-id", help="Change ID (defaults to the directory name)")
+    arg_parser.add_argument("--all", action="store_true",
+                            help=f"Compile every change under {', '.join(CHANGE_ROOTS)} whose tasks.md changed")
+    arg_parser.add_argument("--force", action="store_true", help="With --all, recompile unchanged changes too")
+    arg_parser.add_argument("--jobs", type=int, metavar="N", help="With --all, compile N changes at once (default: CPU count)")
+    arg_parser.add_argument("--dry-run", action="store_true", help="Show what would be generated without writing")
+    arg_parser.add_argument("--skip-inference", action="store_true", help="Don't infer dependencies, only use explicit")
+    arg_parser.add_argument("--strict", action="store_true", help="Fail if any dependency needs review")
+    arg_parser.add_argument("--keyword-window", type=int, metavar="N",
+                            help="Keep only the N nearest earlier tasks per keyword rule")
+    arg_parser.add_argument("--keyword-same-section", action="store_true",
+                            help="Only infer keyword dependencies within a section")
+    arg_parser.add_argument("--no-reduce", action="store_true",
+                            help="Keep inferred dependencies already implied by other dependencies")
+    arg_parser.add_argument("--parallel", choices=sorted(STRATEGY_EXECUTORS),
+                            help="Run inference strategies concurrently in a process or thread pool")
+    arg_parser.add_argument("--profile-memory", action="store_true",
+                            help="Record each inference strategy's peak memory (slower)")
+    arg_parser.add_argument("--compact", action="store_true",
+                            help="Write prd.json and prd-state.json without indentation")
+    arg_parser.add_argument("--no-cache", action="store_true",
+                            help="Don't reuse or store compiled prd.json in the compile cache")
+    args = arg_parser.parse_args()
+
+    if args.all and (args.change_dir or args.change_id):
+        arg_parser.error("--all cannot be combined with a change directory or --change-id")
+    if not args.all and not args.change_dir:
+        arg_parser.error("a change directory is required (or use --all)")
+
+    options = {
+        "dry_run": args.dry_run,
+        "skip_inference": args.skip_inference,
+        "strict": args.strict,
+        "keyword_window": args.keyword_window,
+        "keyword_same_section": args.keyword_same_section,
+        "reduce": not args.no_reduce,
+        "parallel": args.parallel,
+        "trace_memory": args.profile_memory,
+        "no_cache": args.no_cache,
+        "pretty": not args.compact,
+    }
+
+    try:
+        if args.all:
+            exit_code = compile_all(options, jobs=args.jobs, force=args.force)
+        else:
+            exit_code = compile_change(args.change_dir, args.change_id or args.change_dir.name, **options)
+    except CompileError as e:
+        report_compile_error(e)
+        exit_code = e.exit_code
+
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+SVAO Compile Cache
+Content-addressed store of finished prd.json documents, keyed by everything
+that determines them, with size-bounded least-recently-used eviction.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+
+# Default bound on the cache directory (override with SVAO_CACHE_MAX_MB)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """$SVAO_CACHE_DIR, else $XDG_CACHE_HOME/svao, else ~/.cache/svao."""
+    if os.environ.get("SVAO_CACHE_DIR"):
+        return Path(os.environ["SVAO_CACHE_DIR"])
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    return (Path(xdg) if xdg else Path.home() / ".cache") / "svao"
+
+
+def source_digest(paths: list[Path]) -> str:
+    """sha256 over the given files, used as the compiler's tool version."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+@dataclass
+class CompileCache:
+    """
+    Compiled prd.json documents under <root>/compile/<key>.json.
+
+    A hit refreshes the entry's mtime, so eviction (oldest mtime first, run
+    after every store) drops the least recently used entries once the
+    directory grows past max_bytes. Writes are atomic, so concurrent batch
+    compiles can share one cache.
+    """
+    root: Path
+    max_bytes: int = DEFAULT_MAX_BYTES
+
+    @classmethod
+    def from_env(cls) -> "CompileCache | None":
+        """Cache configured from the environment, or None if SVAO_COMPILE_CACHE=0."""
+        if os.environ.get("SVAO_COMPILE_CACHE", "1") == "0":
+            return None
+        max_mb = os.environ.get("SVAO_CACHE_MAX_MB")
+        return cls(default_cache_dir(), int(max_mb) * 1024 * 1024 if max_mb else DEFAULT_MAX_BYTES)
+
+    @property
+    def entries_dir(self) -> Path:
+        return self.root / "compile"
+
+    @staticmethod
+    def key(inputs: dict) -> str:
+        """Derive the cache key from a JSON-serializable description of the inputs."""
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        entry = self.entries_dir / f"{key}.json"
+        try:
+            text = entry.read_text(encoding="utf-8")
+            os.utime(entry)
+        except OSError:
+            return None
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        self._store(key, lambda tmp: tmp.write_text(text, encoding="utf-8"))
+
+    def put_file(self, key: str, path: Path) -> None:
+        """Store a copy of an already-written file (avoids holding it in memory)."""
+        self._store(key, lambda tmp: shutil.copyfile(path, tmp))
+
+    def _store(self, key: str, write) -> None:
+        entry = self.entries_dir / f"{key}.json"
+        try:
+            self.entries_dir.mkdir(parents=True, exist_ok=True)
+            tmp = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+            write(tmp)
+            os.replace(tmp, entry)
+        except OSError:
+            return  # The cache is an optimization; never fail a compile over it
+        self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used entries until under max_bytes. Returns the count removed."""
+        entries = []
+        total = 0
+        for entry in self.entries_dir.glob("*.json"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue  # Evicted concurrently
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+
+        removed = 0
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
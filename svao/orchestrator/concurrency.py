@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+SVAO Adaptive Concurrency
+AIMD control of how many agents dispatch runs at once. Each evaluation
+samples the host (1-minute load average per CPU, available memory) and the
+agent failure rate since the previous evaluation. Any sign of overload
+halves the limit; a healthy host with every slot in use adds one. The
+limit stays within [min, max], and decisions are recorded under
+metrics.concurrency in prd-state.json.
+"""
+
+import argparse
+import math
+import os
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+import jsonio
+
+# Overload thresholds (any one triggers a decrease)
+LOAD_HIGH = 1.0         # 1-minute load average per CPU
+MEMORY_LOW = 0.10       # Fraction of RAM available
+FAILURE_HIGH = 0.5      # Failed attempts / attempts since the last evaluation
+
+# Headroom required before adding a slot
+LOAD_OK = 0.7
+MEMORY_OK = 0.20
+
+DECREASE_FACTOR = 0.5
+INCREASE_STEP = 1
+
+# Seconds between evaluations, so the lagging load average can follow a change
+EVALUATION_INTERVAL = 30
+
+# Decisions kept in metrics.concurrency.decisions
+DECISION_HISTORY = 20
+
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+@dataclass(slots=True)
+class HostSample:
+    load_per_cpu: float
+    memory_available: float | None  # None where /proc/meminfo is missing (macOS)
+
+
+def sample_host() -> HostSample:
+    load = os.getloadavg()[0] / (os.cpu_count() or 1)
+    memory = None
+    try:
+        meminfo = {}
+        for line in Path("/proc/meminfo").read_text().splitlines():
+            name, _, value = line.partition(":")
+            meminfo[name] = int(value.split()[0])
+        memory = meminfo["MemAvailable"] / meminfo["MemTotal"]
+    except (OSError, KeyError, ValueError, ZeroDivisionError):
+        pass
+    return HostSample(round(load, 2), None if memory is None else round(memory, 3))
+
+
+def adjust(record: dict | None, metrics: dict, sample: HostSample, active: int,
+           min_limit: int, max_limit: int, now: datetime) -> tuple[dict, bool]:
+    """
+    Evaluate the limit. Returns the (new) metrics.concurrency record and
+    whether it changed; between evaluations the record is returned as is.
+
+    Examples:
+        adjust(None, {}, HostSample(0.3, 0.6), 0, 1, 4, now) -> ({"limit": 4, ...}, True)
+        adjust(record, metrics, HostSample(1.8, 0.6), 4, 1, 4, later)  -> limit 2 ("load")
+    """
+    if record and record.get("min") == min_limit and record.get("max") == max_limit:
+        decided_at = datetime.strptime(record["decided_at"], TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+        if (now - decided_at).total_seconds() < EVALUATION_INTERVAL:
+            return record, False
+        record = dict(record)
+    else:
+        # First evaluation, or the bounds changed: start from the ceiling
+        record = {"limit": max_limit, "min": min_limit, "max": max_limit, "decisions": []}
+
+    completed = metrics.get("tasks_completed", 0)
+    failed = metrics.get("total_retries", 0)  # Every failed attempt counts as a retry
+    window = record.get("window") or {"completed": completed, "failed": failed}
+    new_completed = completed - window["completed"]
+    new_failed = failed - window["failed"]
+    failure_rate = new_failed / (new_completed + new_failed) if new_completed + new_failed else 0.0
+
+    limit = min(max(record["limit"], min_limit), max_limit)
+    reasons = []
+    if sample.load_per_cpu > LOAD_HIGH:
+        reasons.append("load")
+    if sample.memory_available is not None and sample.memory_available < MEMORY_LOW:
+        reasons.append("memory")
+    if new_failed >= 2 and failure_rate > FAILURE_HIGH:
+        reasons.append("failures")
+
+    if reasons:
+        new_limit = max(min_limit, math.floor(limit * DECREASE_FACTOR))
+        reason = "+".join(reasons)
+    elif (active >= limit and sample.load_per_cpu < LOAD_OK
+          and (sample.memory_available is None or sample.memory_available > MEMORY_OK)):
+        new_limit = min(max_limit, limit + INCREASE_STEP)
+        reason = "headroom"
+    else:
+        new_limit, reason = limit, None
+
+    timestamp = now.strftime(TIMESTAMP_FORMAT)
+    sample_fields = {
+        "load_per_cpu": sample.load_per_cpu,
+        "memory_available": sample.memory_available,
+        "failure_rate": round(failure_rate, 2)
+    }
+    if new_limit != limit:
+        decision = {"timestamp": timestamp, "from": limit, "to": new_limit, "reason": reason, **sample_fields}
+        record["decisions"] = (record.get("decisions") or [])[-(DECISION_HISTORY - 1):] + [decision]
+    record.update(limit=new_limit, decided_at=timestamp, sample=sample_fields,
+                  window={"completed": completed, "failed": failed})
+    return record, True
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Adjust the adaptive dispatch concurrency limit")
+    arg_parser.add_argument("state_file", type=Path, help="Path to prd-state.json (metrics.concurrency updated in place)")
+    arg_parser.add_argument("--active", type=int, required=True, help="Agents running now")
+    arg_parser.add_argument("--min", type=int, default=1, dest="min_limit", help="Lowest limit (default: 1)")
+    arg_parser.add_argument("--max", type=int, required=True, dest="max_limit", help="Highest limit")
+    args = arg_parser.parse_args()
+
+    if not args.state_file.exists():
+        print(f"❌ File not found: {args.state_file}", file=sys.stderr)
+        sys.exit(1)
+    if not 1 <= args.min_limit <= args.max_limit:
+        print(f"❌ Need 1 <= --min <= --max (got {args.min_limit}, {args.max_limit})", file=sys.stderr)
+        sys.exit(1)
+
+    state = jsonio.load(args.state_file)
+    metrics = state.setdefault("metrics", {})
+    record, changed = adjust(metrics.get("concurrency"), metrics, sample_host(), args.active,
+                             args.min_limit, args.max_limit, datetime.now(timezone.utc))
+    if changed:
+        metrics["concurrency"] = record
+        jsonio.write(args.state_file, state, pretty=True)
+    print(record["limit"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+SVAO Orchestrator Daemon
+Holds one change's prd.json and prd-state.json in memory for a dispatch
+session and serves state_store.py's commands over a Unix socket, so a
+query or update costs what the event costs instead of a re-read and
+re-parse of both files. prd-state.json is flushed shortly after changes
+(a burst of updates becomes one write) and on shutdown. With --journal,
+every change is also appended to the session journal (see journal.py),
+which is fsynced with each flush.
+
+Protocol: one JSON object per line in each direction.
+    -> {"argv": ["get", "queue", "ready"]}
+    <- {"status": 0, "stdout": "1.1\\n1.2\\n", "stderr": ""}
+
+Besides the state_store.py commands the daemon answers:
+    prd-task ID [FIELD] [--default X]   a task from prd.json
+    ping                                liveness check
+    shutdown                            flush and exit
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import signal
+import sys
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+import jsonio
+from journal import Journal
+from state_store import READ_COMMANDS, StateStore, build_parser, print_value, run_command
+
+# Seconds to wait after a change before flushing, so a burst is written once
+DEFAULT_FLUSH_DELAY = 0.5
+
+# Seconds between checks that the launching process is still alive
+PARENT_POLL_INTERVAL = 2.0
+
+DAEMON_READ_COMMANDS = READ_COMMANDS | {"prd-task", "ping", "shutdown"}
+
+
+class Daemon:
+    """
+    In-memory PRD and state for one change.
+
+    State lives in an in-memory StateStore, so every update has exactly
+    the semantics (and incremental scheduling) of the on-disk store.
+
+    Examples:
+        daemon = Daemon(Path("prd.json"), Path("prd-state.json"))
+        daemon.execute(["task-status", "1.1", "completed"]) -> {"status": 0, ...}
+        await daemon.serve(Path("/tmp/svao/daemon.sock"))
+    """
+
+    def __init__(self, prd_file: Path, state_file: Path, flush_delay: float = DEFAULT_FLUSH_DELAY,
+                 journal_file: Path | None = None):
+        self.prd_file = prd_file
+        self.state_file = state_file
+        self.flush_delay = flush_delay
+        self.journal = Journal(journal_file) if journal_file else None
+
+        self.prd = jsonio.load(prd_file)
+        self.tasks = {task["id"]: task for section in self.prd["sections"] for task in section["tasks"]}
+        self.store = StateStore(Path(":memory:"))
+        self.store.import_state(jsonio.load(state_file))
+
+        self.parser, commands = build_parser("SVAO orchestrator daemon")
+        command = commands.add_parser("prd-task", help="Print a prd.json task or one of its fields")
+        command.add_argument("task_id")
+        command.add_argument("field", nargs="?")
+        command.add_argument("--default", help="Printed when the value is missing or null")
+        commands.add_parser("ping", help="Check that the daemon is up")
+        commands.add_parser("shutdown", help="Flush prd-state.json and exit")
+
+        self.changed = asyncio.Event()
+        self.stopping = asyncio.Event()
+        self.flush_lock = asyncio.Lock()
+
+    def load_prd(self, path: Path) -> dict:
+        """rebuild-queue's PRD: the one in memory unless another file is named."""
+        if path.resolve() == self.prd_file.resolve():
+            return self.prd
+        return jsonio.load(path)
+
+    def execute(self, argv: list[str]) -> tuple[dict, bool]:
+        """
+        Run one command. Returns the response and whether the caller must
+        flush before replying (export).
+        """
+        out, err = io.StringIO(), io.StringIO()
+        status = 0
+        flush_now = False
+        with redirect_stdout(out), redirect_stderr(err):
+            try:
+                args = self.parser.parse_args([str(self.state_file), *argv])
+                if args.command == "import":
+                    raise ValueError("import is not available while the daemon owns the state")
+                if args.command == "export":
+                    if args.stdout:
+                        jsonio.dump(self.store.export_state(), sys.stdout, pretty=not args.compact)
+                    else:
+                        flush_now = True
+                elif args.command == "prd-task":
+                    task = self.tasks.get(args.task_id)
+                    value = task if args.field is None or task is None else task.get(args.field)
+                    print_value(value, args.default)
+                elif args.command == "ping":
+                    print("pong")
+                elif args.command == "shutdown":
+                    self.stopping.set()
+                elif run_command(self.store, args, self.load_prd) and self.journal:
+                    self.journal.append_command(args)
+                if args.command not in DAEMON_READ_COMMANDS:
+                    self.changed.set()
+            except SystemExit as e:  # argparse errors and --help
+                status = e.code if isinstance(e.code, int) else 1
+            except ValueError as e:
+                print(f"❌ {e}", file=sys.stderr)
+                status = 1
+        return {"status": status, "stdout": out.getvalue(), "stderr": err.getvalue()}, flush_now
+
+    async def flush(self) -> None:
+        """Write the prd-state.json snapshot (atomically, off the event loop)."""
+        async with self.flush_lock:
+            self.changed.clear()
+            state = self.store.export_state()
+            await asyncio.to_thread(jsonio.write, self.state_file, state, True)
+            if self.journal:
+                await asyncio.to_thread(self.journal.sync)
+
+    async def flush_on_change(self) -> None:
+        while True:
+            await self.changed.wait()
+            await asyncio.sleep(self.flush_delay)
+            if self.changed.is_set():
+                await self.flush()
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    argv = jsonio.loads(line)["argv"]
+                except (ValueError, KeyError, TypeError):
+                    response, flush_now = {"status": 1, "stdout": "", "stderr": "❌ Malformed request\n"}, False
+                else:
+                    response, flush_now = self.execute([str(arg) for arg in argv])
+                if flush_now:
+                    await self.flush()
+                writer.write(jsonio.dumps(response).encode() + b"\n")
+                await writer.drain()
+                if self.stopping.is_set():
+                    break  # Don't leave a handler waiting on a closing server
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def watch_parent(self, parent_pid: int) -> None:
+        """Shut down if the dispatch loop that started us is gone."""
+        while True:
+            await asyncio.sleep(PARENT_POLL_INTERVAL)
+            try:
+                os.kill(parent_pid, 0)
+            except ProcessLookupError:
+                self.stopping.set()
+                return
+            except PermissionError:
+                pass  # Exists, owned by someone else
+
+    async def serve(self, socket_path: Path, parent_pid: int | None = None) -> None:
+        if socket_path.exists():
+            socket_path.unlink()
+        server = await asyncio.start_unix_server(self.handle_client, path=str(socket_path))
+        os.chmod(socket_path, 0o600)
+
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, self.stopping.set)
+
+        background = [asyncio.create_task(self.flush_on_change())]
+        if parent_pid:
+            background.append(asyncio.create_task(self.watch_parent(parent_pid)))
+
+        async with server:
+            await self.stopping.wait()
+        for task in background:
+            task.cancel()
+        await self.flush()
+        self.store.close()
+        if self.journal:
+            self.journal.close()
+        socket_path.unlink(missing_ok=True)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Serve a change's PRD and state over a Unix socket")
+    arg_parser.add_argument("prd_file", type=Path, help="Path to prd.json")
+    arg_parser.add_argument("state_file", type=Path, help="Path to prd-state.json (flushed on change)")
+    arg_parser.add_argument("--socket", type=Path, required=True, help="Unix socket to listen on")
+    arg_parser.add_argument("--flush-delay", type=float, default=DEFAULT_FLUSH_DELAY,
+                            help=f"Seconds to batch changes before writing the state file (default: {DEFAULT_FLUSH_DELAY})")
+    arg_parser.add_argument("--parent-pid", type=int, help="Exit when this process exits")
+    arg_parser.add_argument("--journal", type=Path, help="Session journal to record changes in")
+    args = arg_parser.parse_args()
+
+    for path in (args.prd_file, args.state_file):
+        if not path.exists():
+            print(f"❌ File not found: {path}", file=sys.stderr)
+            sys.exit(1)
+
+    async def run() -> None:
+        await Daemon(args.prd_file, args.state_file, args.flush_delay, args.journal).serve(args.socket, args.parent_pid)
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+SVAO Daemon Client
+Sends one command to a running daemon.py (state_store.py commands) or
+supervisor.py and relays its output and exit status. Standard library
+only, so a call costs little more than the interpreter start.
+
+Examples:
+    daemon_client.py /tmp/svao/daemon-123.sock get queue ready
+    daemon_client.py --wait 5 /tmp/svao/daemon-123.sock ping
+"""
+
+import argparse
+import json
+import socket
+import sys
+import time
+
+
+def request(socket_path: str, argv: list[str], wait: float = 0) -> dict:
+    """Send argv and return the daemon's response, retrying the connect for up to `wait` seconds."""
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(socket_path)
+                sock.sendall(json.dumps({"argv": argv}).encode() + b"\n")
+                with sock.makefile("rb") as reply:
+                    line = reply.readline()
+            break
+        except (FileNotFoundError, ConnectionRefusedError):
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+    if not line:
+        raise ConnectionError("daemon closed the connection without replying")
+    return json.loads(line)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Run a state command on the SVAO daemon")
+    arg_parser.add_argument("socket", help="Daemon socket path")
+    arg_parser.add_argument("--wait", type=float, default=0, help="Seconds to keep retrying while the daemon starts")
+    arg_parser.add_argument("argv", nargs=argparse.REMAINDER, help="Command, e.g. as for state_store.py")
+    args = arg_parser.parse_args()
+
+    try:
+        response = request(args.socket, args.argv, args.wait)
+    except (OSError, ConnectionError) as e:
+        print(f"❌ Daemon not reachable at {args.socket}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    sys.exit(response["status"])
+
+
+if __name__ == "__main__":
+    main()
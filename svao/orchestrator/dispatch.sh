@@ -41,64 +41,246 @@ PROGRESS_WRITER="$SCRIPT_DIR/progress-writer.sh"
 # PR creator
 PR_CREATOR="$SCRIPT_DIR/pr-creator.sh"
 
+# State backend: "json" rewrites prd-state.json through jq on every update;
+# "sqlite" applies each update as one transaction on prd-state.db (see
+# state_store.py) and exports prd-state.json at save_state and checkpoints;
+# "daemon" keeps prd.json and the state in memory in daemon.py for the
+# whole session and serves the same commands over a Unix socket
+STATE_BACKEND="${SVAO_STATE_BACKEND:-json}"
+STATE_STORE="$SCRIPT_DIR/state_store.py"
+DAEMON="$SCRIPT_DIR/daemon.py"
+DAEMON_CLIENT="$SCRIPT_DIR/daemon_client.py"
+DAEMON_SOCKET=""
+DAEMON_PID=""
+
+# Ready-queue scheduler (dependency counters instead of a per-task rescan).
+# The queue policy orders ready tasks: "id" by task ID, "critical-path" by
+# the weighted length of the dependency chain each task gates
+SCHEDULER="$SCRIPT_DIR/scheduler.py"
+QUEUE_POLICY="${SVAO_QUEUE_POLICY:-id}"
+
+# Agent supervision: "shell" runs each agent in a background subshell and
+# polls .active_pids; "asyncio" hands agents to supervisor.py, which awaits
+# their exits and streams their output
+AGENT_SUPERVISOR="${SVAO_SUPERVISOR:-shell}"
+SUPERVISOR="$SCRIPT_DIR/supervisor.py"
+SUPERVISOR_SOCKET=""
+SUPERVISOR_PID=""
+
+# Duration history: records each completed task, predicts P50/P90 for the
+# live display's ETA and the critical-path queue policy
+DURATIONS="$SCRIPT_DIR/durations.py"
+
+# Session journal: every state change, as the state_store.py command that
+# makes it, appended to journal/<session>.ndjson next to prd-state.json.
+# Resume replays it instead of re-deriving state (see journal.py)
+JOURNAL="$SCRIPT_DIR/journal.py"
+JOURNAL_FILE=""
+
+# Streams agent output and emits early signal events (see signals.py)
+SIGNAL_SCANNER="$SCRIPT_DIR/signals.py"
+
+# Confidence recorded for dependencies agents report (DISCOVERED_DEPENDENCY)
+AGENT_DEPENDENCY_CONFIDENCE="${AGENT_DEPENDENCY_CONFIDENCE:-90}"
+
+# Adaptive concurrency: MAX_PARALLEL becomes a ceiling and concurrency.py
+# moves the limit between MIN_PARALLEL and it (AIMD on host load, free
+# memory and agent failure rate)
+ADAPTIVE_PARALLEL="${SVAO_ADAPTIVE_PARALLEL:-false}"
+MIN_PARALLEL="${MIN_PARALLEL:-1}"
+CONCURRENCY="$SCRIPT_DIR/concurrency.py"
+PARALLEL_LIMIT=""
+
 # State (use temp files since bash associative arrays don't export well)
 ITERATION=0
 SESSION_ID=""
 STATUS_DIR=""
 ACTIVE_FILE=""
 RETRIES_FILE=""
-EVENT_FIFO=""
 
 # Event-driven configuration
 EVENT_TIMEOUT="${EVENT_TIMEOUT:-30}"  # Seconds to wait for events before running periodic tasks
+EVENT_COALESCE="${EVENT_COALESCE:-0.2}"  # Seconds to wait for more events of a burst before one queue rebuild
+EVENT_BATCH_MAX="${EVENT_BATCH_MAX:-64}"  # Most events handled per queue rebuild
+EVENT_LATE_MS="${EVENT_LATE_MS:-5000}"  # Events older than this when handled count as late
+
+# Event channel: agents, the supervisor and phase reviewers send events as
+# datagrams to events.sock; the relay (see events.py) is its only reader
+# and writes them to FD 3, one framed line each
+EVENTS="$SCRIPT_DIR/events.py"
+EVENT_SOCKET=""
+EVENT_RELAY_PID=""
+EVENT_BATCH=()
+EVENT_INDEX=0  # Position in EVENT_BATCH of the event being processed
+
+# Event counters, recorded as metrics.events
+EVENTS_RECEIVED=0
+EVENT_BATCHES=0
+EVENTS_COALESCED=0
+EVENTS_LATE=0
+EVENTS_DROPPED=0
+EVENTS_SPOOLED=0
+EVENT_MAX_LATENCY_MS=0
 
 # ─────────────────────────────────────────────────────────────
-# Event FIFO Management
+# Event Channel
 # ─────────────────────────────────────────────────────────────
 
-setup_event_fifo() {
-  EVENT_FIFO="$STATUS_DIR/events.fifo"
-
-  # Remove stale FIFO if exists
-  [[ -p "$EVENT_FIFO" ]] && rm -f "$EVENT_FIFO"
+setup_event_channel() {
+  EVENT_SOCKET="$STATUS_DIR/events.sock"
+  rm -f "$EVENT_SOCKET"
 
-  # Create new FIFO
-  mkfifo "$EVENT_FIFO"
+  # Read the relay on FD 3; events spooled while no relay ran are delivered first
+  exec 3< <(exec python3 "$EVENTS" relay "$EVENT_SOCKET" --parent-pid $$)
+  EVENT_RELAY_PID=$!
 
-  # Open FIFO for reading on FD 3 (non-blocking by opening for write too)
-  exec 3<>"$EVENT_FIFO"
+  local waited=0
+  until [[ -S "$EVENT_SOCKET" ]]; do
+    if [[ $waited -ge 100 ]] || ! kill -0 "$EVENT_RELAY_PID" 2>/dev/null; then
+      log_error "Event relay failed to start"
+      exit 1
+    fi
+    sleep 0.1
+    waited=$((waited + 1))
+  done
 
-  log_info "Event FIFO created: $EVENT_FIFO"
+  log_info "Event channel ready: $EVENT_SOCKET (relay pid $EVENT_RELAY_PID)"
 }
 
-teardown_event_fifo() {
-  # Close FD 3
-  exec 3<&- 2>/dev/null || true
+# Safe to run more than once (the loop's end and the EXIT trap both call it)
+teardown_event_channel() {
+  if [[ -n "$EVENT_RELAY_PID" ]]; then
+    kill "$EVENT_RELAY_PID" 2>/dev/null || true
+    wait "$EVENT_RELAY_PID" 2>/dev/null || true
+    EVENT_RELAY_PID=""
+  fi
 
-  # Remove FIFO
-  [[ -n "$EVENT_FIFO" && -p "$EVENT_FIFO" ]] && rm -f "$EVENT_FIFO"
+  # Braces keep the 2>/dev/null from staying on the shell's stderr
+  { exec 3<&-; } 2>/dev/null || true
+
+  # Events sent from now on are spooled for the next relay (e.g. on --resume)
+  if [[ -n "$EVENT_SOCKET" ]]; then
+    rm -f "$EVENT_SOCKET"
+  fi
 }
 
 emit_event() {
   local event_type="$1"
   local identifier="$2"
 
-  if [[ -n "$EVENT_FIFO" && -p "$EVENT_FIFO" ]]; then
-    echo "${event_type}:${identifier}" >> "$EVENT_FIFO"
+  if [[ -n "$EVENT_SOCKET" ]]; then
+    python3 "$EVENTS" send "$EVENT_SOCKET" "${event_type}:${identifier}" || true
   fi
 }
 
-read_event() {
+# Wait up to TIMEOUT seconds for an event, then collect the rest of its
+# burst (events arriving within EVENT_COALESCE of each other, up to
+# EVENT_BATCH_MAX) into EVENT_BATCH, so they share one queue rebuild.
+# Returns 1 if no event arrived.
+read_events() {
   local timeout="${1:-$EVENT_TIMEOUT}"
-  local event=""
+  local seq sent_ms source event status
+
+  EVENT_BATCH=()
+  EVENT_INDEX=0
+  while [[ ${#EVENT_BATCH[@]} -lt $EVENT_BATCH_MAX ]]; do
+    status=0
+    IFS=$'\t' read -t "$timeout" -r seq sent_ms source event <&3 || status=$?
+    if [[ $status -eq 0 ]]; then
+      note_event "$sent_ms" "$source" "$event"
+      EVENT_BATCH+=("$event")
+      timeout="$EVENT_COALESCE"
+      continue
+    fi
+    if [[ $status -le 128 ]]; then
+      # End of file: the relay exited. Restart it; events sent meanwhile were spooled
+      log_warn "Event relay exited, restarting it"
+      teardown_event_channel
+      setup_event_channel
+    fi
+    break
+  done
 
-  # Read with timeout from FD 3
-  if read -t "$timeout" -r event <&3 2>/dev/null; then
-    echo "$event"
-    return 0
+  if [[ ${#EVENT_BATCH[@]} -eq 0 ]]; then
+    return 1
+  fi
+  EVENT_BATCHES=$((EVENT_BATCHES + 1))
+  EVENTS_COALESCED=$((EVENTS_COALESCED + ${#EVENT_BATCH[@]} - 1))
+}
+
+# Whether a TASK_* event for TASK_ID comes later in the batch being processed
+exit_event_pending() {
+  local task_id="$1"
+  local event
+
+  for event in "${EVENT_BATCH[@]:EVENT_INDEX+1}"; do
+    if [[ "$event" == "TASK_COMPLETE:$task_id" || "$event" == "TASK_FAILED:$task_id" ]]; then
+      return 0
+    fi
+  done
+  return 1
+}
+
+# Count one received event: SENT_MS SOURCE EVENT
+note_event() {
+  local sent_ms="$1"
+  local source="$2"
+  local event="$3"
+
+  EVENTS_RECEIVED=$((EVENTS_RECEIVED + 1))
+  if [[ "$source" == "spool" ]]; then
+    EVENTS_SPOOLED=$((EVENTS_SPOOLED + 1))
+  fi
+  if [[ "$event" == EVENTS_DROPPED:* ]]; then
+    EVENTS_DROPPED=$((EVENTS_DROPPED + ${event#*:}))
+  fi
+
+  local now_ms
+  if [[ -n "${EPOCHREALTIME:-}" ]]; then
+    now_ms=$(( ${EPOCHREALTIME/[.,]/} / 1000 ))
+  else
+    now_ms="$(date +%s)000"
+  fi
+  local latency=$((now_ms - sent_ms))
+  if [[ $latency -gt $EVENT_MAX_LATENCY_MS ]]; then
+    EVENT_MAX_LATENCY_MS=$latency
+  fi
+  if [[ $latency -gt $EVENT_LATE_MS ]]; then
+    EVENTS_LATE=$((EVENTS_LATE + 1))
+  fi
+}
+
+# Continue the counters of an interrupted session
+load_event_metrics() {
+  local state_file="$1"
+  local events
+
+  if state_managed; then
+    events=$(state_store "$state_file" get metrics events --default '{}')
+  else
+    events=$(jq -c '.metrics.events // {}' "$state_file")
   fi
+  read -r EVENTS_RECEIVED EVENT_BATCHES EVENTS_COALESCED EVENTS_LATE EVENTS_DROPPED EVENTS_SPOOLED \
+    EVENT_MAX_LATENCY_MS < <(jq -r '[.received, .batches, .coalesced, .late, .dropped, .spooled,
+      .max_latency_ms] | map(. // 0) | @tsv' <<< "$events")
+}
 
-  return 1  # Timeout
+record_event_metrics() {
+  local state_file="$1"
+  local tmp_file="${state_file}.tmp.$$"
+  local events
+  events=$(printf '{"received":%d,"batches":%d,"coalesced":%d,"late":%d,"dropped":%d,"spooled":%d,"max_latency_ms":%d}' \
+    "$EVENTS_RECEIVED" "$EVENT_BATCHES" "$EVENTS_COALESCED" "$EVENTS_LATE" "$EVENTS_DROPPED" \
+    "$EVENTS_SPOOLED" "$EVENT_MAX_LATENCY_MS")
+
+  if state_managed; then
+    state_store "$state_file" set metrics events "$events" --json
+    return
+  fi
+
+  jq --argjson events "$events" '.metrics.events = $events' "$state_file" > "$tmp_file"
+  mv "$tmp_file" "$state_file"
+  journal set metrics events "$events" --json
 }
 
 process_event() {
@@ -113,8 +295,8 @@ process_event() {
     TASK_COMPLETE)
       log_success "Event: Task $identifier completed"
       remove_active_by_task "$identifier"
-      check_agent_status "$state_file" "$identifier"
-      local result=$?
+      local result=0
+      check_agent_status "$prd_file" "$state_file" "$identifier" || result=$?
       case $result in
         0) ;;  # Success - handled in check_agent_status
         1|2) handle_failure "$prd_file" "$state_file" "$identifier" ;;
@@ -125,16 +307,47 @@ process_event() {
       remove_active_by_task "$identifier"
       handle_failure "$prd_file" "$state_file" "$identifier"
       ;;
+    DISCOVERED_DEPENDENCY)
+      # Reported by a running agent: reporter:from:to:reason
+      local reporter from to reason
+      IFS=':' read -r reporter from to reason <<< "$identifier"
+      log_info "Event: Task $reporter discovered dependency $from -> $to${reason:+ ($reason)}"
+      record_discovered_dependency "$prd_file" "$state_file" "$reporter" "$from" "$to" "$reason"
+      ;;
+    AGENT_SIGNAL)
+      # A stop signal from an agent that is still running (e.g. BLOCKED:DEPENDENCY);
+      # its exit is handled by the TASK_* event that follows
+      local task_id agent_signal
+      IFS=':' read -r task_id agent_signal <<< "$identifier"
+      log_warn "Event: Task $task_id signalled $agent_signal"
+      ;;
+    AGENT_EXITED)
+      # An agent the supervisor did not start (e.g. from before a resume) is gone
+      log_warn "Event: Agent for task $identifier exited"
+      local result=0
+      check_agent_status "$prd_file" "$state_file" "$identifier" || result=$?
+      case $result in
+        0) ;;
+        *) handle_failure "$prd_file" "$state_file" "$identifier" ;;
+      esac
+      ;;
     PHASE_COMPLETE)
       log_success "Event: Phase review for section $identifier completed"
+      supervised && supervisor untrack "phase-review-$identifier"
       local phase_status_file="$STATUS_DIR/phase-review-section-${identifier}.status"
       echo "completed" > "$phase_status_file"
       ;;
     PHASE_FAILED)
       log_warn "Event: Phase review for section $identifier failed"
+      supervised && supervisor untrack "phase-review-$identifier"
       local phase_status_file="$STATUS_DIR/phase-review-section-${identifier}.status"
       echo "failed" > "$phase_status_file"
       ;;
+    EVENTS_DROPPED)
+      # The relay could not decode some events; look for finished agents directly
+      log_warn "Event: $identifier unreadable event(s) dropped, checking agents"
+      process_completed_agents "$prd_file" "$state_file"
+      ;;
     *)
       log_warn "Unknown event type: $event_type"
       ;;
@@ -143,36 +356,101 @@ process_event() {
 
 remove_active_by_task() {
   local task_id="$1"
+  if supervised; then
+    supervisor release "$task_id"
+    return
+  fi
   if [[ -f "$ACTIVE_FILE" ]]; then
     grep -v ":${task_id}$" "$ACTIVE_FILE" > "${ACTIVE_FILE}.tmp" 2>/dev/null || true
     mv "${ACTIVE_FILE}.tmp" "$ACTIVE_FILE"
   fi
 }
 
+# ─────────────────────────────────────────────────────────────
+# Agent Supervisor
+# ─────────────────────────────────────────────────────────────
+
+supervised() {
+  [[ "$AGENT_SUPERVISOR" == "asyncio" ]]
+}
+
+supervisor() {
+  python3 "$DAEMON_CLIENT" "$SUPERVISOR_SOCKET" "$@"
+}
+
+start_supervisor() {
+  SUPERVISOR_SOCKET="$STATUS_DIR/supervisor.sock"
+  python3 "$SUPERVISOR" "$STATUS_DIR" --session-id "$SESSION_ID" --socket "$SUPERVISOR_SOCKET" \
+    --event-socket "$EVENT_SOCKET" --parent-pid $$ &
+  SUPERVISOR_PID=$!
+
+  if ! python3 "$DAEMON_CLIENT" --wait 10 "$SUPERVISOR_SOCKET" ping > /dev/null; then
+    log_error "Agent supervisor failed to start"
+    exit 1
+  fi
+  log_info "Agent supervisor running (pid $SUPERVISOR_PID)"
+}
+
+stop_supervisor() {
+  if [[ -n "$SUPERVISOR_PID" ]]; then
+    supervisor shutdown > /dev/null 2>&1 || kill "$SUPERVISOR_PID" 2>/dev/null || true
+    wait "$SUPERVISOR_PID" 2>/dev/null || true
+    SUPERVISOR_PID=""
+  fi
+}
+
 # ─────────────────────────────────────────────────────────────
 # Event Loop Helpers
 # ─────────────────────────────────────────────────────────────
 
+# Current parallelism limit: MAX_PARALLEL, or the adaptive controller's limit
+parallel_limit() {
+  local state_file="$1"
+  local active="$2"
+
+  if [[ "$ADAPTIVE_PARALLEL" != "true" ]]; then
+    echo "$MAX_PARALLEL"
+  elif state_managed; then
+    state_store "$state_file" concurrency "$active" --min "$MIN_PARALLEL" --max "$MAX_PARALLEL"
+  else
+    python3 "$CONCURRENCY" "$state_file" --active "$active" --min "$MIN_PARALLEL" --max "$MAX_PARALLEL"
+  fi
+}
+
 dispatch_to_capacity() {
   local prd_file="$1"
   local state_file="$2"
 
   local active_count=$(get_active_count)
-  local available=$((MAX_PARALLEL - active_count))
+  local limit
+  limit=$(parallel_limit "$state_file" "$active_count")
+  if [[ -n "$PARALLEL_LIMIT" && "$limit" != "$PARALLEL_LIMIT" ]]; then
+    log_info "Concurrency limit $PARALLEL_LIMIT -> $limit"
+  fi
+  PARALLEL_LIMIT="$limit"
+  local available=$((limit - active_count))
 
   if [[ $available -le 0 ]]; then
     return 0
   fi
 
+  # Ready tasks in queue order, passing over any that edit a file a running
+  # task holds (they wait for the holder instead of colliding with it)
   local ready_tasks
-  ready_tasks=$(jq -r '.queue.ready[]' "$state_file" 2>/dev/null | head -n "$available")
+  if state_managed; then
+    ready_tasks=$(state_store "$state_file" dispatchable "$available")
+  else
+    ready_tasks=$(python3 "$SCHEDULER" "$prd_file" "$state_file" --policy "$QUEUE_POLICY" --dispatchable "$available")
+  fi
 
   for task_id in $ready_tasks; do
     [[ -z "$task_id" ]] && continue
     local agent=$(get_agent_for_task "$prd_file" "$task_id")
     dispatch_agent "$prd_file" "$state_file" "$task_id" "$agent"
-    ((active_count++))
-    [[ $active_count -ge $MAX_PARALLEL ]] && break
+    active_count=$((active_count + 1))
+    if [[ $active_count -ge $limit ]]; then
+      break
+    fi
   done
 }
 
@@ -183,6 +461,9 @@ check_section_completions() {
   local sections
   sections=$(jq -r '.sections[].number' "$prd_file")
 
+  # Completion checks below read task statuses from the snapshot
+  state_export "$state_file"
+
   for section_num in $sections; do
     if should_trigger_completion_review "$prd_file" "$state_file" "$section_num"; then
       local phase_status_file="$STATUS_DIR/phase-review-section-${section_num}.status"
@@ -222,7 +503,11 @@ check_blocked_tasks() {
   local state_file="$2"
 
   local blocked_tasks
-  blocked_tasks=$(jq -r '.queue.blocked[]?' "$state_file" 2>/dev/null || echo "")
+  if state_managed; then
+    blocked_tasks=$(state_store "$state_file" get queue blocked)
+  else
+    blocked_tasks=$(jq -r '.queue.blocked[]?' "$state_file" 2>/dev/null || echo "")
+  fi
 
   for task_id in $blocked_tasks; do
     [[ -z "$task_id" ]] && continue
@@ -281,44 +566,54 @@ cleanup_stale_processes() {
   local status_dir="/tmp/svao/$session_id"
   local active_file="$status_dir/.active_pids"
 
-  if [[ ! -f "$active_file" ]]; then
-    return 0
-  fi
-
   log_info "Checking for stale processes..."
 
-  # Read each PID and check if still running
-  while IFS=: read -r pid task_id; do
-    [[ -z "$pid" ]] && continue
+  # Every task the (replayed) state has in progress needs a live agent; its
+  # PID is in .active_pids unless that went with /tmp
+  local in_progress
+  in_progress=$(jq -r '.tasks | to_entries[] | select(.value.status == "in_progress") | .key' "$state_file")
+
+  local live_file="${active_file}.tmp.$$"
+  mkdir -p "$status_dir"
+  : > "$live_file"
+  if [[ -f "$active_file" ]]; then
+    while IFS=: read -r pid task_id; do
+      if [[ -n "$pid" ]] && kill -0 "$pid" 2>/dev/null; then
+        echo "$pid:$task_id" >> "$live_file"
+      fi
+    done < "$active_file"
+  fi
 
-    if ! kill -0 "$pid" 2>/dev/null; then
-      log_warn "Stale process found: PID $pid (task $task_id)"
-
-      # Check if task completed
-      local status_file="$status_dir/${task_id}.status.json"
-      if [[ -f "$status_file" ]]; then
-        local task_status
-        task_status=$(jq -r '.status' "$status_file")
-        if [[ "$task_status" == "completed" ]]; then
-          log_info "Task $task_id completed before crash"
-          update_task_status "$state_file" "$task_id" "completed"
-        else
-          log_warn "Task $task_id was interrupted, will be re-dispatched"
-          update_task_status "$state_file" "$task_id" "pending"
-        fi
+  for task_id in $in_progress; do
+    if grep -q ":${task_id}$" "$live_file"; then
+      continue
+    fi
+    log_warn "Stale task $task_id: its agent is no longer running"
+
+    # Check if task completed
+    local status_file="$status_dir/${task_id}.status.json"
+    if [[ -f "$status_file" ]]; then
+      local task_status
+      task_status=$(jq -r '.status' "$status_file")
+      if [[ "$task_status" == "completed" ]]; then
+        log_info "Task $task_id completed before crash"
+        update_task_status "$state_file" "$task_id" "completed"
       else
-        log_warn "No status for task $task_id, marking pending"
+        log_warn "Task $task_id was interrupted, will be re-dispatched"
         update_task_status "$state_file" "$task_id" "pending"
       fi
-
-      ((cleaned++))
+    else
+      log_warn "No status for task $task_id, marking pending"
+      update_task_status "$state_file" "$task_id" "pending"
     fi
-  done < "$active_file"
 
-  # Clear the active PIDs file
+    cleaned=$((cleaned + 1))
+  done
+
+  # Keep only agents that are still running
+  mv "$live_file" "$active_file"
   if [[ $cleaned -gt 0 ]]; then
-    : > "$active_file"
-    log_info "Cleaned $cleaned stale process(es)"
+    log_info "Cleaned $cleaned stale task(s)"
   fi
 
   return 0
@@ -328,6 +623,163 @@ cleanup_stale_processes() {
 # State Management
 # ─────────────────────────────────────────────────────────────
 
+# True when state updates go through state_store.py commands (sqlite or daemon)
+state_managed() {
+  [[ "$STATE_BACKEND" == "sqlite" || "$STATE_BACKEND" == "daemon" ]]
+}
+
+state_store() {
+  if [[ "$STATE_BACKEND" == "daemon" ]]; then
+    # The daemon already owns the state file; drop it from the arguments
+    shift
+    python3 "$DAEMON_CLIENT" "$DAEMON_SOCKET" "$@"
+  else
+    python3 "$STATE_STORE" "$@"
+  fi
+}
+
+start_daemon() {
+  local prd_file="$1"
+  local state_file="$2"
+
+  mkdir -p /tmp/svao
+  DAEMON_SOCKET="/tmp/svao/daemon-$$.sock"
+  local journal_args=()
+  [[ -n "$JOURNAL_FILE" ]] && journal_args+=(--journal "$JOURNAL_FILE")
+  python3 "$DAEMON" "$prd_file" "$state_file" --socket "$DAEMON_SOCKET" --parent-pid $$ \
+    ${journal_args[@]+"${journal_args[@]}"} &
+  DAEMON_PID=$!
+
+  if ! python3 "$DAEMON_CLIENT" --wait 10 "$DAEMON_SOCKET" ping > /dev/null; then
+    log_error "State daemon failed to start"
+    exit 1
+  fi
+  # pr-creator.sh records section PRs through the same daemon
+  export SVAO_DAEMON_SOCKET="$DAEMON_SOCKET"
+  log_info "State daemon running (pid $DAEMON_PID)"
+}
+
+# Flush and stop the daemon (no-op unless one was started)
+stop_daemon() {
+  if [[ -n "$DAEMON_PID" ]]; then
+    python3 "$DAEMON_CLIENT" "$DAEMON_SOCKET" shutdown > /dev/null 2>&1 || kill "$DAEMON_PID" 2>/dev/null || true
+    wait "$DAEMON_PID" 2>/dev/null || true
+    DAEMON_PID=""
+  fi
+}
+
+# Refresh prd-state.json from the database before handing it to readers
+state_export() {
+  local state_file="$1"
+  if state_managed; then
+    state_store "$state_file" export
+  fi
+}
+
+# Append a record to the session journal from bash: one jq call instead of
+# starting journal.py. FIELDS is a jq object built from $argv (the remaining
+# arguments, as an array) or `input` (stdin). It takes the journal's own
+# lock, as journal.py does, and continues its numbering
+journal_append() {
+  local fields="$1"
+  shift
+
+  # jq 1.6 reads options after --args, so pass each argument by name
+  local jq_args=() i=0 arg
+  for arg in "$@"; do
+    jq_args+=(--arg "$i" "$arg")
+    i=$((i + 1))
+  done
+  local ts
+  TZ=UTC printf -v ts '%(%Y-%m-%dT%H:%M:%SZ)T' -1
+  (
+    flock 9
+    # The trailing x shows whether the last line was cut short (no newline)
+    local last seq=0 lines=-0  # head -n: the whole file, or all but a torn line
+    last=$(tail -n 1 "$JOURNAL_FILE"; echo x)
+    if [[ "$last" != "x" && "$last" != *$'\n'x ]]; then
+      lines=-1
+      echo  # Terminate a torn line so this record starts clean
+    fi
+    if [[ "$lines" == "-0" && "$last" =~ ^\{\"seq\":([0-9]+), ]]; then
+      seq="${BASH_REMATCH[1]}"
+    elif [[ "$last" != "x" ]]; then
+      seq=$(head -n "$lines" "$JOURNAL_FILE" | grep -o '^{"seq":[0-9]*' | tail -n 1 | tr -dc '0-9' || true)
+    fi
+    jq -nc --argjson seq "$((${seq:-0} + 1))" --arg ts "$ts" --argjson argc "$i" \
+      ${jq_args[@]+"${jq_args[@]}"} \
+      "[range(\$argc) as \$i | \$ARGS.named[\$i | tostring]] as \$argv | {seq: \$seq, ts: \$ts} + $fields"
+  ) 9>> "$JOURNAL_FILE" >&9
+}
+
+# Whether journal_append can run here; without flock(1) (e.g. on macOS)
+# records go through journal.py instead
+journal_in_bash() {
+  command -v flock > /dev/null
+}
+
+# fsync the journal, including what other processes appended
+journal_sync() {
+  sync "$JOURNAL_FILE" 2> /dev/null || python3 "$JOURNAL" sync "$JOURNAL_FILE"
+}
+
+# Record a state change in the session journal. The sqlite store and the
+# daemon journal their own commands, so this covers the json backend's
+# updates; arguments are the equivalent state_store.py command, kept as
+# argv for replay to parse. --sync fsyncs the journal afterwards, which the
+# loop does once per pass
+journal() {
+  if [[ -z "$JOURNAL_FILE" ]] || state_managed; then
+    return 0
+  fi
+  local sync=false
+  if [[ "$1" == "--sync" ]]; then
+    sync=true
+    shift
+  fi
+
+  if ! journal_in_bash; then
+    local append_args=()
+    [[ "$sync" == "true" ]] && append_args+=(--sync)
+    python3 "$JOURNAL" append ${append_args[@]+"${append_args[@]}"} "$JOURNAL_FILE" "$@" ||
+      log_warn "Could not journal: $*"
+  elif ! journal_append '{type: "command", argv: $argv}' "$@"; then
+    log_warn "Could not journal: $*"
+  elif [[ "$sync" == "true" ]]; then
+    journal_sync || log_warn "Could not sync the journal"
+  fi
+}
+
+# Record a command from a checkpoint agent (any backend)
+journal_checkpoint_command() {
+  local checkpoint_type="$1"
+  local cmd="$2"
+  local args="$3"
+
+  if [[ -z "$JOURNAL_FILE" ]]; then
+    return 0
+  fi
+  if journal_in_bash; then
+    journal_append '{type: "checkpoint", checkpoint: $argv[0], command: $argv[1], args: $argv[2]}' \
+      "$checkpoint_type" "$cmd" "$args"
+  else
+    python3 "$JOURNAL" checkpoint "$JOURNAL_FILE" "$checkpoint_type" "$cmd" "$args"
+  fi || log_warn "Could not journal checkpoint command $cmd"
+}
+
+# Start the journal with the state the session begins from
+journal_snapshot() {
+  local state_file="$1"
+
+  if ! journal_in_bash; then
+    python3 "$JOURNAL" snapshot "$JOURNAL_FILE" "$state_file"
+    return
+  fi
+  mkdir -p "$(dirname "$JOURNAL_FILE")"
+  journal_append '{type: "snapshot", state: input}' < "$state_file"
+  journal_sync
+}
+
 load_state() {
   local state_file="$1"
 
@@ -349,12 +801,20 @@ save_state() {
   local state_file="$1"
   local tmp_file="${state_file}.tmp.$$"
 
+  if state_managed; then
+    state_store "$state_file" session --iteration "$ITERATION" --touch
+    state_export "$state_file"
+    return
+  fi
+
   jq --arg updated "$(date -u +%Y-%m-%dT%H:%M:%SZ)" \
      --argjson iteration "$ITERATION" \
      '.session.updated_at = $updated | .session.iteration = $iteration' \
      "$state_file" > "$tmp_file"
 
   mv "$tmp_file" "$state_file"
+  # Once per loop pass, so this also fsyncs the records written since the last
+  journal --sync session --iteration "$ITERATION" --touch
 }
 
 update_task_status() {
@@ -363,60 +823,35 @@ update_task_status() {
   local status="$3"
   local tmp_file="${state_file}.tmp.$$"
 
+  if state_managed; then
+    state_store "$state_file" task-status "$task_id" "$status"
+    return
+  fi
+
   jq --arg id "$task_id" --arg status "$status" \
      --arg updated "$(date -u +%Y-%m-%dT%H:%M:%SZ)" \
      '.tasks[$id].status = $status | .session.updated_at = $updated' \
      "$state_file" > "$tmp_file"
 
   mv "$tmp_file" "$state_file"
+  journal task-status "$task_id" "$status"
 }
 
 rebuild_queue() {
   local prd_file="$1"
   local state_file="$2"
-  local tmp_file="${state_file}.tmp.$$"
-
-  # Get completed task IDs
-  local completed=$(jq -r '[.tasks | to_entries[] | select(.value.status == "completed") | .key] | @json' "$state_file")
-
-  jq --argjson completed "$completed" --slurpfile prd "$prd_file" '
-    # Capture state file as $state before iterating (jq scoping fix)
-    . as $state |
-    ($prd[0]) as $p |
-    # Ready: pending tasks with all deps completed, sorted by task ID for phase ordering
-    # Sort ensures 5.1.1 < 5.1.2 < 5.2.1 (complete phase before moving to next)
-    .queue.ready = ([
-      $p.sections[].tasks[] |
-      . as $task |
-      select(
-        ($state.tasks[$task.id].status // "pending") == "pending" and
-        (($task.depends_on // []) - $completed | length) == 0
-      ) |
-      .id
-    ] | sort_by(. | split(".") | map(tonumber))) |
-    # In progress
-    .queue.in_progress = [$state.tasks | to_entries[] | select(.value.status == "in_progress") | .key] |
-    # Blocked: pending with unmet deps
-    .queue.blocked = [
-      $p.sections[].tasks[] |
-      . as $task |
-      select(
-        ($state.tasks[$task.id].status // "pending") == "pending" and
-        (($task.depends_on // []) - $completed | length) > 0
-      ) |
-      .id
-    ] |
-    # Completed
-    .queue.completed = $completed |
-    # Update summary
-    .summary.completed = ($completed | length) |
-    .summary.in_progress = (.queue.in_progress | length) |
-    .summary.ready = (.queue.ready | length) |
-    .summary.blocked = (.queue.blocked | length) |
-    .summary.progress_percent = (if .summary.total_tasks > 0 then (($completed | length) / .summary.total_tasks * 100 | . * 10 | floor / 10) else 0 end)
-  ' "$state_file" > "$tmp_file"
 
-  mv "$tmp_file" "$state_file"
+  # Ready: pending tasks whose dependencies (explicit, inferred and applied
+  # discovered ones) are all completed, in QUEUE_POLICY order: by task ID
+  # for phase ordering (5.1.1 < 5.1.2 < 5.2.1), or longest critical path
+  # first. The SQLite store maintains the queues on every status change and
+  # only rebuilds after a direct queue edit.
+  if state_managed; then
+    state_store "$state_file" rebuild-queue "$prd_file" --policy "$QUEUE_POLICY"
+  else
+    python3 "$SCHEDULER" "$prd_file" "$state_file" --policy "$QUEUE_POLICY"
+    journal rebuild-queue "$prd_file" --policy "$QUEUE_POLICY"
+  fi
 }
 
 # ─────────────────────────────────────────────────────────────
@@ -496,6 +931,9 @@ run_checkpoint() {
     return 0
   fi
 
+  # The checkpoint agent reads prd-state.json
+  state_export "$state_file"
+
   local output
   local stderr_file
   stderr_file=$(mktemp)
@@ -522,10 +960,15 @@ run_checkpoint() {
     cmd=$(echo "$cmd_json" | jq -r '.command')
     local args
     args=$(echo "$cmd_json" | jq -r '.args')
+    journal_checkpoint_command "$checkpoint_type" "$cmd" "$args"
     execute_checkpoint_command "$prd_file" "$state_file" "$cmd" "$args"
   done < <(echo "$output" | jq -c '.commands[]')
 
   # Update checkpoint tracking
+  if state_managed; then
+    state_store "$state_file" checkpoint "$checkpoint_type" --iteration "$ITERATION"
+    return
+  fi
   local tmp_file="${state_file}.tmp.$$"
   jq --arg type "$checkpoint_type" \
      --arg time "$(date -u +%Y-%m-%dT%H:%M:%SZ)" \
@@ -535,6 +978,7 @@ run_checkpoint() {
       .checkpoints.history += [{type: $type, timestamp: $time, iteration: $iter}]' \
      "$state_file" > "$tmp_file"
   mv "$tmp_file" "$state_file"
+  journal checkpoint "$checkpoint_type" --iteration "$ITERATION"
 }
 
 execute_checkpoint_command() {
@@ -555,25 +999,40 @@ execute_checkpoint_command() {
     REORDER)
       # Format: task-id, task-id, ...
       log_info "Checkpoint reordering queue: $args"
+      if state_managed; then
+        state_store "$state_file" reorder $(echo "$args" | tr -d ' ' | tr ',' ' ')
+        return
+      fi
       local new_order
       new_order=$(echo "$args" | tr -d ' ' | tr ',' '\n' | jq -R . | jq -s .)
       jq --argjson order "$new_order" '.queue.ready = $order' "$state_file" > "$tmp_file"
       mv "$tmp_file" "$state_file"
+      journal reorder $(echo "$args" | tr -d ' ' | tr ',' ' ')
       ;;
     REASSIGN)
       # Format: task-id:agent
       local task_id agent
       IFS=':' read -r task_id agent <<< "$args"
       log_info "Checkpoint reassigning $task_id to $agent"
+      if state_managed; then
+        state_store "$state_file" set tasks "$task_id" assigned_to "$agent"
+        return
+      fi
       jq --arg id "$task_id" --arg agent "$agent" \
          '.tasks[$id].assigned_to = $agent' "$state_file" > "$tmp_file"
       mv "$tmp_file" "$state_file"
+      journal set tasks "$task_id" assigned_to "$agent"
       ;;
     ADD_DEPENDENCY)
       # Format: from:to:confidence
       local from to confidence
       IFS=':' read -r from to confidence <<< "$args"
       log_info "Checkpoint adding dependency: $from -> $to (confidence: $confidence)"
+      if state_managed; then
+        state_store "$state_file" add-dependency "$from" "$to" "$confidence"
+        rebuild_queue "$prd_file" "$state_file"
+        return
+      fi
       jq --arg from "$from" --arg to "$to" --arg conf "$confidence" \
          '.discovered_dependencies += [{
              from: $from,
@@ -584,6 +1043,7 @@ execute_checkpoint_command() {
              status: "applied"
          }]' "$state_file" > "$tmp_file"
       mv "$tmp_file" "$state_file"
+      journal add-dependency "$from" "$to" "$confidence"
       rebuild_queue "$prd_file" "$state_file"
       ;;
     UNBLOCK)
@@ -596,10 +1056,17 @@ execute_checkpoint_command() {
     APPROVED)
       # Format: section-number
       log_info "Checkpoint approved section $args"
-      jq --arg section "$args" \
-         '.checkpoints.reviewed_sections = ((.checkpoints.reviewed_sections // []) + [($section | tonumber)] | unique)' \
-         "$state_file" > "$tmp_file"
-      mv "$tmp_file" "$state_file"
+      if state_managed; then
+        state_store "$state_file" review-section "$args"
+        # pr-creator reads section_prs and phase_reviews from the snapshot
+        state_export "$state_file"
+      else
+        jq --arg section "$args" \
+           '.checkpoints.reviewed_sections = ((.checkpoints.reviewed_sections // []) + [($section | tonumber)] | unique)' \
+           "$state_file" > "$tmp_file"
+        mv "$tmp_file" "$state_file"
+        journal review-section "$args"
+      fi
 
       # Mark PR as ready for review (draft PR was created on first task)
       if [[ -f "$PR_CREATOR" ]]; then
@@ -638,6 +1105,48 @@ execute_checkpoint_command() {
   esac
 }
 
+# Apply a dependency an agent reported while running, so the scheduler holds
+# back its dependent before the reporting agent finishes
+record_discovered_dependency() {
+  local prd_file="$1"
+  local state_file="$2"
+  local reporter="$3"
+  local from="$4"
+  local to="$5"
+  local reason="$6"
+
+  if [[ "$from" == "$to" ]] || ! jq -e --arg from "$from" --arg to "$to" '
+    [.sections[].tasks[].id] | index($from) != null and index($to) != null
+  ' "$prd_file" > /dev/null; then
+    log_warn "Ignoring dependency $from -> $to from task $reporter: not two distinct PRD tasks"
+    return 0
+  fi
+
+  if state_managed; then
+    state_store "$state_file" add-dependency "$from" "$to" "$AGENT_DEPENDENCY_CONFIDENCE" \
+      --by "agent:$reporter" --reason "$reason" --if-new
+    return
+  fi
+
+  local tmp_file="${state_file}.tmp.$$"
+  jq --arg from "$from" --arg to "$to" --argjson conf "$AGENT_DEPENDENCY_CONFIDENCE" \
+     --arg reason "$reason" --arg by "agent:$reporter" '
+    if any(.discovered_dependencies[]?; .from == $from and .to == $to) then .
+    else .discovered_dependencies += [{
+      from: $from,
+      to: $to,
+      confidence: $conf,
+      reason: $reason,
+      discovered_at: (now | todate),
+      discovered_by: $by,
+      status: "applied"
+    }] end
+  ' "$state_file" > "$tmp_file"
+  mv "$tmp_file" "$state_file"
+  journal add-dependency "$from" "$to" "$AGENT_DEPENDENCY_CONFIDENCE" \
+    --by "agent:$reporter" --reason "$reason" --if-new
+}
+
 handle_unblock_strategy() {
   local state_file="$1"
   local task_id="$2"
@@ -645,6 +1154,19 @@ handle_unblock_strategy() {
   local details="$4"
   local tmp_file="${state_file}.tmp.$$"
 
+  if state_managed; then
+    case "$strategy" in
+      alternate-agent|skip-and-continue)
+        state_store "$state_file" unblock "$task_id" "$strategy" "$details"
+        ;;
+      escalate)
+        log_warn "ESCALATION REQUIRED for task $task_id: $details"
+        state_store "$state_file" unblock "$task_id" "$strategy" "$details"
+        ;;
+    esac
+    return
+  fi
+
   case "$strategy" in
     alternate-agent)
       jq --arg id "$task_id" --arg agent "$details" \
@@ -670,6 +1192,7 @@ handle_unblock_strategy() {
       mv "$tmp_file" "$state_file"
       ;;
   esac
+  journal unblock "$task_id" "$strategy" "$details"
 }
 
 # ─────────────────────────────────────────────────────────────
@@ -683,11 +1206,21 @@ update_metrics() {
   local duration="${4:-0}"
   local tmp_file="${state_file}.tmp.$$"
 
+  if state_managed; then
+    case "$event" in
+      task_completed|task_failed|retry)
+        state_store "$state_file" metric "$event" "$agent" "$duration"
+        ;;
+    esac
+    return
+  fi
+
   case "$event" in
     task_completed)
       jq --arg agent "$agent" --argjson dur "$duration" '
         .metrics.tasks_completed += 1 |
         .metrics.agents_used[$agent].completed = ((.metrics.agents_used[$agent].completed // 0) + 1) |
+        .metrics.agents_used[$agent].duration_seconds = ((.metrics.agents_used[$agent].duration_seconds // 0) + $dur) |
         # Update average duration (running average)
         .metrics.avg_task_duration_seconds = (
           if .metrics.tasks_completed > 1 then
@@ -711,6 +1244,9 @@ update_metrics() {
       mv "$tmp_file" "$state_file"
       ;;
   esac
+  case "$event" in
+    task_completed|task_failed|retry) journal metric "$event" "$agent" "$duration" ;;
+  esac
 }
 
 calculate_parallel_utilization() {
@@ -718,6 +1254,11 @@ calculate_parallel_utilization() {
   local max_parallel="$2"
   local tmp_file="${state_file}.tmp.$$"
 
+  if state_managed; then
+    state_store "$state_file" utilization "$max_parallel"
+    return
+  fi
+
   # Parallel utilization = avg active agents / max_parallel
   # Calculated from in_progress counts over iterations
   local active
@@ -734,6 +1275,7 @@ calculate_parallel_utilization() {
     )
   ' "$state_file" > "$tmp_file"
   mv "$tmp_file" "$state_file"
+  journal utilization "$max_parallel"
 }
 
 persist_global_metrics() {
@@ -765,7 +1307,12 @@ persist_global_metrics() {
     # Update per-agent metrics
     reduce ($session.agents_used // {} | to_entries[]) as $agent (.;
       .agents[$agent.key].total_completed = ((.agents[$agent.key].total_completed // 0) + ($agent.value.completed // 0)) |
-      .agents[$agent.key].total_failed = ((.agents[$agent.key].total_failed // 0) + ($agent.value.failed // 0))
+      .agents[$agent.key].total_failed = ((.agents[$agent.key].total_failed // 0) + ($agent.value.failed // 0)) |
+      # Task durations for the critical-path queue policy (scheduler.py)
+      if $agent.value.duration_seconds != null then
+        .agents[$agent.key].total_duration_seconds = ((.agents[$agent.key].total_duration_seconds // 0) + $agent.value.duration_seconds) |
+        .agents[$agent.key].duration_samples = ((.agents[$agent.key].duration_samples // 0) + ($agent.value.completed // 0))
+      else . end
     )
   ' "$metrics_file" > "$tmp_file"
 
@@ -784,6 +1331,11 @@ mark_section_needs_rework() {
     .sections[] | select(.number == ($n | tonumber)) | .tasks[].id
   ' "$prd_file")
 
+  if state_managed; then
+    [[ -n "$section_tasks" ]] && state_store "$state_file" rework "$reason" $section_tasks
+    return
+  fi
+
   while IFS= read -r task_id; do
     [[ -z "$task_id" ]] && continue
     local tmp_file="${state_file}.tmp.$$"
@@ -795,6 +1347,9 @@ mark_section_needs_rework() {
        "$state_file" > "$tmp_file"
     mv "$tmp_file" "$state_file"
   done <<< "$section_tasks"
+  if [[ -n "$section_tasks" ]]; then
+    journal rework "$reason" $section_tasks
+  fi
 }
 
 # ─────────────────────────────────────────────────────────────
@@ -886,9 +1441,6 @@ HUMAN_REVIEW: [type]: [description]  (repeat for each issue)
   local status_file="$STATUS_DIR/phase-review-section-${section_num}.status"
 
   if command -v claude &> /dev/null; then
-    # Pass event FIFO path to subshell
-    local event_fifo="$EVENT_FIFO"
-
     # Run as truly async background subagent (no wait)
     (
       echo "running" > "$status_file"
@@ -901,7 +1453,15 @@ HUMAN_REVIEW: [type]: [description]  (repeat for each issue)
         local human_reviews
         human_reviews=$(grep "^HUMAN_REVIEW:" "$output_file" 2>/dev/null || true)
 
-        if [[ -n "$human_reviews" ]]; then
+        if [[ -n "$human_reviews" ]] && state_managed; then
+          local review
+          review=$(jq -n --arg reviews "$human_reviews" '{
+            "completed_at": (now | todate),
+            "human_reviews": ($reviews | split("\n") | map(select(length > 0)))
+          }')
+          state_store "$state_file" set phase_reviews "$section_num" "$review" --json || \
+            echo "[$(date +%H:%M:%S)] ${YELLOW}⚠️${NC} Failed to update state with phase review for section $section_num" >&2
+        elif [[ -n "$human_reviews" ]]; then
           local tmp_file="${state_file}.tmp.$$"
           local jq_err_file="$STATUS_DIR/phase-review-section-${section_num}.jq.err"
           if jq --arg section "$section_num" --arg reviews "$human_reviews" '
@@ -912,6 +1472,8 @@ HUMAN_REVIEW: [type]: [description]  (repeat for each issue)
           ' "$state_file" > "$tmp_file" 2>"$jq_err_file"; then
             mv "$tmp_file" "$state_file"
             rm -f "$jq_err_file"
+            journal set phase_reviews "$section_num" \
+              "$(jq -c --arg section "$section_num" '.phase_reviews[$section]' "$state_file")" --json
           else
             rm -f "$tmp_file"
             echo "[$(date +%H:%M:%S)] ${YELLOW}⚠️${NC} Failed to update state with phase review for section $section_num. See $jq_err_file" >&2
@@ -919,12 +1481,10 @@ HUMAN_REVIEW: [type]: [description]  (repeat for each issue)
         fi
 
         echo "completed" > "$status_file"
-        # Emit completion event to FIFO
-        [[ -n "$event_fifo" && -p "$event_fifo" ]] && echo "PHASE_COMPLETE:$section_num" >> "$event_fifo"
+        emit_event PHASE_COMPLETE "$section_num"
       else
         echo "failed" > "$status_file"
-        # Emit failure event to FIFO
-        [[ -n "$event_fifo" && -p "$event_fifo" ]] && echo "PHASE_FAILED:$section_num" >> "$event_fifo"
+        emit_event PHASE_FAILED "$section_num"
       fi
     ) &
 
@@ -932,7 +1492,11 @@ HUMAN_REVIEW: [type]: [description]  (repeat for each issue)
     log_agent "Phase reviewer PID $pid for section $section_num (running in background)"
 
     # Track the PID so we can monitor it
-    echo "$pid:phase-review-$section_num" >> "$ACTIVE_FILE"
+    if supervised; then
+      supervisor track "$pid" "phase-review-$section_num"
+    else
+      echo "$pid:phase-review-$section_num" >> "$ACTIVE_FILE"
+    fi
 
   else
     log_warn "Claude CLI not found, skipping phase review"
@@ -951,15 +1515,22 @@ get_agent_for_task() {
   local task_id="$2"
 
   # Get agent_type from task, default to frontend-coder
-  local agent=$(jq -r --arg id "$task_id" '
-    .sections[].tasks[] | select(.id == $id) | .agent_type // "frontend-coder"
-  ' "$prd_file")
+  local agent
+  if [[ "$STATE_BACKEND" == "daemon" ]]; then
+    agent=$(python3 "$DAEMON_CLIENT" "$DAEMON_SOCKET" prd-task "$task_id" agent_type --default frontend-coder)
+  else
+    agent=$(jq -r --arg id "$task_id" '
+      .sections[].tasks[] | select(.id == $id) | .agent_type // "frontend-coder"
+    ' "$prd_file")
+  fi
 
   echo "$agent"
 }
 
 get_active_count() {
-  if [[ -f "$ACTIVE_FILE" ]]; then
+  if supervised; then
+    supervisor active
+  elif [[ -f "$ACTIVE_FILE" ]]; then
     local count
     count=$(grep -c "^" "$ACTIVE_FILE" 2>/dev/null) || count=0
     echo "$count"
@@ -1000,6 +1571,25 @@ set_retries() {
   mv "${RETRIES_FILE}.tmp" "$RETRIES_FILE"
 }
 
+record_section_branch() {
+  local state_file="$1"
+  local section_num="$2"
+  local branch="$3"
+
+  if state_managed; then
+    state_store "$state_file" set section_branches "$section_num" "$branch"
+    return
+  fi
+
+  local tmp_file="${state_file}.tmp.$$"
+  jq --arg section "$section_num" --arg branch "$branch" '
+    .section_branches = (.section_branches // {}) |
+    .section_branches[$section] = $branch
+  ' "$state_file" > "$tmp_file"
+  mv "$tmp_file" "$state_file"
+  journal set section_branches "$section_num" "$branch"
+}
+
 ensure_section_branch() {
   local prd_file="$1"
   local state_file="$2"
@@ -1012,7 +1602,11 @@ ensure_section_branch() {
 
   # Check 1: Already tracked in state
   local branch_initialized
-  branch_initialized=$(jq -r --arg n "$section_num" '.section_branches[$n] // ""' "$state_file")
+  if state_managed; then
+    branch_initialized=$(state_store "$state_file" get section_branches "$section_num" --default "")
+  else
+    branch_initialized=$(jq -r --arg n "$section_num" '.section_branches[$n] // ""' "$state_file")
+  fi
 
   if [[ -n "$branch_initialized" ]]; then
     # Verify branch still exists in git
@@ -1029,12 +1623,7 @@ ensure_section_branch() {
   if git rev-parse --verify "$expected_branch" &> /dev/null; then
     log_info "Branch $expected_branch already exists locally"
     # Record in state
-    local tmp_file="${state_file}.tmp.$$"
-    jq --arg section "$section_num" --arg branch "$expected_branch" '
-      .section_branches = (.section_branches // {}) |
-      .section_branches[$section] = $branch
-    ' "$state_file" > "$tmp_file"
-    mv "$tmp_file" "$state_file"
+    record_section_branch "$state_file" "$section_num" "$expected_branch"
     echo "$expected_branch"
     return 0
   fi
@@ -1044,12 +1633,7 @@ ensure_section_branch() {
     log_info "Branch $expected_branch exists on remote, fetching..."
     git fetch origin "$expected_branch:$expected_branch" 2>/dev/null || true
     # Record in state
-    local tmp_file="${state_file}.tmp.$$"
-    jq --arg section "$section_num" --arg branch "$expected_branch" '
-      .section_branches = (.section_branches // {}) |
-      .section_branches[$section] = $branch
-    ' "$state_file" > "$tmp_file"
-    mv "$tmp_file" "$state_file"
+    record_section_branch "$state_file" "$section_num" "$expected_branch"
     echo "$expected_branch"
     return 0
   fi
@@ -1073,12 +1657,7 @@ ensure_section_branch() {
 
   if [[ -n "$branch_name" ]]; then
     # Record branch in state
-    local tmp_file="${state_file}.tmp.$$"
-    jq --arg section "$section_num" --arg branch "$branch_name" '
-      .section_branches = (.section_branches // {}) |
-      .section_branches[$section] = $branch
-    ' "$state_file" > "$tmp_file"
-    mv "$tmp_file" "$state_file"
+    record_section_branch "$state_file" "$section_num" "$branch_name"
 
     # Create draft PR
     "$PR_CREATOR" draft "$prd_file" "$state_file" "$section_num" 2>/dev/null || true
@@ -1177,16 +1756,21 @@ git push origin $section_branch
   started_at="$(date -u +%Y-%m-%dT%H:%M:%SZ)"
 
   # Update state with full task metadata
-  local tmp_file="${state_file}.tmp.$$"
-  jq --arg id "$task_id" --arg status "in_progress" \
-     --arg agent "$agent_type" --arg started "$started_at" \
-     --arg updated "$started_at" \
-     '.tasks[$id].status = $status |
-      .tasks[$id].assigned_to = $agent |
-      .tasks[$id].started_at = $started |
-      .session.updated_at = $updated' \
-     "$state_file" > "$tmp_file"
-  mv "$tmp_file" "$state_file"
+  if state_managed; then
+    state_store "$state_file" start-task "$task_id" "$agent_type" --started-at "$started_at"
+  else
+    local tmp_file="${state_file}.tmp.$$"
+    jq --arg id "$task_id" --arg status "in_progress" \
+       --arg agent "$agent_type" --arg started "$started_at" \
+       --arg updated "$started_at" \
+       '.tasks[$id].status = $status |
+        .tasks[$id].assigned_to = $agent |
+        .tasks[$id].started_at = $started |
+        .session.updated_at = $updated' \
+       "$state_file" > "$tmp_file"
+    mv "$tmp_file" "$state_file"
+    journal start-task "$task_id" "$agent_type" --started-at "$started_at"
+  fi
 
   # Set environment for status writer
   export SVAO_STATUS_DIR="$STATUS_DIR"
@@ -1198,43 +1782,49 @@ git push origin $section_branch
   # Write initial status
   "$SCRIPT_DIR/status-writer.sh" running "starting" "Initializing..."
 
-  # Pass event FIFO path to subshell
-  export SVAO_EVENT_FIFO="$EVENT_FIFO"
-
-  # Dispatch agent (background)
-  (
-    if command -v claude &> /dev/null; then
-      # Grant file operation permissions for non-interactive autonomous agent mode
-      # Redirect tee stdout to /dev/null to prevent output leaking to terminal
-      echo "$prompt" | claude --print --permission-mode bypassPermissions 2>&1 | tee "$STATUS_DIR/${task_id}.output" >/dev/null
-      exit_code=${PIPESTATUS[1]}
-    else
-      log_warn "Claude CLI not found, simulating..."
-      echo "$prompt" > "$STATUS_DIR/${task_id}.prompt"
-      sleep 2
-      echo "TASK_COMPLETE: $task_id" > "$STATUS_DIR/${task_id}.output"
-      exit_code=0
+  local pid
+  if supervised; then
+    # The supervisor streams the output, detects signals and reports the exit
+    printf '%s\n' "$prompt" > "$STATUS_DIR/${task_id}.prompt"
+    if ! pid=$(supervisor spawn "$task_id" "$agent_type" --started-at "$started_at"); then
+      log_error "Supervisor could not start agent for task $task_id"
+      return 1
     fi
+  else
+    # Dispatch agent (background)
+    (
+      if command -v claude &> /dev/null; then
+        # Grant file operation permissions for non-interactive autonomous agent mode
+        # Redirect tee stdout to /dev/null to prevent output leaking to terminal
+        # The scanner writes the output file and emits early signal events
+        echo "$prompt" | claude --print --permission-mode bypassPermissions 2>&1 | \
+          python3 "$SIGNAL_SCANNER" scan "$task_id" --output "$STATUS_DIR/${task_id}.output" --event-socket "$EVENT_SOCKET"
+        exit_code=${PIPESTATUS[1]}
+      else
+        log_warn "Claude CLI not found, simulating..."
+        echo "$prompt" > "$STATUS_DIR/${task_id}.prompt"
+        sleep 2
+        echo "TASK_COMPLETE: $task_id" > "$STATUS_DIR/${task_id}.output"
+        exit_code=0
+      fi
 
-    # Write final status based on output and emit event
-    if grep -q "TASK_COMPLETE" "$STATUS_DIR/${task_id}.output"; then
-      "$SCRIPT_DIR/status-writer.sh" complete "TASK_COMPLETE"
-      # Emit completion event to FIFO
-      [[ -n "$SVAO_EVENT_FIFO" && -p "$SVAO_EVENT_FIFO" ]] && echo "TASK_COMPLETE:$task_id" >> "$SVAO_EVENT_FIFO"
-    elif grep -q "BLOCKED:" "$STATUS_DIR/${task_id}.output"; then
-      signal=$(grep -o "BLOCKED:[A-Z]*" "$STATUS_DIR/${task_id}.output" | head -1)
-      "$SCRIPT_DIR/status-writer.sh" failed "$signal" "See output file"
-      # Emit failure event to FIFO
-      [[ -n "$SVAO_EVENT_FIFO" && -p "$SVAO_EVENT_FIFO" ]] && echo "TASK_FAILED:$task_id" >> "$SVAO_EVENT_FIFO"
-    else
-      "$SCRIPT_DIR/status-writer.sh" failed "UNKNOWN" "Agent exited without signal"
-      # Emit failure event to FIFO
-      [[ -n "$SVAO_EVENT_FIFO" && -p "$SVAO_EVENT_FIFO" ]] && echo "TASK_FAILED:$task_id" >> "$SVAO_EVENT_FIFO"
-    fi
-  ) &
+      # Write final status based on output and emit event
+      if grep -q "TASK_COMPLETE" "$STATUS_DIR/${task_id}.output"; then
+        "$SCRIPT_DIR/status-writer.sh" complete "TASK_COMPLETE"
+        emit_event TASK_COMPLETE "$task_id"
+      elif grep -q "BLOCKED:" "$STATUS_DIR/${task_id}.output"; then
+        signal=$(grep -o "BLOCKED:[A-Z]*" "$STATUS_DIR/${task_id}.output" | head -1)
+        "$SCRIPT_DIR/status-writer.sh" failed "$signal" "See output file"
+        emit_event TASK_FAILED "$task_id"
+      else
+        "$SCRIPT_DIR/status-writer.sh" failed "UNKNOWN" "Agent exited without signal"
+        emit_event TASK_FAILED "$task_id"
+      fi
+    ) &
 
-  local pid=$!
-  add_active "$pid" "$task_id"
+    pid=$!
+    add_active "$pid" "$task_id"
+  fi
 
   log_agent "Agent PID $pid assigned to task $task_id"
 
@@ -1248,8 +1838,9 @@ git push origin $section_branch
 # ─────────────────────────────────────────────────────────────
 
 check_agent_status() {
-  local state_file="$1"
-  local task_id="$2"
+  local prd_file="$1"
+  local state_file="$2"
+  local task_id="$3"
 
   local status_file="$STATUS_DIR/${task_id}.status.json"
 
@@ -1268,8 +1859,14 @@ check_agent_status() {
       local duration=$(jq -r '.duration_seconds // 0' "$status_file")
       "$PROGRESS_WRITER" log "$progress_file" task_completed "$task_id" "$duration" || true
       local agent
-      agent=$(jq -r --arg id "$task_id" '.tasks[$id].assigned_to // "unknown"' "$state_file")
+      if state_managed; then
+        agent=$(state_store "$state_file" get tasks "$task_id" assigned_to --default unknown)
+      else
+        agent=$(jq -r --arg id "$task_id" '.tasks[$id].assigned_to // "unknown"' "$state_file")
+      fi
       update_metrics "$state_file" task_completed "$agent" "$duration"
+      python3 "$DURATIONS" record "$prd_file" "$task_id" "$agent" "$duration" ||
+        log_warn "Could not record duration of task $task_id"
       return 0
       ;;
     failed)
@@ -1288,7 +1885,8 @@ process_completed_agents() {
   local prd_file="$1"
   local state_file="$2"
 
-  if [[ ! -f "$ACTIVE_FILE" ]]; then
+  # Supervised agents always report their exit as an event
+  if supervised || [[ ! -f "$ACTIVE_FILE" ]]; then
     return
   fi
 
@@ -1297,11 +1895,16 @@ process_completed_agents() {
     [[ -z "$pid" ]] && continue
 
     if ! kill -0 "$pid" 2>/dev/null; then
+      # Its TASK_* event, later in this batch, will handle it
+      if exit_event_pending "$task_id"; then
+        continue
+      fi
+
       # Process exited
       remove_active "$pid"
 
-      check_agent_status "$state_file" "$task_id"
-      local result=$?
+      local result=0
+      check_agent_status "$prd_file" "$state_file" "$task_id" || result=$?
 
       case $result in
         0)
@@ -1327,7 +1930,7 @@ handle_failure() {
   local task_id="$3"
 
   local retries=$(get_retries "$task_id")
-  ((retries++))
+  retries=$((retries + 1))
   set_retries "$task_id" "$retries"
   update_metrics "$state_file" retry
 
@@ -1352,6 +1955,42 @@ run_dispatch_loop() {
   local state_file="$2"
   local resume="${3:-false}"
 
+  # Session journal. A resumed session's journal is replayed into
+  # prd-state.json; a new one starts from a snapshot of the current state
+  local session_id started_at replayed=false
+  if [[ "$resume" == "true" ]]; then
+    session_id=$(jq -r '.session.id' "$state_file")
+  else
+    session_id="svao-$(date +%Y%m%d-%H%M%S)"
+    started_at="$(date -u +%Y-%m-%dT%H:%M:%SZ)"
+  fi
+  JOURNAL_FILE="$(dirname "$state_file")/journal/$session_id.ndjson"
+  if [[ "$resume" == "true" && -f "$JOURNAL_FILE" ]]; then
+    log_info "Replaying session journal: $JOURNAL_FILE"
+    if python3 "$JOURNAL" replay "$JOURNAL_FILE" "$prd_file" "$state_file"; then
+      replayed=true
+    else
+      log_warn "Journal replay failed, resuming from prd-state.json"
+    fi
+  else
+    journal_snapshot "$state_file"
+  fi
+  # state_store.py and pr-creator.sh journal through this too
+  export SVAO_JOURNAL="$JOURNAL_FILE"
+
+  # Load state into the database; a resumed session keeps its database,
+  # which may be ahead of the last exported snapshot (unless the journal
+  # was replayed). The daemon loads prd-state.json itself, which it keeps
+  # flushed.
+  if [[ "$STATE_BACKEND" == "daemon" ]]; then
+    start_daemon "$prd_file" "$state_file"
+    trap 'stop_daemon' EXIT
+  elif state_managed; then
+    local import_args=()
+    [[ "$resume" == "true" && "$replayed" == "false" ]] && import_args+=(--resume)
+    state_store "$state_file" import ${import_args[@]+"${import_args[@]}"}
+  fi
+
   # Validate PRD hasn't changed
   if ! validate_prd_unchanged "$prd_file" "$state_file"; then
     log_error "Cannot proceed: PRD modified. Re-compile required."
@@ -1371,19 +2010,32 @@ run_dispatch_loop() {
     fi
   else
     # Fresh start - reset session
-    local tmp_file="${state_file}.tmp.$$"
-    jq --arg id "svao-$(date +%Y%m%d-%H%M%S)" \
-       --arg started "$(date -u +%Y-%m-%dT%H:%M:%SZ)" \
-       '.session.id = $id | .session.started_at = $started | .session.iteration = 0 | .session.status = "running"' \
-       "$state_file" > "$tmp_file"
-    mv "$tmp_file" "$state_file"
+    if state_managed; then
+      state_store "$state_file" session --id "$session_id" \
+        --started-at "$started_at" --iteration 0 --status running
+      state_export "$state_file"
+    else
+      local tmp_file="${state_file}.tmp.$$"
+      jq --arg id "$session_id" \
+         --arg started "$started_at" \
+         '.session.id = $id | .session.started_at = $started | .session.iteration = 0 | .session.status = "running"' \
+         "$state_file" > "$tmp_file"
+      mv "$tmp_file" "$state_file"
+      journal session --id "$session_id" --started-at "$started_at" --iteration 0 --status running
+    fi
     load_state "$state_file"
   fi
 
   # Mark session as running
-  local tmp_file="${state_file}.tmp.$$"
-  jq '.session.status = "running"' "$state_file" > "$tmp_file"
-  mv "$tmp_file" "$state_file"
+  if state_managed; then
+    state_store "$state_file" session --status running
+    state_export "$state_file"
+  else
+    local tmp_file="${state_file}.tmp.$$"
+    jq '.session.status = "running"' "$state_file" > "$tmp_file"
+    mv "$tmp_file" "$state_file"
+    journal session --status running
+  fi
 
   # Write progress log entry
   local progress_file="$(dirname "$state_file")/progress.md"
@@ -1393,15 +2045,20 @@ run_dispatch_loop() {
     "$PROGRESS_WRITER" log "$progress_file" session_start "Starting orchestration with $MAX_PARALLEL parallel agents" || true
   fi
 
-  # Setup event FIFO for reactive dispatch
-  setup_event_fifo
-  trap 'teardown_event_fifo' EXIT
+  # Setup the event channel for reactive dispatch
+  if [[ "$resume" == "true" ]]; then
+    load_event_metrics "$state_file"
+  fi
+  setup_event_channel
+  trap 'stop_supervisor; teardown_event_channel; stop_daemon' EXIT
+  supervised && start_supervisor
 
   log_info "Starting event-driven dispatch loop (max parallel: $MAX_PARALLEL)"
 
   # Initial queue rebuild and dispatch
   rebuild_queue "$prd_file" "$state_file"
   dispatch_to_capacity "$prd_file" "$state_file"
+  state_export "$state_file"
 
   # Track time for periodic tasks
   local last_checkpoint_time=$(date +%s)
@@ -1412,16 +2069,22 @@ run_dispatch_loop() {
   local last_event="Waiting for events..."
 
   # Render initial display
-  "$PROGRESS_WRITER" live "$state_file" "$STATUS_DIR" "$last_event" || true
+  "$PROGRESS_WRITER" live "$state_file" "$STATUS_DIR" "$last_event" "${PARALLEL_LIMIT:-$MAX_PARALLEL}" || true
 
   # Event-driven main loop
   while true; do
     # Check for completion
-    local progress
-    progress=$(jq -r '.summary.progress_percent' "$state_file")
+    local progress ready_count blocked_count
+    if state_managed; then
+      read -r progress ready_count blocked_count < <(state_store "$state_file" loop-status)
+    else
+      progress=$(jq -r '.summary.progress_percent' "$state_file")
+      ready_count=$(jq -r '.queue.ready | length' "$state_file")
+      blocked_count=$(jq -r '.queue.blocked | length' "$state_file")
+    fi
     if [[ "$progress" == "100" ]]; then
       last_event="All tasks complete!"
-      "$PROGRESS_WRITER" live "$state_file" "$STATUS_DIR" "$last_event" || true
+      "$PROGRESS_WRITER" live "$state_file" "$STATUS_DIR" "$last_event" "${PARALLEL_LIMIT:-$MAX_PARALLEL}" || true
       local summary
       summary=$(jq -r '"Completed \(.summary.completed) tasks"' "$state_file")
       "$PROGRESS_WRITER" log "$progress_file" session_complete "$summary" || true
@@ -1430,21 +2093,23 @@ run_dispatch_loop() {
 
     # Check for deadlock (no active, no ready, but blocked exists)
     local active_count=$(get_active_count)
-    local ready_count=$(jq -r '.queue.ready | length' "$state_file")
-    local blocked_count=$(jq -r '.queue.blocked | length' "$state_file")
 
     if [[ $active_count -eq 0 && $ready_count -eq 0 && $blocked_count -gt 0 ]]; then
       last_event="Deadlock: no ready tasks, $blocked_count blocked"
-      "$PROGRESS_WRITER" live "$state_file" "$STATUS_DIR" "$last_event" || true
+      "$PROGRESS_WRITER" live "$state_file" "$STATUS_DIR" "$last_event" "${PARALLEL_LIMIT:-$MAX_PARALLEL}" || true
       break
     fi
 
-    # Wait for event or timeout
-    local event=""
-    if event=$(read_event "$EVENT_TIMEOUT"); then
-      # Event received - process it immediately
-      last_event="$event"
-      process_event "$prd_file" "$state_file" "$event"
+    # Wait for events or timeout
+    if read_events "$EVENT_TIMEOUT"; then
+      # Events received - process the whole burst, then rebuild once
+      for EVENT_INDEX in "${!EVENT_BATCH[@]}"; do
+        process_event "$prd_file" "$state_file" "${EVENT_BATCH[EVENT_INDEX]}"
+      done
+      last_event="${EVENT_BATCH[-1]}"
+      if [[ ${#EVENT_BATCH[@]} -gt 1 ]]; then
+        last_event+=" (+$((${#EVENT_BATCH[@]} - 1)) more)"
+      fi
 
       # Rebuild queue and dispatch next task
       rebuild_queue "$prd_file" "$state_file"
@@ -1452,8 +2117,9 @@ run_dispatch_loop() {
 
       # Update metrics and render live display
       calculate_parallel_utilization "$state_file" "$MAX_PARALLEL"
+      record_event_metrics "$state_file"
       save_state "$state_file"
-      "$PROGRESS_WRITER" live "$state_file" "$STATUS_DIR" "$last_event" || true
+      "$PROGRESS_WRITER" live "$state_file" "$STATUS_DIR" "$last_event" "${PARALLEL_LIMIT:-$MAX_PARALLEL}" || true
     else
       # Timeout - run periodic tasks
       local now=$(date +%s)
@@ -1461,7 +2127,7 @@ run_dispatch_loop() {
 
       # Run checkpoint if interval elapsed
       if [[ $((now - last_checkpoint_time)) -ge $checkpoint_interval_secs ]]; then
-        ((ITERATION++))
+        ITERATION=$((ITERATION + 1))
 
         # Rebuild queue to catch any missed completions
         rebuild_queue "$prd_file" "$state_file"
@@ -1487,7 +2153,7 @@ run_dispatch_loop() {
       # Update and render live display
       calculate_parallel_utilization "$state_file" "$MAX_PARALLEL"
       save_state "$state_file"
-      "$PROGRESS_WRITER" live "$state_file" "$STATUS_DIR" "$last_event" || true
+      "$PROGRESS_WRITER" live "$state_file" "$STATUS_DIR" "$last_event" "${PARALLEL_LIMIT:-$MAX_PARALLEL}" || true
 
       last_periodic_time=$now
     fi
@@ -1501,20 +2167,28 @@ run_dispatch_loop() {
   persist_global_metrics "$state_file"
 
   # Mark session complete
-  local tmp_file="${state_file}.tmp.$$"
-  jq '.session.status = "completed"' "$state_file" > "$tmp_file"
-  mv "$tmp_file" "$state_file"
+  if state_managed; then
+    state_store "$state_file" session --status completed
+    state_export "$state_file"
+  else
+    local tmp_file="${state_file}.tmp.$$"
+    jq '.session.status = "completed"' "$state_file" > "$tmp_file"
+    mv "$tmp_file" "$state_file"
+    journal --sync session --status completed
+  fi
 
   # Cleanup (trap will also run, but be explicit)
-  teardown_event_fifo
+  stop_supervisor
+  teardown_event_channel
+  stop_daemon
 }
 
 # Entry point
 if [[ "${BASH_SOURCE[0]}" == "${0}" ]]; then
   if [[ $# -lt 2 ]]; then
-    echo "Usage: dispatch.sh <prd.json> <prd-state.json>" >&2
+    echo "Usage: dispatch.sh <prd.json> <prd-state.json> [true|false]" >&2
     exit 1
   fi
 
-  run_dispatch_loop "$1" "$2"
+  run_dispatch_loop "$1" "$2" "${3:-false}"
 fi
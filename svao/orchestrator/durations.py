@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+SVAO Duration History
+How long agents have taken, kept across sessions in agents/durations.json
+for ETAs and scheduling. Each completed task's duration is filed under
+
+    agent type / complexity / file-count bucket / keyword class
+
+(the MAX_SAMPLES most recent per key). A prediction reports the P50 and
+P90 of the most specific grouping with at least MIN_SAMPLES durations,
+backing off to coarser ones (same agent and complexity, same agent, ...).
+
+    durations.py record PRD TASK_ID AGENT SECONDS   after a task completes
+    durations.py predict PRD TASK_ID [--agent A]    P50 P90 SAMPLES BASIS
+    durations.py eta PRD STATE --parallel N         P50 P90 seconds to completion
+"""
+
+import argparse
+import fcntl
+import math
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import jsonio
+from scheduler import Scheduler, applied_dependencies, path_lengths
+
+HISTORY_FILE = Path(__file__).resolve().parent.parent / "agents" / "durations.json"
+
+# Durations kept per key; older ones age out so the estimate follows the agents
+MAX_SAMPLES = 50
+
+# Fewest durations a grouping needs before it is trusted
+MIN_SAMPLES = 3
+
+# Upper bounds of the file-count buckets; anything larger is "8+"
+FILE_BUCKETS = ((1, "0-1"), (3, "2-3"), (7, "4-7"))
+
+# First match on the task description wins
+KEYWORD_CLASSES = (
+    ("test", re.compile(r"\b(tests?|spec|e2e|coverage)\b")),
+    ("data", re.compile(r"\b(schema|migrations?|database|db|models?|seed)\b")),
+    ("api", re.compile(r"\b(api|endpoints?|routes?|server|handlers?|auth\w*)\b")),
+    ("ui", re.compile(r"\b(components?|pages?|forms?|buttons?|views?|layout|styles?|ui)\b")),
+    ("config", re.compile(r"\b(config\w*|setup|install|env|ci|build)\b")),
+    ("docs", re.compile(r"\b(docs?|documentation|readme)\b")),
+)
+
+# Groupings tried in order, most specific first
+FEATURES = ("agent", "complexity", "files", "keywords")
+LEVELS = tuple(FEATURES[:n] for n in range(len(FEATURES), 0, -1)) + (("complexity",), ())
+
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def file_bucket(count: int) -> str:
+    for limit, name in FILE_BUCKETS:
+        if count <= limit:
+            return name
+    return "8+"
+
+
+def keyword_class(description: str) -> str:
+    text = description.lower()
+    for name, pattern in KEYWORD_CLASSES:
+        if pattern.search(text):
+            return name
+    return "general"
+
+
+def task_features(task: dict, agent: str | None = None) -> dict[str, str]:
+    """
+    The history key of a prd.json task.
+
+    Examples:
+        task_features({"description": "Add login endpoint", "files": ["a.ts"], "complexity": "high",
+                       "agent_type": "api-builder"})
+            -> {"agent": "api-builder", "complexity": "high", "files": "0-1", "keywords": "api"}
+    """
+    return {
+        "agent": agent or task.get("agent_type") or "frontend-coder",
+        "complexity": task.get("complexity") or "medium",
+        "files": file_bucket(len(task.get("files") or ())),
+        "keywords": keyword_class(task.get("description") or "")
+    }
+
+
+def quantile(ordered: list[float], q: float) -> float:
+    """Linearly interpolated quantile of an ascending, non-empty list."""
+    position = (len(ordered) - 1) * q
+    low, high = math.floor(position), math.ceil(position)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+@dataclass(slots=True)
+class Estimate:
+    p50: float
+    p90: float
+    samples: int
+    basis: str  # The grouping used, e.g. "api-builder/high"
+
+
+@dataclass(slots=True)
+class DurationModel:
+    """
+    Duration history and the quantile estimates drawn from it.
+
+    Examples:
+        model = DurationModel.load()
+        model.predict(task) -> Estimate(p50=410.0, p90=655.0, samples=12, basis="api-builder/high/2-3")
+    """
+    history: dict[str, list[float]] = field(default_factory=dict)  # "agent/complexity/files/keywords" -> durations
+    _groups: dict[tuple, list[float]] | None = field(default=None, repr=False)
+
+    @classmethod
+    def load(cls, history_file: Path = HISTORY_FILE) -> "DurationModel":
+        try:
+            return cls(jsonio.load(history_file).get("history") or {})
+        except (OSError, ValueError):
+            return cls()
+
+    def groups(self) -> dict[tuple, list[float]]:
+        """(level, *feature values) -> sorted durations, for every grouping in LEVELS."""
+        if self._groups is None:
+            groups: dict[tuple, list[float]] = {}
+            for key, durations in self.history.items():
+                features = dict(zip(FEATURES, key.split("/")))
+                for level, names in enumerate(LEVELS):
+                    groups.setdefault((level, *(features.get(name) for name in names)), []).extend(durations)
+            for durations in groups.values():
+                durations.sort()
+            self._groups = groups
+        return self._groups
+
+    def predict(self, task: dict, agent: str | None = None) -> Estimate | None:
+        """P50/P90 for task from the most specific grouping with enough history (None if there is none)."""
+        features = task_features(task, agent)
+        groups = self.groups()
+        for level, names in enumerate(LEVELS):
+            values = tuple(features[name] for name in names)
+            durations = groups.get((level, *values))
+            if durations and len(durations) >= MIN_SAMPLES:
+                return Estimate(quantile(durations, 0.5), quantile(durations, 0.9), len(durations),
+                                "/".join(values) or "all")
+        return None
+
+    def weights(self, tasks: list[dict], status: dict[str, str]) -> dict[str, float] | None:
+        """Predicted P50 seconds per task (completed ones 0), or None without enough history."""
+        weights = {}
+        for task in tasks:
+            if status.get(task["id"]) == "completed":
+                weights[task["id"]] = 0.0
+                continue
+            estimate = self.predict(task)
+            if estimate is None:
+                return None
+            weights[task["id"]] = estimate.p50
+        return weights
+
+
+def record(history_file: Path, task: dict, agent: str, seconds: float) -> None:
+    """
+    Add one completed task's duration, under a lock so concurrent sessions
+    don't lose updates. The lock is a sidecar file because the history is
+    replaced by rename, which a lock on the history itself would not survive.
+    """
+    key = "/".join(task_features(task, agent).values())
+    history_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(history_file.with_suffix(".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            data = jsonio.load(history_file)
+        except FileNotFoundError:
+            data = {"version": 1, "history": {}}
+        durations = data.setdefault("history", {}).setdefault(key, [])
+        durations.append(round(seconds, 1))
+        del durations[:-MAX_SAMPLES]
+        data["updated_at"] = datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
+        jsonio.write(history_file, data, pretty=True)
+
+
+def estimate_completion(prd: dict, state: dict, model: DurationModel, parallel: int,
+                        now: datetime) -> tuple[float, float] | None:
+    """
+    Seconds until every task is complete, at P50 and P90: the longer of
+    the remaining critical path and the remaining work spread over
+    `parallel` agents. Running tasks count only their predicted remainder.
+    None while there is not enough history.
+    """
+    tasks = [task for section in prd["sections"] for task in section["tasks"]]
+    task_state = state.get("tasks") or {}
+    statuses = {task_id: entry.get("status", "pending") for task_id, entry in task_state.items()}
+    dependents = Scheduler.from_prd(prd, statuses, applied_dependencies(state)).dependents
+
+    p50: dict[str, float] = {}
+    p90: dict[str, float] = {}
+    for task in tasks:
+        entry = task_state.get(task["id"]) or {}
+        if entry.get("status") == "completed":
+            p50[task["id"]] = p90[task["id"]] = 0.0
+            continue
+        estimate = model.predict(task, entry.get("assigned_to"))
+        if estimate is None:
+            return None
+        elapsed = 0.0
+        if entry.get("status") == "in_progress" and entry.get("started_at"):
+            started = datetime.strptime(entry["started_at"], TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+            elapsed = max(0.0, (now - started).total_seconds())
+        p50[task["id"]] = max(0.0, estimate.p50 - elapsed)
+        p90[task["id"]] = max(0.0, estimate.p90 - elapsed)
+
+    def makespan(weights: dict[str, float]) -> float:
+        critical = max(path_lengths(weights, dependents).values(), default=0.0)
+        return max(critical, sum(weights.values()) / max(parallel, 1))
+
+    return makespan(p50), makespan(p90)
+
+
+def find_task(prd: dict, task_id: str) -> dict:
+    for section in prd["sections"]:
+        for task in section["tasks"]:
+            if task["id"] == task_id:
+                return task
+    raise ValueError(f"Task not found in PRD: {task_id}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Record and predict agent task durations")
+    arg_parser.add_argument("--history", type=Path, default=HISTORY_FILE,
+                            help=f"Duration history file (default: {HISTORY_FILE})")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+    command = commands.add_parser("record", help="Add a completed task's duration")
+    command.add_argument("prd_file", type=Path)
+    command.add_argument("task_id")
+    command.add_argument("agent")
+    command.add_argument("seconds", type=float)
+    command = commands.add_parser("predict", help="Print P50 P90 SAMPLES BASIS for a task")
+    command.add_argument("prd_file", type=Path)
+    command.add_argument("task_id")
+    command.add_argument("--agent", help="Agent type (default: the task's agent_type)")
+    command = commands.add_parser("eta", help="Print P50 P90 seconds until all tasks complete")
+    command.add_argument("prd_file", type=Path)
+    command.add_argument("state_file", type=Path)
+    command.add_argument("--parallel", type=int, required=True, help="Agents running at once")
+    args = arg_parser.parse_args()
+
+    for path in (args.prd_file, getattr(args, "state_file", None)):
+        if path is not None and not path.exists():
+            print(f"❌ File not found: {path}", file=sys.stderr)
+            sys.exit(1)
+
+    prd = jsonio.load(args.prd_file)
+    try:
+        if args.command == "record":
+            if args.seconds > 0:
+                record(args.history, find_task(prd, args.task_id), args.agent, args.seconds)
+        elif args.command == "predict":
+            estimate = DurationModel.load(args.history).predict(find_task(prd, args.task_id), args.agent)
+            if estimate is None:
+                sys.exit(1)
+            print(f"{estimate.p50:.0f} {estimate.p90:.0f} {estimate.samples} {estimate.basis}")
+        elif args.command == "eta":
+            eta = estimate_completion(prd, jsonio.load(args.state_file), DurationModel.load(args.history),
+                                      args.parallel, datetime.now(timezone.utc))
+            if eta is None:
+                sys.exit(1)
+            print(f"{eta[0]:.0f} {eta[1]:.0f}")
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
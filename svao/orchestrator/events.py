@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+SVAO Event Channel
+Carries events (TASK_COMPLETE:1.2, PHASE_FAILED:3, ...) from agents, the
+supervisor and phase reviewers to the dispatch loop.
+
+Each event is one datagram on a Unix socket, so events sent at the same
+time never interleave. While the channel is full a sender waits (up to
+SEND_TIMEOUT) rather than dropping the event; if the channel stays full,
+or is gone, the event is appended to events.spool next to the socket
+instead. The relay, started by dispatch.sh, is the socket's only reader.
+It hands events to the loop one line each:
+
+    SEQ<TAB>SENT_MS<TAB>SOURCE<TAB>EVENT       SOURCE is "socket" or "spool"
+
+Its writes block while the loop is busy, so a backlog waits in the
+socket's queue and, once that is full, holds the senders back. Spooled
+events are picked up when the relay starts and every POLL_INTERVAL.
+Datagrams that cannot be decoded are reported as EVENTS_DROPPED:<count>.
+
+    events.py relay SOCKET [--parent-pid PID]
+    events.py send SOCKET EVENT
+"""
+
+import argparse
+import fcntl
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import TextIO
+
+import jsonio
+
+# Seconds a sender waits for room in a full channel before spooling
+SEND_TIMEOUT = 5.0
+
+# Seconds between spool checks (and checks that the dispatch loop is alive)
+POLL_INTERVAL = 1.0
+
+# Longest event text; longer events (e.g. a verbose dependency reason) are cut
+MAX_EVENT = 4096
+
+MAX_DATAGRAM = 64 * 1024
+
+
+def spool_path(socket_path: Path) -> Path:
+    return socket_path.with_suffix(".spool")
+
+
+def now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def encode(event: str, sent_ms: int) -> bytes:
+    """One event as a datagram (and spool line). Tabs and newlines would break the loop's framing."""
+    text = event.replace("\t", " ").replace("\r", " ").replace("\n", " ")[:MAX_EVENT]
+    return jsonio.dumps({"sent_ms": sent_ms, "event": text}).encode()
+
+
+def decode(data: bytes) -> tuple[int, str]:
+    """(sent_ms, event) from a datagram; ValueError if it is not one."""
+    try:
+        message = jsonio.loads(data)
+        sent_ms, event = int(message["sent_ms"]), message["event"]
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Malformed event: {e}") from e
+    if not isinstance(event, str) or not event or "\n" in event or "\t" in event:
+        raise ValueError(f"Malformed event: {event!r}")
+    return sent_ms, event
+
+
+def spool(socket_path: Path, data: bytes) -> None:
+    """Append an undeliverable event for the relay to pick up."""
+    with open(spool_path(socket_path), "ab") as spool_file:
+        fcntl.flock(spool_file, fcntl.LOCK_EX)
+        spool_file.write(data + b"\n")
+
+
+def send(socket_path: Path, event: str, timeout: float = SEND_TIMEOUT) -> bool:
+    """
+    Deliver an event to the relay, waiting while the channel is full.
+    Returns False if it had to be spooled instead.
+
+    Examples:
+        send(Path("/tmp/svao/svao-20260101-120000/events.sock"), "TASK_COMPLETE:1.2") -> True
+    """
+    data = encode(event, now_ms())
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.settimeout(timeout)
+            # Connected, so a full receive queue blocks the send instead of failing it
+            sock.connect(str(socket_path))
+            sock.send(data)
+        return True
+    except OSError:  # No relay, or still full after the timeout
+        spool(socket_path, data)
+        return False
+
+
+def emit_event(event_socket: Path | None, event: str) -> None:
+    """Send an event if there is a channel, warning only if it could be neither sent nor spooled."""
+    if event_socket is None:
+        return
+    try:
+        send(event_socket, event)
+    except OSError as e:
+        print(f"❌ Could not send or spool event {event}: {e}", file=sys.stderr)
+
+
+def take_spool(socket_path: Path) -> list[bytes]:
+    """Spooled events, emptying the spool (under the senders' lock, so none is lost in between)."""
+    try:
+        spool_file = open(spool_path(socket_path), "r+b")
+    except FileNotFoundError:
+        return []
+    with spool_file:
+        fcntl.flock(spool_file, fcntl.LOCK_EX)
+        lines = spool_file.read().splitlines()
+        spool_file.truncate(0)
+    return [line for line in lines if line]
+
+
+class Relay:
+    """
+    Receives events and writes them, framed and numbered, to the dispatch loop.
+
+    Examples:
+        Relay(Path("/tmp/svao/<session>/events.sock"), sys.stdout).run()
+    """
+
+    def __init__(self, socket_path: Path, out: TextIO, parent_pid: int | None = None):
+        self.socket_path = socket_path
+        self.out = out
+        self.parent_pid = parent_pid
+        self.seq = 0
+
+    def deliver(self, sent_ms: int, source: str, event: str) -> None:
+        self.seq += 1
+        self.out.write(f"{self.seq}\t{sent_ms}\t{source}\t{event}\n")
+        self.out.flush()
+
+    def deliver_data(self, data: bytes, source: str) -> bool:
+        try:
+            sent_ms, event = decode(data)
+        except ValueError as e:
+            print(f"⚠️ Dropping {source} event: {e}", file=sys.stderr)
+            return False
+        self.deliver(sent_ms, source, event)
+        return True
+
+    def drain_spool(self) -> int:
+        """Deliver spooled events; returns how many could not be decoded."""
+        return sum(not self.deliver_data(data, "spool") for data in take_spool(self.socket_path))
+
+    def parent_alive(self) -> bool:
+        if self.parent_pid is None:
+            return True
+        try:
+            os.kill(self.parent_pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def run(self) -> None:
+        self.socket_path.unlink(missing_ok=True)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.bind(str(self.socket_path))
+            os.chmod(self.socket_path, 0o600)
+            try:
+                dropped = self.drain_spool()
+                next_poll = time.monotonic() + POLL_INTERVAL
+                while True:
+                    if dropped:
+                        self.deliver(now_ms(), "relay", f"EVENTS_DROPPED:{dropped}")
+                        dropped = 0
+                    readable, _, _ = select.select([sock], [], [], max(0.0, next_poll - time.monotonic()))
+                    if readable:
+                        dropped += not self.deliver_data(sock.recv(MAX_DATAGRAM), "socket")
+                    if time.monotonic() >= next_poll:
+                        if not self.parent_alive():
+                            return
+                        dropped += self.drain_spool()
+                        next_poll = time.monotonic() + POLL_INTERVAL
+            finally:
+                self.socket_path.unlink(missing_ok=True)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Deliver dispatch loop events over a Unix datagram socket")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+    command = commands.add_parser("relay", help="Receive events and print them, one framed line each")
+    command.add_argument("socket", type=Path)
+    command.add_argument("--parent-pid", type=int, help="Exit when this process exits")
+    command = commands.add_parser("send", help="Send one event")
+    command.add_argument("socket", type=Path)
+    command.add_argument("event")
+    args = arg_parser.parse_args()
+
+    if args.command == "send":
+        emit_event(args.socket, args.event)
+        return
+
+    # Exit through the finally blocks, so the socket is removed
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        Relay(args.socket, sys.stdout, args.parent_pid).run()
+    except (BrokenPipeError, KeyboardInterrupt):
+        # The dispatch loop is gone; keep the exit-time flush from failing too
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    except OSError as e:
+        print(f"❌ Event relay failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
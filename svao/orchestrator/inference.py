@@ -4,56 +4,161 @@ Dependency Inference Engine
 Infers task dependencies using multiple signals with confidence scoring.
 """
 
+import os
 import re
-from dataclasses import dataclass
+import sys
+import time
+import tracemalloc
+from bisect import bisect_left
 from collections import defaultdict
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+
+import jsonio
+from model import EdgeTable, InferredDependency
 
 
-@dataclass
-class InferredDependency:
-    from_task: str
-    to_task: str
-    confidence: int
-    reason: str
+@dataclass(frozen=True, slots=True)
+class DependencyGraph:
+    """Adjacency lists for the task DAG, each list in document order."""
+    forward: dict[str, tuple[str, ...]]  # task -> tasks it depends on
+    reverse: dict[str, tuple[str, ...]]  # task -> tasks it blocks
+
+    def to_dict(self) -> dict:
+        """Serialize for prd.json, omitting tasks without edges."""
+        return {
+            "forward": {task_id: list(deps) for task_id, deps in self.forward.items() if deps},
+            "reverse": {task_id: list(deps) for task_id, deps in self.reverse.items() if deps}
+        }
 
 
-def parse_task_id(task_id: str) -> tuple[tuple[int, ...], str]:
+def build_dependency_graph(tasks: list[dict], edges: Iterable[tuple[str, str]] = ()) -> DependencyGraph:
     """
-    Parse task ID into numeric parts and optional letter suffix.
+    Build forward and reverse edges from task depends_on plus extra
+    (from, to) edges, e.g. EdgeTable.pairs().
+
+    Single pass over the tasks: because tasks are visited in document order,
+    each reverse list comes out already ordered without a per-task scan.
+    Dependencies on unknown tasks sort after known ones.
+    """
+    position = {task['id']: index for index, task in enumerate(tasks)}
+    unknown = len(position)
+
+    deps: dict[str, set[str]] = defaultdict(set)
+    for from_task, to_task in edges:
+        deps[from_task].add(to_task)
+
+    forward: dict[str, tuple[str, ...]] = {}
+    reverse: dict[str, list[str]] = {}
+    for task in tasks:
+        task_id = task['id']
+        task_deps = deps[task_id].union(task.get('depends_on') or ())
+        forward[task_id] = tuple(sorted(task_deps, key=lambda d: (position.get(d, unknown), d)))
+        for dep in forward[task_id]:
+            reverse.setdefault(dep, []).append(task_id)
+
+    return DependencyGraph(
+        forward=forward,
+        reverse={task_id: tuple(reverse.get(task_id, ())) for task_id in forward}
+    )
+
+
+def build_file_index(tasks: list[dict]) -> dict[str, list[str]]:
+    """
+    Inverted index of the files tasks edit: each file named by more than
+    one task -> those tasks, in document order. A file only one task
+    touches can never be contended, so it is left out.
 
     Examples:
-        "1.1.2" -> ((1, 1, 2), "")
-        "1.1.2a" -> ((1, 1, 2), "a")
-        "1.2" -> ((1, 2), "")
+        build_file_index([{"id": "1.1", "files": ["a.ts"]}, {"id": "1.2", "files": ["a.ts", "b.ts"]}])
+            -> {"a.ts": ["1.1", "1.2"]}
+    """
+    index: dict[str, list[str]] = {}
+    for task in tasks:
+        for path in dict.fromkeys(task.get('files') or ()):
+            index.setdefault(path, []).append(task['id'])
+    return {path: task_ids for path, task_ids in index.items() if len(task_ids) > 1}
+
+
+TASK_ID_PART = re.compile(r'(\d+)([a-z]?)')
+LEADING_DIGITS = re.compile(r'\d+')
+
+# Bound on interned TaskIds; comfortably above the largest PRDs
+TASK_ID_CACHE_SIZE = 1 << 16
+
+
+@dataclass(frozen=True, slots=True)
+class TaskId:
     """
-    parts = task_id.split('.')
+    A parsed task ID. Use task_id() rather than the constructor so each ID
+    string is parsed once and shared by every strategy.
+
+    The sort key keeps numeric parts and suffix in separate slots, so IDs
+    of different depth ("2.1" vs "2.1.1") compare without mixing int and str.
+    """
+    raw: str
+    parts: tuple[int, ...]
+    suffix: str
+    subsection: str
+    sort_key: tuple[tuple[int, ...], str]
+
+
+@lru_cache(maxsize=TASK_ID_CACHE_SIZE)
+def task_id(raw: str) -> TaskId:
+    """Return the interned TaskId for `raw`."""
     numeric_parts = []
     letter_suffix = ""
 
-    for i, part in enumerate(parts):
-        # Check if last part has a letter suffix
-        match = re.match(r'^(\d+)([a-z]?)$', part)
+    for part in raw.split('.'):
+        # Check if the part has a letter suffix
+        match = TASK_ID_PART.fullmatch(part)
         if match:
             numeric_parts.append(int(match.group(1)))
             if match.group(2):
                 letter_suffix = match.group(2)
         else:
             # Fallback: try to extract any leading digits
-            digits = re.match(r'^(\d+)', part)
+            digits = LEADING_DIGITS.match(part)
             if digits:
-                numeric_parts.append(int(digits.group(1)))
+                numeric_parts.append(int(digits.group()))
 
-    return tuple(numeric_parts), letter_suffix
+    parts = tuple(numeric_parts)
+    if len(parts) >= 2:
+        subsection = '.'.join(str(p) for p in parts[:-1])
+    else:
+        subsection = str(parts[0]) if parts else ""
 
+    return TaskId(
+        raw=raw,
+        parts=parts,
+        suffix=letter_suffix,
+        subsection=subsection,
+        sort_key=(parts, letter_suffix)
+    )
+
+
+def parse_task_id(raw: str) -> tuple[tuple[int, ...], str]:
+    """
+    Parse task ID into numeric parts and optional letter suffix.
+
+    Examples:
+        "1.1.2" -> ((1, 1, 2), "")
+        "1.1.2a" -> ((1, 1, 2), "a")
+        "1.2" -> ((1, 2), "")
+    """
+    tid = task_id(raw)
+    return tid.parts, tid.suffix
 
-def task_id_sort_key(task_id: str) -> tuple:
+
+def task_id_sort_key(raw: str) -> tuple:
     """Return a sortable key for task IDs, handling letter suffixes."""
-    parts, suffix = parse_task_id(task_id)
-    # Append suffix as a sortable element (empty string sorts before letters)
-    return (*parts, suffix)
+    return task_id(raw).sort_key
 
 
-def get_subsection_key(task_id: str) -> str:
+def get_subsection_key(raw: str) -> str:
     """
     Get the subsection key for a task ID.
 
@@ -62,10 +167,7 @@ def get_subsection_key(task_id: str) -> str:
         "1.1.2a" -> "1.1"
         "1.2" -> "1"
     """
-    parts, _ = parse_task_id(task_id)
-    if len(parts) >= 2:
-        return '.'.join(str(p) for p in parts[:-1])
-    return str(parts[0]) if parts else ""
+    return task_id(raw).subsection
 
 
 def extract_stem(filepath: str) -> str:
@@ -77,30 +179,40 @@ def extract_stem(filepath: str) -> str:
     return name.lower()
 
 
+# Common development keywords: category -> words that signal it
+KEYWORD_PATTERNS = {
+    'schema': ['schema', 'model', 'table', 'entity'],
+    'type': ['type', 'interface', 'typedef'],
+    'mutation': ['mutation', 'create', 'update', 'delete', 'write'],
+    'query': ['query', 'read', 'fetch', 'get', 'list'],
+    'component': ['component', 'view', 'page', 'ui'],
+    'test': ['test', 'spec', 'coverage'],
+    'api': ['api', 'endpoint', 'route', 'handler'],
+}
+
+# Keyword dependency rules: category -> categories it typically builds on
+KEYWORD_DEPENDENCIES = {
+    'mutation': ['schema', 'type'],
+    'query': ['schema', 'type'],
+    'component': ['type', 'query', 'mutation'],
+    'test': [],  # Tests don't create dependencies
+    'api': ['schema', 'type'],
+}
+
+
 def extract_keywords(description: str) -> set[str]:
     """Extract meaningful keywords from task description."""
-    # Common development keywords
     keywords = set()
     desc_lower = description.lower()
 
-    patterns = {
-        'schema': ['schema', 'model', 'table', 'entity'],
-        'type': ['type', 'interface', 'typedef'],
-        'mutation': ['mutation', 'create', 'update', 'delete', 'write'],
-        'query': ['query', 'read', 'fetch', 'get', 'list'],
-        'component': ['component', 'view', 'page', 'ui'],
-        'test': ['test', 'spec', 'coverage'],
-        'api': ['api', 'endpoint', 'route', 'handler'],
-    }
-
-    for category, words in patterns.items():
+    for category, words in KEYWORD_PATTERNS.items():
         if any(word in desc_lower for word in words):
             keywords.add(category)
 
     return keywords
 
 
-def infer_from_subsection_order(tasks: list[dict]) -> list[InferredDependency]:
+def infer_from_subsection_order(tasks: list[dict], confidence: int = 90) -> list[InferredDependency]:
     """
     Infer sequential dependencies within subsections.
 
@@ -112,9 +224,8 @@ def infer_from_subsection_order(tasks: list[dict]) -> list[InferredDependency]:
     # Group tasks by subsection
     subsection_tasks: dict[str, list[str]] = defaultdict(list)
     for task in tasks:
-        task_id = task['id']
-        subsection = get_subsection_key(task_id)
-        subsection_tasks[subsection].append(task_id)
+        tid = task_id(task['id'])
+        subsection_tasks[tid.subsection].append(tid)
 
     # Create sequential dependencies within each subsection
     for subsection, task_ids in subsection_tasks.items():
@@ -122,99 +233,112 @@ def infer_from_subsection_order(tasks: list[dict]) -> list[InferredDependency]:
             continue
 
         # Sort by task ID
-        sorted_ids = sorted(task_ids, key=task_id_sort_key)
+        sorted_ids = sorted(task_ids, key=attrgetter('sort_key'))
 
         # Each task depends on the previous one
         for i in range(1, len(sorted_ids)):
             dependencies.append(InferredDependency(
-                from_task=sorted_ids[i],
-                to_task=sorted_ids[i - 1],
-                confidence=90,
+                from_task=sorted_ids[i].raw,
+                to_task=sorted_ids[i - 1].raw,
+                confidence=confidence,
                 reason=f"subsection order: sequential within {subsection}"
             ))
 
     return dependencies
 
 
-def infer_from_file_patterns(tasks: list[dict]) -> list[InferredDependency]:
+def infer_from_file_patterns(tasks: list[dict], confidence: int = 85) -> list[InferredDependency]:
     """Infer dependencies from file naming patterns."""
     dependencies = []
 
-    # Build stem -> task mapping
-    stem_to_task: dict[str, list[str]] = {}
+    # Build stem -> task mapping (a task with two files of one stem counts once)
+    stem_to_task: dict[str, list[TaskId]] = {}
     for task in tasks:
-        for filepath in task.get('files', []):
-            stem = extract_stem(filepath)
+        for stem in dict.fromkeys(extract_stem(filepath) for filepath in task.get('files', [])):
             if stem not in stem_to_task:
                 stem_to_task[stem] = []
-            stem_to_task[stem].append(task['id'])
+            stem_to_task[stem].append(task_id(task['id']))
 
     # Find tasks with shared stems
     for stem, task_ids in stem_to_task.items():
         if len(task_ids) > 1:
             # Sort by task ID (earlier tasks are dependencies)
-            sorted_ids = sorted(task_ids, key=task_id_sort_key)
+            sorted_ids = [tid.raw for tid in sorted(task_ids, key=attrgetter('sort_key'))]
             for i, later_task in enumerate(sorted_ids[1:], 1):
                 for earlier_task in sorted_ids[:i]:
                     dependencies.append(InferredDependency(
                         from_task=later_task,
                         to_task=earlier_task,
-                        confidence=85,
+                        confidence=confidence,
                         reason=f"file pattern: shared stem '{stem}'"
                     ))
 
     return dependencies
 
 
-def infer_from_keywords(tasks: list[dict]) -> list[InferredDependency]:
-    """Infer dependencies from keyword relationships."""
-    dependencies = []
+def infer_from_keywords(
+    tasks: list[dict],
+    max_predecessors: int | None = None,
+    same_section: bool = False,
+    confidence: int = 50,
+) -> list[InferredDependency]:
+    """
+    Infer dependencies from keyword relationships.
 
-    # Keyword dependency rules
-    keyword_deps = {
-        'mutation': ['schema', 'type'],
-        'query': ['schema', 'type'],
-        'component': ['type', 'query', 'mutation'],
-        'test': [],  # Tests don't create dependencies
-        'api': ['schema', 'type'],
-    }
+    Each keyword gets a bucket of its tasks sorted by precomputed task ID
+    key, so "all earlier tasks with keyword K" is a bisect range rather than
+    a scan with per-pair key computation.
 
-    # Build keyword -> tasks mapping
-    keyword_to_tasks: dict[str, list[str]] = {}
-    task_keywords: dict[str, set[str]] = {}
+    Args:
+        max_predecessors: Keep only the N nearest earlier tasks per rule.
+        same_section: Only consider earlier tasks in the same section.
+    """
+    dependencies = []
 
-    for task in tasks:
-        keywords = extract_keywords(task.get('description', ''))
-        task_keywords[task['id']] = keywords
+    task_ids = [task_id(task['id']) for task in tasks]
+    task_keywords = [extract_keywords(task.get('description', '')) for task in tasks]
+
+    # Build keyword -> (sorted keys, task IDs in the same order)
+    buckets: dict[str, list[tuple[tuple, str]]] = defaultdict(list)
+    for tid, keywords in zip(task_ids, task_keywords):
         for kw in keywords:
-            if kw not in keyword_to_tasks:
-                keyword_to_tasks[kw] = []
-            keyword_to_tasks[kw].append(task['id'])
+            buckets[kw].append((tid.sort_key, tid.raw))
+
+    keyword_index: dict[str, tuple[list[tuple], list[str]]] = {}
+    for kw, entries in buckets.items():
+        entries.sort(key=itemgetter(0))
+        keyword_index[kw] = ([key for key, _ in entries], [raw for _, raw in entries])
 
     # Find dependencies based on keyword relationships
-    for task in tasks:
-        task_kws = task_keywords.get(task['id'], set())
-        for kw in task_kws:
-            required_kws = keyword_deps.get(kw, [])
+    for tid, keywords in zip(task_ids, task_keywords):
+        for kw, required_kws in KEYWORD_DEPENDENCIES.items():
+            if kw not in keywords:
+                continue
             for req_kw in required_kws:
-                if req_kw in keyword_to_tasks:
-                    for dep_task_id in keyword_to_tasks[req_kw]:
-                        if dep_task_id != task['id']:
-                            # Check if dep_task is earlier using safe comparison
-                            dep_key = task_id_sort_key(dep_task_id)
-                            task_key = task_id_sort_key(task['id'])
-                            if dep_key < task_key:
-                                dependencies.append(InferredDependency(
-                                    from_task=task['id'],
-                                    to_task=dep_task_id,
-                                    confidence=50,
-                                    reason=f"keyword: '{kw}' typically depends on '{req_kw}'"
-                                ))
+                if req_kw not in keyword_index:
+                    continue
+                keys, req_ids = keyword_index[req_kw]
+
+                # Strictly earlier tasks only (also excludes the task itself)
+                end = bisect_left(keys, tid.sort_key)
+                # (section,) sorts before every ID in that section
+                start = bisect_left(keys, (tid.parts[:1], "")) if same_section else 0
+                if max_predecessors is not None:
+                    start = max(start, end - max_predecessors)
+
+                reason = f"keyword: '{kw}' typically depends on '{req_kw}'"
+                for dep_task_id in req_ids[start:end]:
+                    dependencies.append(InferredDependency(
+                        from_task=tid.raw,
+                        to_task=dep_task_id,
+                        confidence=confidence,
+                        reason=reason
+                    ))
 
     return dependencies
 
 
-def infer_from_section_order(sections: list[dict]) -> list[InferredDependency]:
+def infer_from_section_order(sections: list[dict], confidence: int = 25) -> list[InferredDependency]:
     """Infer coarse-grained dependencies from section order."""
     dependencies = []
 
@@ -227,76 +351,344 @@ def infer_from_section_order(sections: list[dict]) -> list[InferredDependency]:
             dependencies.append(InferredDependency(
                 from_task=curr_first,
                 to_task=prev_last,
-                confidence=25,
+                confidence=confidence,
                 reason=f"section order: section {section['number']} after section {prev_section['number']}"
             ))
 
     return dependencies
 
 
-def infer_dependencies(parsed_data: dict, confidence_threshold: int = 70) -> dict:
+def transitive_reduction(
+    tasks: list[dict],
+    inferred: list[InferredDependency],
+) -> tuple[list[InferredDependency], int]:
     """
-    Run all inference strategies and categorize results.
+    Drop inferred edges already implied by a longer path in the combined DAG.
+
+    The DAG is the tasks' explicit depends_on plus `inferred`. Explicit
+    edges are never removed. Reachability is tracked as integer bitsets
+    indexed by topological position, so each task's successors are checked
+    in one sweep from the nearest dependency outward.
+
+    Returns the surviving inferred edges (in their original order) and the
+    number pruned. Inferred self-edges are pruned. If the combined graph has
+    a cycle it is left unchanged, with a warning.
+    """
+    successors: dict[str, set[str]] = {
+        task['id']: set(task.get('depends_on') or ()) - {task['id']} for task in tasks
+    }
+    for dep in inferred:
+        if dep.from_task in successors and dep.from_task != dep.to_task:
+            successors[dep.from_task].add(dep.to_task)
+
+    # Topological order, dependencies first (Kahn's algorithm)
+    remaining = {task_id: sum(1 for d in deps if d in successors) for task_id, deps in successors.items()}
+    dependents: dict[str, list[str]] = defaultdict(list)
+    for task_id, deps in successors.items():
+        for d in deps:
+            if d in successors:
+                dependents[d].append(task_id)
+
+    order = [task_id for task_id, count in remaining.items() if count == 0]
+    for task_id in order:
+        for dependent in dependents[task_id]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                order.append(dependent)
+
+    if len(order) != len(successors):
+        print(f"⚠ Dependency cycle among {len(successors) - len(order)} tasks, skipping transitive reduction",
+              file=sys.stderr)
+        return inferred, 0
+
+    position = {task_id: index for index, task_id in enumerate(order)}
+    reach: dict[str, int] = {}
+    redundant: set[tuple[str, str]] = {(dep.from_task, dep.to_task) for dep in inferred
+                                       if dep.from_task == dep.to_task}
+
+    for task_id in order:
+        covered = 0
+        # Anything that can reach a successor sits later in topological order
+        for d in sorted((d for d in successors[task_id] if d in position), key=position.__getitem__, reverse=True):
+            bit = 1 << position[d]
+            if covered & bit:
+                redundant.add((task_id, d))
+            covered |= bit | reach[d]
+        reach[task_id] = covered
+
+    kept = [dep for dep in inferred if (dep.from_task, dep.to_task) not in redundant]
+    return kept, len(inferred) - len(kept)
+
+
+@dataclass(frozen=True, slots=True)
+class Strategy:
+    """An inference strategy and the context inputs it is called with."""
+    name: str
+    func: Callable[..., list[InferredDependency]]
+    inputs: tuple[str, ...]  # context keys, passed positionally
+    default_confidence: int
+    cost_class: str  # growth in task count: "linear", "nlogn" or "quadratic"
+
+
+# Registered strategies, in merge order (earlier wins confidence ties)
+STRATEGIES: dict[str, Strategy] = {}
+
+
+def register_strategy(strategy: Strategy) -> Strategy:
+    """Add a strategy to the registry (replacing any with the same name)."""
+    STRATEGIES[strategy.name] = strategy
+    return strategy
+
+
+register_strategy(Strategy(
+    name="subsection_order",  # High confidence sequential order
+    func=infer_from_subsection_order,
+    inputs=("tasks",),
+    default_confidence=90,
+    cost_class="nlogn"
+))
+register_strategy(Strategy(
+    name="file_patterns",
+    func=infer_from_file_patterns,
+    inputs=("tasks",),
+    default_confidence=85,
+    cost_class="quadratic"
+))
+register_strategy(Strategy(
+    name="keywords",
+    func=infer_from_keywords,
+    inputs=("tasks", "keyword_window", "keyword_same_section"),
+    default_confidence=50,
+    cost_class="quadratic"
+))
+register_strategy(Strategy(
+    name="section_order",
+    func=infer_from_section_order,
+    inputs=("sections",),
+    default_confidence=25,
+    cost_class="linear"
+))
+
+
+# Pools for running strategies concurrently (see infer_dependencies)
+STRATEGY_EXECUTORS = {
+    "process": ProcessPoolExecutor,
+    "thread": ThreadPoolExecutor,
+}
+
+
+def run_strategy(
+    strategy: Strategy,
+    args: tuple,
+    trace_memory: bool = False,
+    columnar: bool = False,
+) -> tuple[list[InferredDependency] | EdgeTable, dict]:
+    """
+    Run one strategy and measure it.
+
+    Returns its edges (as an EdgeTable with `columnar`, which is how process
+    workers ship them back) and a stats dict: wall time, edge count and,
+    with `trace_memory`, peak traced allocation in bytes.
+    """
+    if trace_memory:
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+    started = time.perf_counter()
+    edges = strategy.func(*args, confidence=strategy.default_confidence)
+    if columnar:
+        edges = EdgeTable(edges)
+    seconds = time.perf_counter() - started
+
+    peak_memory = None
+    if trace_memory:
+        peak_memory = tracemalloc.get_traced_memory()[1] - baseline
+        if not was_tracing:
+            tracemalloc.stop()
+
+    return edges, {
+        "name": strategy.name,
+        "cost_class": strategy.cost_class,
+        "default_confidence": strategy.default_confidence,
+        "enabled": True,
+        "edges": len(edges),
+        "seconds": round(seconds, 4),
+        "peak_memory_bytes": peak_memory
+    }
+
+
+def infer_dependencies(
+    parsed_data: dict,
+    confidence_threshold: int = 70,
+    keyword_window: int | None = None,
+    keyword_same_section: bool = False,
+    reduce: bool = True,
+    columnar: bool = False,
+    parallel: str | None = None,
+    strategies: Iterable[str] | None = None,
+    trace_memory: bool = False,
+) -> dict:
+    """
+    Run the registered inference strategies and categorize results.
+
+    `strategies` names the strategies to run (default: all of STRATEGIES);
+    they always run in registry order. `keyword_window` and
+    `keyword_same_section` bound the keyword strategy's output (see
+    infer_from_keywords); by default it is unbounded. With `reduce`,
+    auto-applied edges implied by other applied edges are pruned (see
+    transitive_reduction). With `columnar`, both edge lists are returned as
+    EdgeTables instead of lists of dicts.
+
+    `parallel` ("process" or "thread") runs the strategies concurrently.
+    Results are merged in the same strategy order as the serial path, so
+    the output is identical either way. `trace_memory` records each
+    strategy's peak allocation with tracemalloc (slow; not in thread mode,
+    where strategies share one tracer).
 
     Returns:
         {
             "auto_apply": [...],  # confidence >= threshold
-            "pending_review": [...]  # confidence < threshold
+            "pending_review": [...],  # confidence < threshold
+            "pruned": N,  # redundant auto-apply edges removed
+            "strategies": [...]  # per-strategy stats, in registry order
         }
     """
+    enabled = set(STRATEGIES if strategies is None else strategies)
+    unknown = enabled.difference(STRATEGIES)
+    if unknown:
+        raise ValueError(f"Unknown inference strategies: {', '.join(sorted(unknown))}")
+
     all_tasks = []
     for section in parsed_data.get('sections', []):
         all_tasks.extend(section.get('tasks', []))
 
-    # Collect all inferences
-    all_deps: list[InferredDependency] = []
-    all_deps.extend(infer_from_subsection_order(all_tasks))  # High confidence sequential order
-    all_deps.extend(infer_from_file_patterns(all_tasks))
-    all_deps.extend(infer_from_keywords(all_tasks))
-    all_deps.extend(infer_from_section_order(parsed_data.get('sections', [])))
+    context = {
+        "tasks": all_tasks,
+        "sections": parsed_data.get('sections', []),
+        "keyword_window": keyword_window,
+        "keyword_same_section": keyword_same_section,
+    }
+    selected = [
+        (strategy, tuple(context[key] for key in strategy.inputs))
+        for strategy in STRATEGIES.values() if strategy.name in enabled
+    ]
+
+    # Collect all inferences, deduplicating as they stream in (keep highest confidence)
+    if parallel:
+        executor = STRATEGY_EXECUTORS[parallel]
+        trace_workers = trace_memory and parallel == "process"
+        with executor(max_workers=max(1, min(len(selected), os.cpu_count() or 1))) as pool:
+            futures = [
+                pool.submit(run_strategy, strategy, args, trace_workers, parallel == "process")
+                for strategy, args in selected
+            ]
+            # Merge in submission order, not completion order
+            results = [future.result() for future in futures]
+    else:
+        results = (run_strategy(strategy, args, trace_memory) for strategy, args in selected)
 
-    # Deduplicate (keep highest confidence)
+    stats_by_name: dict[str, dict] = {}
     unique_deps: dict[tuple[str, str], InferredDependency] = {}
-    for dep in all_deps:
-        key = (dep.from_task, dep.to_task)
-        if key not in unique_deps or dep.confidence > unique_deps[key].confidence:
-            unique_deps[key] = dep
+    for edges, stats in results:
+        stats_by_name[stats['name']] = stats
+        for dep in edges:
+            key = (dep.from_task, dep.to_task)
+            if key not in unique_deps or dep.confidence > unique_deps[key].confidence:
+                unique_deps[key] = dep
+
+    strategy_stats = [
+        stats_by_name.get(strategy.name) or {
+            "name": strategy.name,
+            "cost_class": strategy.cost_class,
+            "default_confidence": strategy.default_confidence,
+            "enabled": False,
+            "edges": 0,
+            "seconds": 0.0,
+            "peak_memory_bytes": None
+        }
+        for strategy in STRATEGIES.values()
+    ]
 
     # Categorize by confidence
-    auto_apply = []
-    pending_review = []
-
-    for dep in unique_deps.values():
-        dep_dict = {
-            "from": dep.from_task,
-            "to": dep.to_task,
-            "confidence": dep.confidence,
-            "reason": dep.reason
+    applied = [dep for dep in unique_deps.values() if dep.confidence >= confidence_threshold]
+    review = [dep for dep in unique_deps.values() if dep.confidence < confidence_threshold]
+    del unique_deps
+
+    pruned = 0
+    if reduce:
+        applied, pruned = transitive_reduction(all_tasks, applied)
+
+    if columnar:
+        return {
+            "auto_apply": EdgeTable(applied),
+            "pending_review": EdgeTable(review),
+            "pruned": pruned,
+            "strategies": strategy_stats
         }
-        if dep.confidence >= confidence_threshold:
-            auto_apply.append(dep_dict)
-        else:
-            pending_review.append(dep_dict)
 
     return {
-        "auto_apply": auto_apply,
-        "pending_review": pending_review
+        "auto_apply": [dep.to_dict() for dep in applied],
+        "pending_review": [dep.to_dict() for dep in review],
+        "pruned": pruned,
+        "strategies": strategy_stats
     }
 
 
-if __name__ == "__main__":
-    import json
-    import sys
+def load_parsed(text: str) -> dict:
+    """Accept parser.py output either as one JSON document or as NDJSON sections."""
+    try:
+        data = jsonio.loads(text)
+    except ValueError:
+        data = None
+    if isinstance(data, dict) and 'sections' in data:
+        return data
+    return {"sections": [jsonio.loads(line) for line in text.splitlines() if line.strip()]}
+
+
+def main():
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Infer task dependencies from parser.py output")
+    arg_parser.add_argument("parsed_file", nargs="?",
+                            help="Parsed tasks as JSON or NDJSON sections (default: stdin)")
+    arg_parser.add_argument("--pretty", action="store_true",
+                            help="Indent the JSON output (default for human output on a terminal)")
+    output_mode = arg_parser.add_mutually_exclusive_group()
+    output_mode.add_argument("--json", action="store_true",
+                             help="Machine mode: stdout carries only the JSON result, diagnostics go to stderr")
+    output_mode.add_argument("--ndjson", action="store_true",
+                             help="Machine mode: one JSON line per edge on stdout, diagnostics go to stderr")
+    args = arg_parser.parse_args()
+
+    # In machine modes stdout carries nothing but the payload
+    machine = args.json or args.ndjson
+    diagnostics = sys.stderr if machine else sys.stdout
 
     # Read parsed JSON from stdin or file
-    if len(sys.argv) > 1:
-        with open(sys.argv[1]) as f:
-            data = json.load(f)
+    if args.parsed_file:
+        with open(args.parsed_file) as f:
+            data = load_parsed(f.read())
     else:
-        data = json.load(sys.stdin)
+        data = load_parsed(sys.stdin.read())
 
-    result = infer_dependencies(data)
+    result = infer_dependencies(data, columnar=args.ndjson)
 
-    print(f"✓ Inferred {len(result['auto_apply'])} high-confidence dependencies")
-    print(f"⚠ {len(result['pending_review'])} dependencies need review")
-    print(json.dumps(result, indent=2))
+    print(f"✓ Inferred {len(result['auto_apply'])} high-confidence dependencies ({result['pruned']} redundant pruned)",
+          file=diagnostics)
+    print(f"⚠ {len(result['pending_review'])} dependencies need review", file=diagnostics)
+
+    if args.ndjson:
+        for status in ("auto_apply", "pending_review"):
+            for edge in result[status].iter_dicts():
+                edge["status"] = status
+                sys.stdout.write(jsonio.dumps(edge) + "\n")
+        return
+
+    jsonio.dump(result, sys.stdout, pretty=args.pretty or (not machine and sys.stdout.isatty()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+SVAO Session Journal
+Append-only record of a dispatch session, one JSON object per line with a
+sequence number, in journal/<session-id>.ndjson next to prd-state.json:
+
+    {"seq": 1, "ts": "...", "type": "snapshot", "state": {...}}
+    {"seq": 2, "ts": "...", "type": "command", "event": "dispatch",
+     "args": {"command": "start-task", "task_id": "1.1", ...}}
+    {"seq": 5, "ts": "...", "type": "command", "argv": ["task-status", "1.1", "completed"]}
+    {"seq": 9, "ts": "...", "type": "checkpoint", "checkpoint": "queue-planning",
+     "command": "REORDER", "args": "1.3,1.2"}
+
+The snapshot is the state the session started from. Every later state
+change is journaled as the state_store.py command that makes it, whichever
+backend ran it, so replay is: import the snapshot into an in-memory
+store and run the commands again, each at its recorded time. The SQLite
+store and the daemon journal their parsed commands ("args"); dispatch.sh
+appends the json backend's itself, without starting Python, as the
+command line ("argv"), under the same lock. Checkpoint records keep the
+checkpoint agents' commands themselves; their state changes follow as
+commands.
+
+Lines are written as they happen and fsynced in batches (every SYNC_EVERY
+records in one process, whenever prd-state.json is exported, and once per
+dispatch loop pass), so a crashed dispatch loop loses nothing and a
+crashed host at most the last batch.
+
+    journal.py snapshot JOURNAL STATE_FILE
+    journal.py append [--sync] JOURNAL COMMAND [ARGS...]   a state_store.py command
+    journal.py checkpoint JOURNAL TYPE COMMAND [ARGS]
+    journal.py sync JOURNAL
+    journal.py replay JOURNAL PRD STATE_FILE [--stdout]
+"""
+
+import argparse
+import fcntl
+import io
+import os
+import sys
+from collections.abc import Iterator
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Any
+
+import jsonio
+from state_store import READ_COMMANDS, StateStore, build_parser, run_command, utc_now
+
+# Records written between fsyncs
+SYNC_EVERY = 32
+
+# Bytes read per step when looking for the last record from the end of the file
+TAIL_CHUNK = 64 * 1024
+
+# State commands that are not journaled: reads, and the adaptive concurrency
+# record, which is re-sampled from the host at its next evaluation
+UNJOURNALED_COMMANDS = READ_COMMANDS | {"import", "concurrency"}
+
+# Parsed-argument fields that belong to the invocation, not the command
+INVOCATION_FIELDS = ("state_file", "db", "journal")
+
+TASK_STATUS_EVENTS = {"completed": "completion", "blocked": "failure", "failed": "failure"}
+
+COMMAND_EVENTS = {
+    "start-task": "dispatch",
+    "rebuild-queue": "queue",
+    "reorder": "queue",
+    "add-dependency": "dependency",
+    "checkpoint": "checkpoint",
+    "review-section": "checkpoint",
+    "unblock": "checkpoint",
+    "rework": "checkpoint",
+    "metric": "metric",
+    "utilization": "metric",
+    "session": "session",
+    "set": "set",
+}
+
+
+def journal_path(state_file: Path, session_id: str) -> Path:
+    """prd-state.json + session -> journal/<session>.ndjson alongside it."""
+    return state_file.parent / "journal" / f"{session_id}.ndjson"
+
+
+def command_fields(args: argparse.Namespace) -> dict[str, Any]:
+    """A parsed state_store.py command as journal args (paths as strings)."""
+    return {key: str(value) if isinstance(value, Path) else value
+            for key, value in vars(args).items() if key not in INVOCATION_FIELDS}
+
+
+def command_event(fields: dict[str, Any]) -> str:
+    """
+    What a state command records, for reading the journal.
+
+    Examples:
+        command_event({"command": "task-status", "status": "completed"}) -> "completion"
+        command_event({"command": "start-task", ...}) -> "dispatch"
+    """
+    if fields["command"] == "task-status":
+        return TASK_STATUS_EVENTS.get(fields["status"], "status")
+    return COMMAND_EVENTS.get(fields["command"], fields["command"])
+
+
+def last_line(fd: int, size: int) -> bytes:
+    """The last line of a file (without its newline), reading back from the end."""
+    end = size
+    tail = b""
+    while end > 0:
+        start = max(0, end - TAIL_CHUNK)
+        tail = os.pread(fd, end - start, start) + tail
+        end = start
+        newline = tail.rfind(b"\n", 0, len(tail) - 1)
+        if newline >= 0:
+            return tail[newline + 1:-1]
+    return tail[:-1]
+
+
+class Journal:
+    """
+    Appends records to a session journal.
+
+    Several processes may append to one journal (the dispatch loop, the PR
+    creator, background phase reviewers); each append takes an exclusive
+    lock on the file, so sequence numbers stay unique and in order.
+
+    Examples:
+        journal = Journal(journal_path(Path("prd-state.json"), "svao-20260101-120000"))
+        journal.append("command", event="dispatch", args={"command": "start-task", ...}) -> 12
+        journal.close()
+    """
+
+    def __init__(self, path: Path, sync_every: int = SYNC_EVERY):
+        self.path = path
+        self.sync_every = sync_every
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        self.seq = 0
+        self._size = -1  # File size after our last append; -1 until the tail is read
+        self._unsynced = 0
+
+    def append(self, record_type: str, **fields: Any) -> int:
+        """Write one record; returns its sequence number."""
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            size = os.fstat(self.fd).st_size
+            prefix = b""
+            if size != self._size and size:
+                # Someone else appended since; continue after their last record
+                try:
+                    self.seq = jsonio.loads(last_line(self.fd, size))["seq"]
+                except (ValueError, KeyError, TypeError):
+                    self.seq = max(self.seq, last_seq(self.path))
+                if os.pread(self.fd, 1, size - 1) != b"\n":
+                    prefix = b"\n"  # Terminate a torn line so the next record starts clean
+            self.seq += 1
+            record = {"seq": self.seq, "ts": fields.pop("ts", None) or utc_now(), "type": record_type, **fields}
+            data = prefix + jsonio.dumps(record).encode() + b"\n"
+            os.write(self.fd, data)
+            self._size = size + len(data)
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self.sync()
+        return self.seq
+
+    def append_command(self, args: argparse.Namespace) -> int | None:
+        """Journal a state_store.py command that ran (None if it is not journaled)."""
+        if args.command in UNJOURNALED_COMMANDS:
+            return None
+        fields = command_fields(args)
+        return self.append("command", event=command_event(fields), args=fields)
+
+    def sync(self) -> None:
+        """fsync the journal, including records other processes appended."""
+        os.fsync(self.fd)
+        self._unsynced = 0
+
+    def close(self) -> None:
+        """Close without fsync; the next sync (in any process) covers what is left."""
+        os.close(self.fd)
+
+
+def read_records(path: Path) -> Iterator[dict]:
+    """Records in file order, skipping (with a warning) lines a crash cut short."""
+    with open(path, "rb") as journal:
+        for number, line in enumerate(journal, 1):
+            try:
+                record = jsonio.loads(line)
+                record["seq"], record["type"]
+            except (ValueError, KeyError, TypeError):
+                print(f"⚠️ Skipping unreadable journal line {number} in {path}", file=sys.stderr)
+                continue
+            yield record
+
+
+def last_seq(path: Path) -> int:
+    return max((record["seq"] for record in read_records(path)), default=0)
+
+
+def replay(path: Path, prd: dict) -> tuple[dict, int]:
+    """
+    Rebuild prd-state.json from a journal. Returns the state and the number
+    of commands applied.
+
+    Each command runs on an in-memory StateStore whose clock reads the
+    record's timestamp, so timestamps come back as they were written.
+    """
+    clock = {"now": ""}
+    parser, _ = build_parser()
+    store: StateStore | None = None
+    applied = 0
+    previous = 0
+    try:
+        for record in read_records(path):
+            if record["seq"] <= previous:
+                raise ValueError(f"Journal out of order at seq {record['seq']} (after {previous})")
+            if record["seq"] != previous + 1 and previous:
+                print(f"⚠️ Journal gap: seq {previous} -> {record['seq']}", file=sys.stderr)
+            previous = record["seq"]
+            clock["now"] = record.get("ts") or utc_now()
+
+            if record["type"] == "snapshot":
+                if store is not None:
+                    store.close()
+                store = StateStore(Path(":memory:"), clock=lambda: clock["now"])
+                store.import_state(record["state"])
+            elif record["type"] == "command":
+                if store is None:
+                    raise ValueError(f"Journal has a command before its snapshot (seq {record['seq']})")
+                try:
+                    if "argv" in record:
+                        try:
+                            with redirect_stderr(io.StringIO()):
+                                args = parser.parse_args(["-", *record["argv"]])
+                        except SystemExit:
+                            raise TypeError(f"not a state_store.py command: {record['argv']}") from None
+                    else:
+                        args = argparse.Namespace(**record["args"])
+                    with redirect_stdout(io.StringIO()):
+                        run_command(store, args, lambda _path: prd)
+                except (AttributeError, TypeError, KeyError) as e:
+                    raise ValueError(f"Malformed command at seq {record['seq']}: {e}") from e
+                applied += 1
+        if store is None:
+            raise ValueError(f"No snapshot in journal: {path}")
+        return store.export_state(), applied
+    finally:
+        if store is not None:
+            store.close()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Append to and replay SVAO session journals")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+    command = commands.add_parser("snapshot", help="Record the state a session starts from")
+    command.add_argument("journal", type=Path)
+    command.add_argument("state_file", type=Path)
+    command = commands.add_parser("append", help="Record a state_store.py command")
+    command.add_argument("--sync", action="store_true", help="fsync the journal afterwards")
+    command.add_argument("journal", type=Path)
+    command.add_argument("argv", nargs=argparse.REMAINDER, help="Command, as for state_store.py")
+    command = commands.add_parser("checkpoint", help="Record a command from a checkpoint agent")
+    command.add_argument("journal", type=Path)
+    command.add_argument("type", help="Checkpoint type, e.g. queue-planning")
+    command.add_argument("checkpoint_command", metavar="COMMAND")
+    command.add_argument("args", nargs="?", default="")
+    command = commands.add_parser("sync", help="fsync the journal")
+    command.add_argument("journal", type=Path)
+    command = commands.add_parser("replay", help="Rebuild prd-state.json from a journal")
+    command.add_argument("journal", type=Path)
+    command.add_argument("prd_file", type=Path)
+    command.add_argument("state_file", type=Path, help="prd-state.json to write")
+    command.add_argument("--stdout", action="store_true", help="Print instead of writing the state file")
+    args = arg_parser.parse_args()
+
+    if args.command == "snapshot":
+        required = (args.state_file,)
+    elif args.command == "replay":
+        required = (args.journal, args.prd_file)
+    else:
+        required = ()
+    for path in required:
+        if not path.exists():
+            print(f"❌ File not found: {path}", file=sys.stderr)
+            sys.exit(1)
+
+    try:
+        if args.command == "replay":
+            state, applied = replay(args.journal, jsonio.load(args.prd_file))
+            if args.stdout:
+                jsonio.dump(state, sys.stdout, pretty=True)
+            else:
+                jsonio.write(args.state_file, state, pretty=True)
+            print(f"replayed {applied} commands from {args.journal}", file=sys.stderr)
+            return
+
+        journal = Journal(args.journal)
+        try:
+            if args.command == "snapshot":
+                journal.append("snapshot", state=jsonio.load(args.state_file))
+                journal.sync()
+            elif args.command == "append":
+                parser, _ = build_parser()
+                journal.append_command(parser.parse_args(["-", *args.argv]))
+                if args.sync:
+                    journal.sync()
+            elif args.command == "checkpoint":
+                journal.append("checkpoint", checkpoint=args.type, command=args.checkpoint_command,
+                               args=args.args)
+            elif args.command == "sync":
+                journal.sync()
+        finally:
+            journal.close()
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+SVAO JSON I/O
+Shared serialization for prd.json, prd-state.json and the parser/inference
+CLIs: compact output for machines, indented output for humans.
+
+Uses orjson when it is installed and the standard library otherwise. Both
+write equivalent JSON in the same layout, but not always the same bytes:
+floats are formatted differently (orjson 1e16 and 3e-7, the standard
+library 1e+16 and 3e-07). Digests such as prd_hash are of the bytes
+actually written. dump() streams large arrays element by element rather
+than building the whole document as one string.
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Any
+
+from model import EdgeTable, json_default
+
+try:
+    import orjson
+except ImportError:  # Optional speedup
+    orjson = None
+
+# Containers shallower than this are written element by element by dump();
+# deeper ones (e.g. a single task) are encoded in one backend call.
+STREAM_DEPTH = 3
+
+BACKEND = "orjson" if orjson else "json"
+
+
+def _orjson_default(obj):
+    if isinstance(obj, EdgeTable):
+        return obj.to_list()
+    return json_default(obj)
+
+
+def dumps(obj: Any, pretty: bool = False) -> str:
+    """Encode obj as JSON text (indent=2 when pretty, no whitespace otherwise)."""
+    if orjson:
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        return orjson.dumps(obj, option=option, default=_orjson_default).decode()
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=json_default)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=json_default)
+
+
+def loads(text: str | bytes) -> Any:
+    if orjson:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def load(path: Path) -> Any:
+    """Read and decode a JSON file."""
+    return loads(path.read_bytes())
+
+
+def iter_chunks(obj: Any, pretty: bool = False, depth: int = 0) -> Iterator[str]:
+    """
+    Yield the JSON encoding of obj in pieces.
+
+    Dicts, lists and EdgeTables above STREAM_DEPTH are opened and their
+    members encoded one at a time, so a 100k-edge list never exists as one
+    string. Joining the chunks gives exactly dumps(obj, pretty).
+    """
+    if isinstance(obj, EdgeTable):
+        members = ((None, row) for row in obj.iter_dicts())
+        empty = not len(obj)
+        brackets = "[]"
+    elif isinstance(obj, dict) and depth < STREAM_DEPTH:
+        members = iter(obj.items())
+        empty = not obj
+        brackets = "{}"
+    elif isinstance(obj, (list, tuple)) and depth < STREAM_DEPTH:
+        members = ((None, item) for item in obj)
+        empty = not obj
+        brackets = "[]"
+    else:
+        text = dumps(obj, pretty)
+        if pretty and depth:
+            text = text.replace("\n", "\n" + "  " * depth)
+        yield text
+        return
+
+    if empty:
+        yield brackets
+        return
+
+    if pretty:
+        separator = ",\n" + "  " * (depth + 1)
+        opening = brackets[0] + "\n" + "  " * (depth + 1)
+        closing = "\n" + "  " * depth + brackets[1]
+        key_separator = ": "
+    else:
+        separator, opening, closing, key_separator = ",", brackets[0], brackets[1], ":"
+
+    yield opening
+    first = True
+    for key, value in members:
+        if not first:
+            yield separator
+        first = False
+        if key is not None:
+            yield dumps(key) + key_separator
+        yield from iter_chunks(value, pretty, depth + 1)
+    yield closing
+
+
+def dump(obj: Any, fp: IO[str], pretty: bool = False) -> None:
+    """Stream obj to a text file object, followed by a newline."""
+    for chunk in iter_chunks(obj, pretty):
+        fp.write(chunk)
+    fp.write("\n")
+
+
+def write_text(path: Path, text: str) -> str:
+    """Atomically replace path with text. Returns the sha256 hex of its bytes."""
+    data = text.encode()
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return hashlib.sha256(data).hexdigest()
+
+
+def write(path: Path, obj: Any, pretty: bool = False) -> str:
+    """
+    Atomically stream obj to path as JSON plus a trailing newline.
+
+    Returns the sha256 hex of the bytes written, computed on the way out so
+    the document never has to be held in memory.
+    """
+    digest = hashlib.sha256()
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        for chunk in iter_chunks(obj, pretty):
+            f.write(chunk)
+            digest.update(chunk.encode())
+        f.write("\n")
+        digest.update(b"\n")
+    os.replace(tmp, path)
+    return digest.hexdigest()
@@ -0,0 +1,144 @@
+"""
+SVAO Task Model
+Compact record types shared by the parser, the inference engine and the
+PRD compiler.
+"""
+
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class Task:
+    id: str
+    description: str
+    files: tuple[str, ...]
+    depends_on: tuple[str, ...] = ()
+    agent_type: str | None = None
+    complexity: str = "medium"
+    completed: bool = False
+
+    def to_dict(self) -> dict:
+        """Serialize to the parser's JSON shape."""
+        return {
+            "id": self.id,
+            "description": self.description,
+            "files": list(self.files),
+            "depends_on": list(self.depends_on),
+            "agent_type": self.agent_type,
+            "complexity": self.complexity,
+            "completed": self.completed
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Task":
+        """Rebuild a Task from to_dict() output."""
+        return cls(
+            id=data["id"],
+            description=data["description"],
+            files=tuple(data["files"]),
+            depends_on=tuple(data["depends_on"]),
+            agent_type=data["agent_type"],
+            complexity=data["complexity"],
+            completed=data["completed"]
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class InferredDependency:
+    from_task: str
+    to_task: str
+    confidence: int
+    reason: str
+
+    def to_dict(self) -> dict:
+        return {
+            "from": self.from_task,
+            "to": self.to_task,
+            "confidence": self.confidence,
+            "reason": self.reason
+        }
+
+
+class EdgeTable:
+    """
+    Columnar list of inferred dependencies.
+
+    Each edge is a row across parallel arrays: from/to as indices into an
+    interned task ID table, a confidence byte, and a reason code indexing
+    a table of distinct reason strings. Thousands of edges sharing a few
+    reasons then cost a handful of bytes each instead of an object apiece.
+
+    Examples:
+        edges = EdgeTable(deps)
+        len(edges), edges[0] -> InferredDependency(...)
+        json.dumps(edges, default=json_default) -> [{"from": ..., ...}, ...]
+    """
+    __slots__ = ('ids', 'reasons', 'from_index', 'to_index', 'confidence', 'reason_code',
+                 '_id_index', '_reason_index')
+
+    def __init__(self, edges: Iterable[InferredDependency] = ()):
+        self.ids: list[str] = []
+        self.reasons: list[str] = []
+        self.from_index = array('I')
+        self.to_index = array('I')
+        self.confidence = array('B')
+        self.reason_code = array('I')
+        self._id_index: dict[str, int] = {}
+        self._reason_index: dict[str, int] = {}
+        self.extend(edges)
+
+    @staticmethod
+    def _intern(table: list[str], index: dict[str, int], value: str) -> int:
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(table)
+            table.append(value)
+        return code
+
+    def append(self, dep: InferredDependency) -> None:
+        self.from_index.append(self._intern(self.ids, self._id_index, dep.from_task))
+        self.to_index.append(self._intern(self.ids, self._id_index, dep.to_task))
+        self.confidence.append(dep.confidence)
+        self.reason_code.append(self._intern(self.reasons, self._reason_index, dep.reason))
+
+    def extend(self, edges: Iterable[InferredDependency]) -> None:
+        for dep in edges:
+            self.append(dep)
+
+    def __len__(self) -> int:
+        return len(self.from_index)
+
+    def __getitem__(self, row: int) -> InferredDependency:
+        return InferredDependency(
+            from_task=self.ids[self.from_index[row]],
+            to_task=self.ids[self.to_index[row]],
+            confidence=self.confidence[row],
+            reason=self.reasons[self.reason_code[row]]
+        )
+
+    def __iter__(self) -> Iterator[InferredDependency]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def pairs(self) -> Iterator[tuple[str, str]]:
+        """Yield (from, to) task IDs without materializing records."""
+        ids = self.ids
+        for f, t in zip(self.from_index, self.to_index):
+            yield ids[f], ids[t]
+
+    def iter_dicts(self) -> Iterator[dict]:
+        """Yield rows in prd.json's dependency shape."""
+        for dep in self:
+            yield dep.to_dict()
+
+    def to_list(self) -> list[dict]:
+        return list(self.iter_dicts())
+
+
+def json_default(obj):
+    """`default=` hook so json.dumps can write EdgeTables as edge lists."""
+    if isinstance(obj, EdgeTable):
+        return obj.to_list()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -4,132 +4,358 @@ OpenSpec Task Parser
 Parses tasks.md into structured format with strict validation.
 """
 
+import argparse
+import hashlib
+import io
+import os
 import re
 import sys
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 from pathlib import Path
 
+import jsonio
+from model import Task
 
-@dataclass
-class Task:
-    id: str
-    description: str
-    files: list[str]
-    depends_on: list[str] = field(default_factory=list)
-    agent_type: str | None = None
-    complexity: str = "medium"
-    completed: bool = False
 
-
-@dataclass
+@dataclass(slots=True)
 class Section:
     number: int
     name: str
     tasks: list[Task] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ParseResult:
     sections: list[Section]
     errors: list[str]
     warnings: list[str]
+    reused_sections: int = 0
+
+
+# Bump whenever tokenizer output changes, so stale section caches are ignored
+PARSER_VERSION = "2"
+
+
+# Section headers: ## N. Name
+SECTION_PATTERN = re.compile(r'## (\d+)\. (.+)')
+
+# Task line prefix: - [ ] N.M.P[a] <rest>
+# Supports:
+#   - Two-level: 1.1, 1.2
+#   - Three-level: 1.1.1, 1.2.3
+#   - With letters: 1.1.2a, 1.1.2b
+#   - Captures checkbox state (space = incomplete, x = complete)
+TASK_PREFIX_PATTERN = re.compile(r'- \[([ x])\] (\d+\.\d+(?:\.\d+)?[a-z]?) ')
+
+# Trailing annotations, in the only order they may appear (each at most once):
+# (files: ...) (depends: ...) (agent: ...) (complexity: ...)
+ANNOTATION_KEYS = (
+    ('files', ('files:', 'file:')),
+    ('depends', ('depends:', 'depend:')),
+    ('agent', ('agent:',)),
+    ('complexity', ('complexity:',)),
+)
+
+
+def _annotation_at(text: str, open_pos: int, end: int) -> tuple[int, str] | None:
+    """Return (key index, raw value) if text[open_pos:end] is one annotation."""
+    for index, (_, prefixes) in enumerate(ANNOTATION_KEYS):
+        for prefix in prefixes:
+            if text.startswith(prefix, open_pos + 1):
+                raw = text[open_pos + 1 + len(prefix):end - 1]
+                return (index, raw.lstrip() or raw) if raw else None
+    return None
+
+
+def _peel_annotations(text: str, end: int, max_key: int) -> tuple[int, list[tuple[int, str]]]:
+    """
+    Find the leftmost run of annotations ending exactly at `end`.
+
+    Only keys with index below `max_key` are allowed, which enforces the
+    annotation order. Returns the start of the run and its (key, value)
+    pairs, right-most first.
+    """
+    best: tuple[int, list[tuple[int, str]]] = (end, [])
+    if end < 2 or text[end - 1] != ')':
+        return best
+
+    # Values cannot contain ')', so the opening paren follows the previous ')'
+    open_pos = text.find('(', max(text.rfind(')', 0, end - 1) + 1, 1), end)
+    while open_pos != -1:
+        found = _annotation_at(text, open_pos, end)
+        if found and found[0] < max_key:
+            start = open_pos
+            # The description keeps at least its first character
+            while start > 1 and text[start - 1].isspace():
+                start -= 1
+            left_start, left = _peel_annotations(text, start, found[0])
+            if left_start < best[0]:
+                best = (left_start, [found, *left])
+        open_pos = text.find('(', open_pos + 1, end)
+
+    return best
+
+
+def split_annotations(text: str) -> tuple[str, dict[str, str]]:
+    """
+    Split a task body into its description and trailing annotations.
+
+    Scans right-to-left from the closing parens instead of backtracking
+    through nested optional regex groups, so each annotation costs a few
+    find() calls regardless of line length. The description is everything
+    before the leftmost valid run of annotations.
+
+    Examples:
+        "Login (files: a.ts) (depends: 1.1)" -> ("Login", {"files": "a.ts", "depends": "1.1"})
+        "Login (agent: x) (files: a.ts)" -> ("Login (agent: x)", {"files": "a.ts"})
+    """
+    start, found = _peel_annotations(text, len(text), len(ANNOTATION_KEYS))
+    return text[:start], {ANNOTATION_KEYS[index][0]: value for index, value in found}
+
+
+def iter_tasks_md(
+    lines: Iterable[str],
+    errors: list[str],
+    warnings: list[str],
+) -> Iterator[Section | Task]:
+    """
+    Tokenize tasks.md in a single pass over its lines.
+
+    Yields each Section as soon as its header is read (with an empty task
+    list), followed by the Tasks that belong to it. Nothing is buffered, so
+    memory stays flat regardless of file size. Errors and warnings are
+    appended to the given lists as they are found.
+    """
+    section: Section | None = None
+    section_task_count = 0
+
+    for line in lines:
+        if line.endswith('\n'):
+            line = line[:-1]
+
+        if line.startswith('## '):
+            header = SECTION_PATTERN.fullmatch(line)
+            if header:
+                if section is not None and not section_task_count:
+                    warnings.append(f"Section {section.number} '{section.name}' has no tasks")
+                section = Section(number=int(header.group(1)), name=header.group(2).strip())
+                section_task_count = 0
+                yield section
+            continue
+
+        if section is None or not line.startswith('- ['):
+            continue
+
+        prefix = TASK_PREFIX_PATTERN.match(line)
+        if not prefix or prefix.end() == len(line):
+            continue
+
+        task_id = sys.intern(prefix.group(2))
+        description, annotations = split_annotations(line[prefix.end():])
+
+        # Validate task ID matches section (first number should match section)
+        if int(task_id.split('.', 1)[0]) != section.number:
+            errors.append(f"Task {task_id} in section {section.number} should start with '{section.number}.'")
+
+        # Parse files (optional - warn if missing)
+        files_str = annotations.get('files')
+        if files_str:
+            files = tuple(f.strip() for f in files_str.split(','))
+        else:
+            warnings.append(f"Task {task_id} missing (files: ...) annotation - agent routing may be less accurate")
+            files = ()
+
+        # Parse dependencies
+        depends_str = annotations.get('depends')
+        depends_on = tuple(sys.intern(d.strip()) for d in depends_str.split(',')) if depends_str else ()
+
+        # Parse complexity
+        complexity = annotations.get('complexity')
+        if complexity:
+            complexity = complexity.strip().lower()
+            if complexity not in ('low', 'medium', 'high'):
+                warnings.append(f"Task {task_id} has invalid complexity '{complexity}', using 'medium'")
+                complexity = 'medium'
+        else:
+            complexity = 'medium'
+
+        agent = annotations.get('agent')
+        section_task_count += 1
+        yield Task(
+            id=task_id,
+            description=description.strip(),
+            files=files,
+            depends_on=depends_on,
+            agent_type=agent.strip() if agent else None,
+            complexity=complexity,
+            completed=prefix.group(1) == 'x'
+        )
+
+    if section is None:
+        errors.append("No sections found. Expected format: '## 1. Section Name'")
+    elif not section_task_count:
+        warnings.append(f"Section {section.number} '{section.name}' has no tasks")
 
 
-def parse_tasks_md(content: str) -> ParseResult:
-    """Parse tasks.md content into structured sections and tasks."""
+def parse_tasks_md(content: str | Iterable[str]) -> ParseResult:
+    """
+    Parse tasks.md content into structured sections and tasks.
+
+    Accepts the whole document as a string, or any iterable of lines such as
+    an open file object.
+    """
     sections: list[Section] = []
     errors: list[str] = []
     warnings: list[str] = []
 
-    # Pattern for section headers: ## N. Name
-    section_pattern = re.compile(r'^## (\d+)\. (.+)$', re.MULTILINE)
-
-    # Pattern for tasks: - [ ] N.M.P[a] Description (files: ...) (depends: ...) etc
-    # Supports:
-    #   - Two-level: 1.1, 1.2
-    #   - Three-level: 1.1.1, 1.2.3
-    #   - With letters: 1.1.2a, 1.1.2b
-    #   - Captures checkbox state (space = incomplete, x = complete)
-    task_pattern = re.compile(
-        r'^- \[([ x])\] (\d+\.\d+(?:\.\d+)?[a-z]?) (.+?)(?:\s*\(files?:\s*([^)]+)\))?'
-        r'(?:\s*\(depends?:\s*([^)]+)\))?'
-        r'(?:\s*\(agent:\s*([^)]+)\))?'
-        r'(?:\s*\(complexity:\s*([^)]+)\))?$',
-        re.MULTILINE
-    )
+    lines = io.StringIO(content) if isinstance(content, str) else content
+    for record in iter_tasks_md(lines, errors, warnings):
+        if isinstance(record, Section):
+            sections.append(record)
+        else:
+            sections[-1].tasks.append(record)
 
-    # Split by sections
-    section_matches = list(section_pattern.finditer(content))
+    return ParseResult(sections, errors, warnings)
 
-    if not section_matches:
-        errors.append("No sections found. Expected format: '## 1. Section Name'")
-        return ParseResult([], errors, warnings)
-
-    for i, match in enumerate(section_matches):
-        section_num = int(match.group(1))
-        section_name = match.group(2).strip()
-
-        # Get content until next section or end
-        start = match.end()
-        end = section_matches[i + 1].start() if i + 1 < len(section_matches) else len(content)
-        section_content = content[start:end]
-
-        section = Section(number=section_num, name=section_name)
-
-        # Parse tasks in this section
-        for task_match in task_pattern.finditer(section_content):
-            checkbox_state = task_match.group(1)
-            task_id = task_match.group(2)
-            description = task_match.group(3).strip()
-            files_str = task_match.group(4)
-            depends_str = task_match.group(5)
-            agent = task_match.group(6)
-            complexity = task_match.group(7)
-            is_completed = checkbox_state == 'x'
-
-            # Validate task ID matches section (first number should match section)
-            task_section = int(task_id.split('.')[0])
-            if task_section != section_num:
-                errors.append(f"Task {task_id} in section {section_num} should start with '{section_num}.'")
-
-            # Parse files (optional - warn if missing)
-            if files_str:
-                files = [f.strip() for f in files_str.split(',')]
-            else:
-                warnings.append(f"Task {task_id} missing (files: ...) annotation - agent routing may be less accurate")
-                files = []
-
-            # Parse dependencies
-            depends_on = []
-            if depends_str:
-                depends_on = [d.strip() for d in depends_str.split(',')]
-
-            # Parse complexity
-            if complexity:
-                complexity = complexity.strip().lower()
-                if complexity not in ('low', 'medium', 'high'):
-                    warnings.append(f"Task {task_id} has invalid complexity '{complexity}', using 'medium'")
-                    complexity = 'medium'
-            else:
-                complexity = 'medium'
 
-            task = Task(
-                id=task_id,
-                description=description,
-                files=files,
-                depends_on=depends_on,
-                agent_type=agent.strip() if agent else None,
-                complexity=complexity,
-                completed=is_completed
-            )
-            section.tasks.append(task)
+def section_to_dict(section: Section) -> dict:
+    """Serialize a Section (and its tasks) to the parser's JSON shape."""
+    return {
+        "number": section.number,
+        "name": section.name,
+        "tasks": [t.to_dict() for t in section.tasks]
+    }
 
-        if not section.tasks:
-            warnings.append(f"Section {section_num} '{section_name}' has no tasks")
 
-        sections.append(section)
+def section_from_dict(data: dict) -> Section:
+    """Rebuild a Section from section_to_dict() output."""
+    return Section(
+        number=data["number"],
+        name=data["name"],
+        tasks=[Task.from_dict(task) for task in data["tasks"]]
+    )
 
-    return ParseResult(sections, errors, warnings)
+
+def iter_section_chunks(lines: Iterable[str]) -> Iterator[list[str]]:
+    """
+    Group lines into per-section chunks, each starting at its '## N.' header.
+
+    Lines before the first section header are dropped, matching the tokenizer.
+    Only one section's lines are held at a time.
+    """
+    chunk: list[str] | None = None
+    for line in lines:
+        if line.startswith('## ') and SECTION_PATTERN.fullmatch(line.rstrip('\n')):
+            if chunk is not None:
+                yield chunk
+            chunk = []
+        if chunk is not None:
+            chunk.append(line)
+    if chunk is not None:
+        yield chunk
+
+
+def load_section_cache(cache_file: Path) -> dict:
+    """Load a section cache, returning an empty one if missing or stale."""
+    try:
+        cache = jsonio.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != PARSER_VERSION:
+        return {}
+    return cache
+
+
+def save_section_cache(cache_file: Path, cache: dict) -> None:
+    """Atomically write a section cache."""
+    tmp_file = cache_file.with_name(f"{cache_file.name}.tmp.{os.getpid()}")
+    tmp_file.write_text(jsonio.dumps(cache), encoding="utf-8")
+    os.replace(tmp_file, cache_file)
+
+
+def parse_tasks_file(
+    tasks_file: Path,
+    cache_file: Path | None = None,
+    source_hash: str | None = None,
+) -> ParseResult:
+    """
+    Parse a tasks.md file, reusing unchanged sections from a cache.
+
+    The cache maps section number -> content hash -> parsed Section, along
+    with that section's errors and warnings. When `source_hash` matches the
+    hash the cache was built from, the file is not read at all; otherwise
+    only sections whose bytes changed are re-tokenized.
+    """
+    if cache_file is None:
+        with tasks_file.open() as f:
+            return parse_tasks_md(f)
+
+    cache = load_section_cache(cache_file)
+    cached_sections: dict[str, dict] = cache.get("sections", {})
+
+    if source_hash and cache.get("source_hash") == source_hash and cache.get("order") is not None:
+        entries = [cached_sections[key] for key in cache["order"]]
+        result = ParseResult(
+            sections=[section_from_dict(entry["section"]) for entry in entries],
+            errors=[e for entry in entries for e in entry["errors"]],
+            warnings=[w for entry in entries for w in entry["warnings"]],
+            reused_sections=len(entries)
+        )
+        if not entries:
+            result.errors.append("No sections found. Expected format: '## 1. Section Name'")
+        return result
+
+    result = ParseResult([], [], [])
+    new_sections: dict[str, dict] = {}
+    order: list[str] = []
+
+    with tasks_file.open() as f:
+        for chunk in iter_section_chunks(f):
+            digest = "sha256:" + hashlib.sha256(''.join(chunk).encode()).hexdigest()
+            key = chunk[0][3:].split('.', 1)[0]
+            entry = cached_sections.get(key)
+
+            if entry is not None and entry.get("hash") == digest:
+                section = section_from_dict(entry["section"])
+                result.reused_sections += 1
+            else:
+                errors: list[str] = []
+                warnings: list[str] = []
+                section = None
+                for record in iter_tasks_md(chunk, errors, warnings):
+                    if isinstance(record, Section):
+                        section = record
+                    else:
+                        section.tasks.append(record)
+                entry = {
+                    "hash": digest,
+                    "section": section_to_dict(section),
+                    "errors": errors,
+                    "warnings": warnings
+                }
+
+            result.sections.append(section)
+            result.errors.extend(entry["errors"])
+            result.warnings.extend(entry["warnings"])
+            new_sections[key] = entry
+            order.append(key)
+
+    if not result.sections:
+        result.errors.append("No sections found. Expected format: '## 1. Section Name'")
+
+    # Duplicate section numbers can't share a cache slot; skip the whole-file shortcut
+    if len(new_sections) != len(order):
+        order = None
+
+    save_section_cache(cache_file, {
+        "version": PARSER_VERSION,
+        "source_hash": source_hash if order is not None else None,
+        "order": order,
+        "sections": new_sections
+    })
+
+    return result
 
 
 def validate_dependencies(sections: list[Section]) -> list[str]:
@@ -147,17 +373,29 @@ def validate_dependencies(sections: list[Section]) -> list[str]:
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: parser.py <tasks.md>", file=sys.stderr)
-        sys.exit(1)
-
-    tasks_file = Path(sys.argv[1])
+    arg_parser = argparse.ArgumentParser(description="Parse OpenSpec tasks.md into JSON")
+    arg_parser.add_argument("tasks_file", type=Path, help="Path to tasks.md")
+    arg_parser.add_argument("--cache", type=Path, help="Per-section parse cache to read and update")
+    arg_parser.add_argument("--source-hash", help="sha256 of tasks.md; skips reading the file on a full cache hit")
+    arg_parser.add_argument("--pretty", action="store_true",
+                            help="Indent the JSON output (default for human output on a terminal)")
+    output_mode = arg_parser.add_mutually_exclusive_group()
+    output_mode.add_argument("--json", action="store_true",
+                             help="Machine mode: stdout carries only the JSON document, diagnostics go to stderr")
+    output_mode.add_argument("--ndjson", action="store_true",
+                             help="Machine mode: one JSON line per section on stdout, diagnostics go to stderr")
+    args = arg_parser.parse_args()
+
+    # In machine modes stdout carries nothing but the payload
+    machine = args.json or args.ndjson
+    diagnostics = sys.stderr if machine else sys.stdout
+
+    tasks_file = args.tasks_file
     if not tasks_file.exists():
         print(f"Error: File not found: {tasks_file}", file=sys.stderr)
         sys.exit(1)
 
-    content = tasks_file.read_text()
-    result = parse_tasks_md(content)
+    result = parse_tasks_file(tasks_file, args.cache, args.source_hash)
 
     # Validate dependencies
     dep_errors = validate_dependencies(result.sections)
@@ -171,36 +409,22 @@ def main():
         sys.exit(2)
 
     if result.warnings:
-        print("Warnings:")
+        print("Warnings:", file=diagnostics)
         for warning in result.warnings:
-            print(f"   - {warning}")
+            print(f"   - {warning}", file=diagnostics)
 
-    print(f"Parsed {len(result.sections)} sections, {sum(len(s.tasks) for s in result.sections)} tasks")
+    reused = f" ({result.reused_sections} sections unchanged)" if result.reused_sections else ""
+    print(f"Parsed {len(result.sections)} sections, {sum(len(s.tasks) for s in result.sections)} tasks{reused}",
+          file=diagnostics)
+
+    if args.ndjson:
+        for section in result.sections:
+            sys.stdout.write(jsonio.dumps(section_to_dict(section)) + "\n")
+        return
 
     # Output JSON
-    import json
-    output = {
-        "sections": [
-            {
-                "number": s.number,
-                "name": s.name,
-                "tasks": [
-                    {
-                        "id": t.id,
-                        "description": t.description,
-                        "files": t.files,
-                        "depends_on": t.depends_on,
-                        "agent_type": t.agent_type,
-                        "complexity": t.complexity,
-                        "completed": t.completed
-                    }
-                    for t in s.tasks
-                ]
-            }
-            for s in result.sections
-        ]
-    }
-    print(json.dumps(output, indent=2))
+    output = {"sections": [section_to_dict(s) for s in result.sections]}
+    jsonio.dump(output, sys.stdout, pretty=args.pretty or (not machine and sys.stdout.isatty()))
 
 
 if __name__ == "__main__":
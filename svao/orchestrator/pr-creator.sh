@@ -49,6 +49,38 @@ get_default_branch() {
   echo "main"
 }
 
+# Record a section's PR URL in state (through the state database or
+# daemon when dispatch.sh runs with SVAO_STATE_BACKEND=sqlite or daemon,
+# which also journal it)
+record_section_pr() {
+  local state_file="$1"
+  local section_num="$2"
+  local pr_url="$3"
+
+  case "${SVAO_STATE_BACKEND:-json}" in
+    sqlite)
+      python3 "$SCRIPT_DIR/state_store.py" "$state_file" set section_prs "$section_num" "$pr_url"
+      return
+      ;;
+    daemon)
+      python3 "$SCRIPT_DIR/daemon_client.py" "$SVAO_DAEMON_SOCKET" set section_prs "$section_num" "$pr_url"
+      return
+      ;;
+  esac
+
+  local tmp_file="${state_file}.tmp.$$"
+  jq --arg section "$section_num" --arg url "$pr_url" '
+    .section_prs = (.section_prs // {}) |
+    .section_prs[$section] = $url
+  ' "$state_file" > "$tmp_file"
+  mv "$tmp_file" "$state_file"
+
+  # Inside a dispatch session, journal it as the store would (see journal.py)
+  if [[ -n "${SVAO_JOURNAL:-}" ]]; then
+    python3 "$SCRIPT_DIR/journal.py" append "$SVAO_JOURNAL" set section_prs "$section_num" "$pr_url" || true
+  fi
+}
+
 # ─────────────────────────────────────────────────────────────
 # Branch/PR Initialization (First Task of Section)
 # ─────────────────────────────────────────────────────────────
@@ -193,12 +225,7 @@ EOF
     log_success "Draft PR created: $pr_url"
 
     # Record PR in state
-    local tmp_file="${state_file}.tmp.$$"
-    jq --arg section "$section_num" --arg url "$pr_url" '
-      .section_prs = (.section_prs // {}) |
-      .section_prs[$section] = $url
-    ' "$state_file" > "$tmp_file"
-    mv "$tmp_file" "$state_file"
+    record_section_pr "$state_file" "$section_num" "$pr_url"
 
     echo "$pr_url"
   fi
@@ -431,12 +458,7 @@ EOF
   log_success "PR created: $pr_url"
 
   # Record PR in state
-  local tmp_file="${state_file}.tmp.$$"
-  jq --arg section "$section_num" --arg url "$pr_url" '
-    .section_prs = (.section_prs // {}) |
-    .section_prs[$section] = $url
-  ' "$state_file" > "$tmp_file"
-  mv "$tmp_file" "$state_file"
+  record_section_pr "$state_file" "$section_num" "$pr_url"
 
   echo "$pr_url"
 }
@@ -149,6 +149,7 @@ render_live_status() {
   local state_file="$1"
   local status_dir="$2"
   local last_event="${3:-}"
+  local parallel="${4:-3}"
 
   # Get summary stats
   local completed in_progress blocked ready total percent
@@ -180,6 +181,15 @@ render_live_status() {
 
   printf "│ Progress: ${GREEN}[%s]${NC} %d%% (%d/%d)      │\n" "$bar" "${percent%.*}" "$completed" "$total"
   printf "│ Status:   ${CYAN}▶${NC}%-2d active  ${GREEN}✓${NC}%-3d done  ${YELLOW}⏳${NC}%-2d ready  ${BLUE}⛔${NC}%-2d blocked │\n" "$in_progress" "$completed" "$ready" "$blocked"
+
+  # ETA from the duration history (durations.py); omitted until there is enough of it
+  if [[ "$completed" -lt "$total" ]]; then
+    local prd_file eta_p50 eta_p90
+    prd_file="$(dirname "$state_file")/$(jq -r '.prd_file // "prd.json"' "$state_file")"
+    if read -r eta_p50 eta_p90 < <(python3 "$SCRIPT_DIR/durations.py" eta "$prd_file" "$state_file" --parallel "$parallel" 2>/dev/null); then
+      printf "│ %-62s │\n" "ETA:      ~$(format_duration "$eta_p50") (P90 $(format_duration "$eta_p90"))"
+    fi
+  fi
   echo -e "├────────────────────────────────────────────────────────────────┤"
 
   # Active tasks
@@ -281,7 +291,7 @@ main() {
       ;;
     live)
       # Full-screen live status display
-      render_live_status "$2" "$3" "${4:-}"
+      render_live_status "$2" "$3" "${4:-}" "${5:-3}"
       ;;
     *)
       echo "Usage: progress-writer.sh <action> [args]"
@@ -290,7 +300,7 @@ main() {
       echo "  bar <completed> <total> [width]     - Render progress bar"
       echo "  log <file> <type> <msg> [detail]    - Write to progress log"
       echo "  status <state-file>                 - Render status line"
-      echo "  live <state-file> <status-dir> [event] - Full live dashboard"
+      echo "  live <state-file> <status-dir> [event] [parallel] - Full live dashboard"
       exit 1
       ;;
   esac
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+SVAO Scheduler
+Ready-queue maintenance for the dispatch loop. Every task keeps a count of
+its unfinished dependencies; completing a task decrements only its
+dependents, and a task whose count reaches zero is pushed onto a heap
+ordered by the queue policy. An event then costs O(out-degree · log n)
+instead of a rescan of every task's depends_on.
+
+Queue policies:
+    id              task-ID order (5.1.1 < 5.1.2 < 5.2.1), the default
+    critical-path   longest remaining dependency chain first, each task
+                    weighted by its predicted P50 duration (durations.py),
+                    or while history is short by its complexity and its
+                    agent type's mean duration in agents/metrics.json;
+                    ties in task-ID order
+
+The scheduler also keeps a file lock table: while a task is in progress it
+holds the files it shares with other tasks (prd.json's file_index), and
+dispatchable() passes over ready tasks that would edit a held file.
+"""
+
+import argparse
+import heapq
+import math
+import sys
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import jsonio
+
+if TYPE_CHECKING:
+    from durations import DurationModel
+
+QUEUE_POLICIES = ("id", "critical-path")
+
+# Relative effort of a task by complexity (prd.json default: medium)
+COMPLEXITY_WEIGHTS = {"low": 1.0, "medium": 2.0, "high": 4.0}
+
+# Global metrics with per-agent task durations (see dispatch.sh persist_global_metrics)
+METRICS_FILE = Path(__file__).resolve().parent.parent / "agents" / "metrics.json"
+
+
+@dataclass(slots=True)
+class Scheduler:
+    """
+    Dependency counters and ready heap for one PRD.
+
+    Only PRD tasks that are pending enter the ready or blocked queues. A
+    dependency on a task that never completes (including an unknown ID)
+    keeps its dependents blocked, as in the jq rebuild it replaces.
+
+    Examples:
+        scheduler = Scheduler.from_prd(prd, {"1.1": "completed"})
+        scheduler.set_status("1.2", "completed") -> ["1.3"]  (newly ready)
+        scheduler.queues()["ready"] -> ["1.3", "2.1", ...]
+        scheduler.set_status("1.3", "in_progress")
+        scheduler.file_locks -> {"src/api.ts": "1.3"}
+        scheduler.dispatchable(limit=2) -> ["2.1", "2.3"]  (2.2 also edits src/api.ts)
+    """
+    dependents: dict[str, list[str]]
+    remaining: dict[str, int]
+    status: dict[str, str]         # Every task in state order, then PRD tasks not in state
+    ready_rank: dict[str, int]     # Position in queue-policy order (ready queue order)
+    prd_rank: dict[str, int]       # Position in the PRD (blocked queue order)
+    file_tasks: dict[str, list[str]] = field(default_factory=dict)          # prd.json file_index
+    task_files: dict[str, tuple[str, ...]] = field(default_factory=dict)    # Its inverse
+    file_locks: dict[str, str] = field(default_factory=dict)                # File -> in-progress holder
+    _heap: list[tuple[int, str]] = field(default_factory=list)
+    _ready: set[str] = field(default_factory=set)
+
+    @classmethod
+    def from_prd(cls, prd: dict, statuses: dict[str, str],
+                 extra_edges: Iterable[tuple[str, str]] = (), policy: str = "id",
+                 agent_durations: dict[str, float] | None = None,
+                 duration_model: "DurationModel | None" = None) -> "Scheduler":
+        """
+        Build from prd.json, current task statuses (in state order) and
+        extra (from, to) edges such as applied discovered dependencies.
+        duration_model (default: agents/durations.json) weights the
+        critical-path policy; without enough history it falls back to
+        agent_durations (default: agents/metrics.json).
+        """
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Unknown queue policy: {policy}")
+        # Imported here: the state store's per-event CLI calls never build
+        # from scratch and shouldn't pay for loading the inference engine
+        from inference import build_file_index, task_id_sort_key
+
+        tasks = [task for section in prd["sections"] for task in section["tasks"]]
+        deps: dict[str, set[str]] = {task["id"]: set(task.get("depends_on") or ()) for task in tasks}
+        for from_task, to_task in extra_edges:
+            if from_task in deps:
+                deps[from_task].add(to_task)
+
+        status = dict(statuses)
+        for task in tasks:
+            status.setdefault(task["id"], "pending")
+
+        dependents: dict[str, list[str]] = {}
+        remaining: dict[str, int] = {}
+        for task in tasks:
+            task_id = task["id"]
+            remaining[task_id] = sum(1 for dep in deps[task_id] if status.get(dep) != "completed")
+            for dep in deps[task_id]:
+                dependents.setdefault(dep, []).append(task_id)
+
+        if policy == "critical-path":
+            if duration_model is None:
+                from durations import DurationModel
+                duration_model = DurationModel.load()
+            weights = duration_model.weights(tasks, status)
+            if weights is None:
+                if agent_durations is None:
+                    agent_durations = load_agent_durations()
+                weights = task_weights(tasks, status, agent_durations)
+            lengths = path_lengths(weights, dependents)
+            order = sorted(deps, key=lambda task_id: (-lengths[task_id], task_id_sort_key(task_id)))
+        else:
+            order = sorted(deps, key=task_id_sort_key)
+
+        scheduler = cls(
+            dependents=dependents,
+            remaining=remaining,
+            status=status,
+            ready_rank={task_id: rank for rank, task_id in enumerate(order)},
+            prd_rank={task["id"]: rank for rank, task in enumerate(tasks)},
+            # PRDs compiled before file_index get theirs built here
+            file_tasks=prd["file_index"] if "file_index" in prd else build_file_index(tasks)
+        )
+        task_files: dict[str, list[str]] = {}
+        for path, task_ids in scheduler.file_tasks.items():
+            for task_id in task_ids:
+                task_files.setdefault(task_id, []).append(path)
+        scheduler.task_files = {task_id: tuple(paths) for task_id, paths in task_files.items()}
+
+        for task_id in deps:
+            scheduler._refresh(task_id)
+        for task_id, task_status in status.items():
+            if task_status == "in_progress":
+                scheduler._lock(task_id)
+        return scheduler
+
+    def is_ready(self, task_id: str) -> bool:
+        return (task_id in self.prd_rank and self.status[task_id] == "pending"
+                and self.remaining[task_id] == 0)
+
+    def _refresh(self, task_id: str) -> bool:
+        """Sync task_id's heap membership; returns True if it just became ready."""
+        if self.is_ready(task_id):
+            if task_id not in self._ready:
+                self._ready.add(task_id)
+                heapq.heappush(self._heap, (self.ready_rank[task_id], task_id))
+                return True
+        else:
+            self._ready.discard(task_id)  # Its heap entry is skipped lazily
+        return False
+
+    def set_status(self, task_id: str, status: str) -> list[str]:
+        """Apply a status change. Returns the tasks it made ready."""
+        previous = self.status.get(task_id, "pending")
+        self.status[task_id] = status
+        if previous == status:
+            return []
+        if previous == "in_progress":
+            self._unlock(task_id)
+        elif status == "in_progress":
+            self._lock(task_id)
+
+        newly_ready = []
+        if status == "completed" or previous == "completed":
+            delta = -1 if status == "completed" else 1
+            for dependent in self.dependents.get(task_id, ()):
+                self.remaining[dependent] += delta
+                if self._refresh(dependent):
+                    newly_ready.append(dependent)
+        if task_id in self.prd_rank and self._refresh(task_id):
+            newly_ready.append(task_id)
+        return newly_ready
+
+    def add_dependency(self, from_task: str, to_task: str) -> bool:
+        """Make from_task wait for to_task. Returns False if the edge already existed."""
+        if from_task not in self.prd_rank or from_task in self.dependents.get(to_task, ()):
+            return False
+        self.dependents.setdefault(to_task, []).append(from_task)
+        if self.status.get(to_task) != "completed":
+            self.remaining[from_task] += 1
+            self._refresh(from_task)
+        return True
+
+    def _lock(self, task_id: str) -> None:
+        for path in self.task_files.get(task_id, ()):
+            self.file_locks.setdefault(path, task_id)
+
+    def _unlock(self, task_id: str) -> None:
+        """Release task_id's files, handing each to another in-progress task that edits it."""
+        for path in self.task_files.get(task_id, ()):
+            if self.file_locks.get(path) != task_id:
+                continue
+            holder = next((other for other in self.file_tasks[path]
+                           if other != task_id and self.status.get(other) == "in_progress"), None)
+            if holder is None:
+                del self.file_locks[path]
+            else:
+                self.file_locks[path] = holder
+
+    def dispatchable(self, limit: int | None = None, ready: list[str] | None = None) -> list[str]:
+        """
+        Ready tasks that can start now without editing a locked file, in
+        ready order (or the order of `ready`, e.g. a checkpoint-reordered
+        queue). A task passed over waits for the lock holder to finish.
+        """
+        return pick_unlocked(self.ready() if ready is None else ready, self.task_files, self.file_locks, limit)
+
+    def ready(self, limit: int | None = None) -> list[str]:
+        """Ready task IDs in queue-policy order (the first `limit` of them if given)."""
+        # Entries of tasks that left the ready set are dropped lazily; rebuild
+        # the heap once they outnumber the live ones
+        if len(self._heap) > 2 * len(self._ready):
+            self._heap = [(self.ready_rank[task_id], task_id) for task_id in self._ready]
+            heapq.heapify(self._heap)
+
+        # Every ready task has at least one entry, so the first limit + extra
+        # entries hold the first `limit` distinct ready tasks
+        extra = len(self._heap) - len(self._ready)
+        entries = sorted(self._heap) if limit is None else heapq.nsmallest(limit + extra, self._heap)
+        result = []
+        seen: set[str] = set()
+        for _, task_id in entries:
+            if task_id in self._ready and task_id not in seen:
+                seen.add(task_id)
+                result.append(task_id)
+        return result if limit is None else result[:limit]
+
+    def queues(self) -> dict[str, list[str]]:
+        """The four prd-state.json queues, in the orders dispatch.sh has always used."""
+        blocked = [task_id for task_id in self.prd_rank
+                   if self.status[task_id] == "pending" and self.remaining[task_id] > 0]
+        return {
+            "ready": self.ready(),
+            "in_progress": [task_id for task_id, status in self.status.items() if status == "in_progress"],
+            "blocked": blocked,
+            "completed": [task_id for task_id, status in self.status.items() if status == "completed"]
+        }
+
+
+def pick_unlocked(ready: Iterable[str], task_files: dict[str, tuple[str, ...]],
+                  file_locks: dict[str, str], limit: int | None = None) -> list[str]:
+    """
+    The first `limit` ready tasks whose files are neither locked nor edited
+    by a task picked before them (which will hold them once dispatched).
+    """
+    picked: list[str] = []
+    claimed: set[str] = set()
+    for task_id in ready:
+        if limit is not None and len(picked) >= limit:
+            break
+        paths = task_files.get(task_id, ())
+        if any(path in file_locks or path in claimed for path in paths):
+            continue
+        claimed.update(paths)
+        picked.append(task_id)
+    return picked
+
+
+def load_agent_durations(metrics_file: Path = METRICS_FILE) -> dict[str, float]:
+    """Mean task duration in seconds per agent type ({} if there is no history)."""
+    try:
+        agents = jsonio.load(metrics_file).get("agents") or {}
+    except (OSError, ValueError):
+        return {}
+    durations = {}
+    for agent, stats in agents.items():
+        samples = stats.get("duration_samples") or 0
+        if samples > 0:
+            durations[agent] = stats.get("total_duration_seconds", 0) / samples
+    return durations
+
+
+def task_weights(tasks: list[dict], status: dict[str, str],
+                 agent_durations: dict[str, float]) -> dict[str, float]:
+    """
+    Expected remaining effort per task: its complexity weight scaled by its
+    agent type's mean duration relative to the mean over agent types. An
+    agent type without history counts as average; completed tasks weigh 0.
+
+    Examples:
+        task_weights([{"id": "1.1", "complexity": "high", "agent_type": "api-builder"}],
+                     {"1.1": "pending"}, {"api-builder": 600, "frontend-coder": 200}) -> {"1.1": 6.0}
+    """
+    durations = [seconds for seconds in agent_durations.values() if seconds > 0]
+    baseline = sum(durations) / len(durations) if durations else 0
+    weights = {}
+    for task in tasks:
+        if status.get(task["id"]) == "completed":
+            weights[task["id"]] = 0.0
+            continue
+        weight = COMPLEXITY_WEIGHTS.get(task.get("complexity") or "medium", COMPLEXITY_WEIGHTS["medium"])
+        seconds = agent_durations.get(task.get("agent_type") or "frontend-coder", 0)
+        if baseline and seconds > 0:
+            weight *= seconds / baseline
+        weights[task["id"]] = weight
+    return weights
+
+
+def path_lengths(weights: dict[str, float], dependents: dict[str, list[str]]) -> dict[str, float]:
+    """
+    Weight of the heaviest chain from each task through the tasks that
+    (transitively) depend on it, the task itself included.
+
+    Tasks are settled sinks first (Kahn's algorithm over the reversed
+    edges). Tasks on a dependency cycle never settle and only count their
+    settled dependents.
+    """
+    waiting = {task_id: len(set(dependents.get(task_id, ())) & weights.keys()) for task_id in weights}
+    depends_on: dict[str, list[str]] = {}
+    for task_id, task_dependents in dependents.items():
+        for dependent in set(task_dependents):
+            depends_on.setdefault(dependent, []).append(task_id)
+
+    lengths: dict[str, float] = {}
+    settled = [task_id for task_id, count in waiting.items() if count == 0]
+    while settled:
+        task_id = settled.pop()
+        lengths[task_id] = weights[task_id] + max(
+            (lengths[dependent] for dependent in dependents.get(task_id, ()) if dependent in lengths), default=0)
+        for dependency in depends_on.get(task_id, ()):
+            if dependency in waiting:
+                waiting[dependency] -= 1
+                if waiting[dependency] == 0:
+                    settled.append(dependency)
+    for task_id in weights.keys() - lengths.keys():
+        lengths[task_id] = weights[task_id] + max(
+            (lengths[dependent] for dependent in dependents.get(task_id, ()) if dependent in lengths), default=0)
+    return lengths
+
+
+def progress_percent(completed: int, total: int) -> int | float:
+    """Completed share of total, floored to one decimal (100, not 100.0)."""
+    if total <= 0:
+        return 0
+    percent = math.floor(completed / total * 100 * 10) / 10
+    return int(percent) if percent.is_integer() else percent
+
+
+def applied_dependencies(state: dict) -> list[tuple[str, str]]:
+    """(from, to) edges of discovered dependencies that were applied."""
+    return [(dep["from"], dep["to"]) for dep in state.get("discovered_dependencies") or ()
+            if dep.get("status") == "applied"]
+
+
+def rebuild_state(prd: dict, state: dict, policy: str = "id") -> None:
+    """Recompute state's queues and summary from task statuses in place."""
+    statuses = {task_id: task.get("status", "pending") for task_id, task in state.get("tasks", {}).items()}
+    scheduler = Scheduler.from_prd(prd, statuses, applied_dependencies(state), policy)
+    queues = scheduler.queues()
+
+    state.setdefault("queue", {}).update(queues)
+    summary = state.setdefault("summary", {})
+    summary["completed"] = len(queues["completed"])
+    summary["in_progress"] = len(queues["in_progress"])
+    summary["ready"] = len(queues["ready"])
+    summary["blocked"] = len(queues["blocked"])
+    summary["progress_percent"] = progress_percent(len(queues["completed"]), summary.get("total_tasks") or 0)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Rebuild prd-state.json queues from task statuses")
+    arg_parser.add_argument("prd_file", type=Path, help="Path to prd.json")
+    arg_parser.add_argument("state_file", type=Path, help="Path to prd-state.json (updated in place)")
+    arg_parser.add_argument("--policy", choices=QUEUE_POLICIES, default="id",
+                            help="Ready queue order (default: id)")
+    arg_parser.add_argument("--dispatchable", type=int, metavar="N",
+                            help="Print up to N ready tasks free of file conflicts instead of rebuilding")
+    args = arg_parser.parse_args()
+
+    for path in (args.prd_file, args.state_file):
+        if not path.exists():
+            print(f"❌ File not found: {path}", file=sys.stderr)
+            sys.exit(1)
+
+    prd = jsonio.load(args.prd_file)
+    state = jsonio.load(args.state_file)
+    if args.dispatchable is not None:
+        # The state's ready queue, which a checkpoint may have reordered
+        statuses = {task_id: task.get("status", "pending") for task_id, task in state.get("tasks", {}).items()}
+        scheduler = Scheduler.from_prd(prd, statuses, applied_dependencies(state), args.policy)
+        ready = [task_id for task_id in state.get("queue", {}).get("ready") or () if scheduler.is_ready(task_id)]
+        for task_id in scheduler.dispatchable(args.dispatchable, ready):
+            print(task_id)
+        return
+
+    rebuild_state(prd, state, args.policy)
+    jsonio.write(args.state_file, state, pretty=True)
+
+
+if __name__ == "__main__":
+    main()
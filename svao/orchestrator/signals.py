@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+SVAO Signal Scanner
+Scans agent output for registry.json's stop signals while the agent is
+still running. Signals that matter before the agent exits are sent on
+the dispatch loop's event channel (see events.py) as soon as their line
+is written:
+
+    DISCOVERED_DEPENDENCY:<task>:<from>:<to>:<reason>
+    AGENT_SIGNAL:<task>:<signal>              (e.g. BLOCKED:DEPENDENCY)
+
+TASK_COMPLETE and the final status are still decided when the agent exits.
+
+Used as a library by supervisor.py and, for the shell supervisor, as a
+pipeline stage in place of tee:
+
+    claude --print ... | signals.py scan 1.2 --output 1.2.output --event-socket events.sock
+"""
+
+import argparse
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from events import emit_event
+
+# orchestrator.default_stop_signals lists the signals agents may emit
+REGISTRY_FILE = Path(__file__).resolve().parent.parent / "agents" / "registry.json"
+
+DEFAULT_STOP_SIGNALS = (
+    "TASK_COMPLETE",
+    "SECTION_COMPLETE",
+    "ALL_TASKS_COMPLETE",
+    "BLOCKED:TESTS",
+    "BLOCKED:CLARIFICATION",
+    "BLOCKED:DEPENDENCY",
+    "DISCOVERED_DEPENDENCY",
+)
+
+# Reported through the agent's exit event rather than early
+EXIT_SIGNALS = frozenset({"TASK_COMPLETE", "SECTION_COMPLETE", "ALL_TASKS_COMPLETE"})
+
+READ_CHUNK = 64 * 1024
+
+# Longest partial line kept while waiting for its newline
+MAX_LINE = 1024 * 1024
+
+BLOCKED_PATTERN = re.compile(r"BLOCKED:[A-Z]*")
+
+# DISCOVERED_DEPENDENCY: [from] needs [to] because [reason]
+DISCOVERED_PATTERN = re.compile(
+    r"DISCOVERED_DEPENDENCY:\s*\[?([\w.-]+)\]?\s+needs\s+\[?([\w.-]+)\]?(?:\s+because\s+(.*))?")
+
+
+def load_stop_signals(registry_file: Path = REGISTRY_FILE) -> tuple[str, ...]:
+    """orchestrator.default_stop_signals from registry.json (built-in list if unreadable)."""
+    try:
+        registry = json.loads(registry_file.read_text())
+        signals = registry["orchestrator"]["default_stop_signals"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return DEFAULT_STOP_SIGNALS
+    return tuple(signals)
+
+
+def early_event(task_id: str, signal: str, line: str) -> str | None:
+    """The event to emit for a signal seen while the agent runs, if any."""
+    if signal in EXIT_SIGNALS:
+        return None
+    if signal == "DISCOVERED_DEPENDENCY":
+        match = DISCOVERED_PATTERN.search(line)
+        if not match:
+            return None
+        from_task, to_task, reason = match.groups()
+        return f"DISCOVERED_DEPENDENCY:{task_id}:{from_task}:{to_task}:{(reason or '').strip()}"
+    return f"AGENT_SIGNAL:{task_id}:{signal}"
+
+
+@dataclass(slots=True)
+class SignalScanner:
+    """
+    Incremental stop-signal detection over an output stream.
+
+    feed() returns the early events for the lines it completed, each
+    distinct event once; `completed` and `blocked` decide the exit status
+    the way dispatch.sh has always grepped for them.
+
+    Examples:
+        scanner = SignalScanner("1.2", load_stop_signals())
+        scanner.feed(b"DISCOVERED_DEPENDENCY: 1.3 needs 1.1 because shared schema\\n")
+            -> ["DISCOVERED_DEPENDENCY:1.2:1.3:1.1:shared schema"]
+        scanner.blocked -> None
+    """
+    task_id: str
+    signals: tuple[str, ...] = DEFAULT_STOP_SIGNALS
+    completed: bool = False
+    blocked: str | None = None
+    _pattern: re.Pattern = field(init=False)
+    _seen: set[str] = field(default_factory=set)
+    _partial: bytes = b""
+
+    def __post_init__(self) -> None:
+        # Longest first, so BLOCKED:DEPENDENCY wins over a bare BLOCKED prefix
+        ordered = sorted(self.signals, key=len, reverse=True)
+        self._pattern = re.compile("|".join(re.escape(signal) for signal in ordered))
+
+    def feed(self, chunk: bytes) -> list[str]:
+        lines = (self._partial + chunk).split(b"\n")
+        self._partial = lines.pop()[-MAX_LINE:]
+        events = []
+        for line in lines:
+            events.extend(self._scan(line.decode("utf-8", errors="replace")))
+        return events
+
+    def finish(self) -> list[str]:
+        """Scan a final line without a newline."""
+        line, self._partial = self._partial, b""
+        return self._scan(line.decode("utf-8", errors="replace")) if line else []
+
+    def _scan(self, line: str) -> list[str]:
+        if "TASK_COMPLETE" in line:
+            self.completed = True
+        if self.blocked is None and (match := BLOCKED_PATTERN.search(line)):
+            self.blocked = match.group()
+
+        events = []
+        for signal in dict.fromkeys(self._pattern.findall(line)):
+            event = early_event(self.task_id, signal, line)
+            if event is not None and event not in self._seen:
+                self._seen.add(event)
+                events.append(event)
+        return events
+
+
+def scan_stream(source, output: Path, scanner: SignalScanner, event_socket: Path | None) -> None:
+    """Copy source to output as it arrives, emitting early events on the way."""
+    with open(output, "wb") as out:
+        while chunk := source.read1(READ_CHUNK):
+            out.write(chunk)
+            out.flush()
+            for event in scanner.feed(chunk):
+                emit_event(event_socket, event)
+        for event in scanner.finish():
+            emit_event(event_socket, event)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Scan agent output for stop signals as it is written")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+    command = commands.add_parser("scan", help="Copy stdin to an output file, emitting early signal events")
+    command.add_argument("task_id")
+    command.add_argument("--output", type=Path, required=True, help="Agent output file")
+    command.add_argument("--event-socket", type=Path, help="Dispatch loop event socket")
+    command.add_argument("--registry", type=Path, default=REGISTRY_FILE, help="registry.json with default_stop_signals")
+    args = arg_parser.parse_args()
+
+    scanner = SignalScanner(args.task_id, load_stop_signals(args.registry))
+    try:
+        scan_stream(sys.stdin.buffer, args.output, scanner, args.event_socket)
+    except OSError as e:
+        print(f"❌ Could not write {args.output}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
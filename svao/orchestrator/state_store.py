@@ -0,0 +1,876 @@
+#!/usr/bin/env python3
+"""
+SVAO State Store
+SQLite (WAL) backing for prd-state.json. dispatch.sh applies each event as
+one small transaction instead of rewriting the whole document through jq,
+and export reassembles the schema-compliant prd-state.json snapshot that
+the progress writer, PR creator and checkpoints read.
+
+Tasks, queues and discovered dependencies live in their own tables; every
+other top-level key (session, checkpoints, metrics, summary, section_prs,
+...) is one JSON row, so an event touches only the rows it changes.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import concurrency
+import jsonio
+from scheduler import QUEUE_POLICIES, Scheduler, applied_dependencies, pick_unlocked, progress_percent
+
+# Seconds a writer waits for another process's transaction before failing
+BUSY_TIMEOUT = 30.0
+
+# Keys stored in dedicated tables rather than as a JSON row
+TABLE_KEYS = ("tasks", "queue", "discovered_dependencies")
+
+# Bumped when the tables change; an older database is dropped and re-imported
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS document (
+    key TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_by_status ON tasks (status);
+CREATE TABLE IF NOT EXISTS queue (
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    task_id TEXT NOT NULL,
+    PRIMARY KEY (name, position)
+);
+CREATE INDEX IF NOT EXISTS queue_by_task ON queue (task_id, name);
+CREATE TABLE IF NOT EXISTS discovered_dependencies (
+    seq INTEGER PRIMARY KEY,
+    data TEXT NOT NULL
+);
+-- Scheduler counters for PRD tasks: unfinished dependencies and the
+-- queue positions the task takes when ready / blocked
+CREATE TABLE IF NOT EXISTS schedule (
+    id TEXT PRIMARY KEY,
+    remaining INTEGER NOT NULL,
+    ready_rank INTEGER NOT NULL,
+    prd_rank INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dependents (
+    task_id TEXT NOT NULL,
+    dependent TEXT NOT NULL,
+    PRIMARY KEY (task_id, dependent)
+);
+-- prd.json file_index: files more than one task edits. An in-progress
+-- task holds its files; dispatchable() skips ready tasks that need them
+CREATE TABLE IF NOT EXISTS task_files (
+    task_id TEXT NOT NULL,
+    file TEXT NOT NULL,
+    PRIMARY KEY (task_id, file)
+);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+TABLES = ("document", "tasks", "queue", "discovered_dependencies", "schedule", "dependents", "task_files",
+          "store_meta")
+
+
+def utc_now() -> str:
+    """Timestamp in the format dispatch.sh writes (date -u +%Y-%m-%dT%H:%M:%SZ)."""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def json_number(value: float) -> int | float:
+    """Write whole numbers as integers, as jq does (100, not 100.0)."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def default_db_path(state_file: Path) -> Path:
+    """prd-state.json -> prd-state.db alongside it."""
+    return state_file.with_suffix(".db")
+
+
+class StateStore:
+    """
+    prd-state.json held in an SQLite database.
+
+    Mutations run in BEGIN IMMEDIATE transactions, so concurrent writers
+    (the dispatch loop, background phase reviewers, the PR creator) are
+    serialized by SQLite instead of racing on tmp+mv rewrites.
+
+    Examples:
+        store = StateStore(Path("prd-state.db"))
+        store.import_state(jsonio.load(Path("prd-state.json")))
+        store.set_task_status("1.1", "completed")
+        store.rebuild_queue(jsonio.load(Path("prd.json")))
+        jsonio.write(Path("prd-state.json"), store.export_state(), pretty=True)
+    """
+
+    def __init__(self, db_path: Path, clock: Callable[[], str] = utc_now):
+        self.db_path = db_path
+        self.clock = clock  # Timestamps for updated_at etc. (journal replay pins them)
+        self.conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.conn.executescript(
+                "".join(f"DROP TABLE IF EXISTS {table};" for table in TABLES)
+                + SCHEMA + f"PRAGMA user_version = {SCHEMA_VERSION};"
+            )
+
+    def close(self) -> None:
+        self.conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    # ── Import / export ──────────────────────────────────────
+
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM document LIMIT 1").fetchone() is None
+
+    def import_state(self, state: dict) -> None:
+        """Replace the database contents with a prd-state.json document."""
+        with self.transaction() as conn:
+            for table in TABLES:
+                conn.execute(f"DELETE FROM {table}")
+
+            for position, (key, value) in enumerate(state.items()):
+                if key == "queue":
+                    value = list(value)
+                elif key in TABLE_KEYS:
+                    value = None
+                conn.execute("INSERT INTO document VALUES (?, ?, ?)",
+                             (key, position, None if value is None else jsonio.dumps(value)))
+
+            conn.executemany(
+                "INSERT INTO tasks VALUES (?, ?, ?, ?)",
+                ((task_id, position, task.get("status", "pending"),
+                  jsonio.dumps({k: v for k, v in task.items() if k != "status"}))
+                 for position, (task_id, task) in enumerate(state.get("tasks", {}).items()))
+            )
+            for name, ids in state.get("queue", {}).items():
+                self._write_queue(name, ids)
+            conn.executemany(
+                "INSERT INTO discovered_dependencies (data) VALUES (?)",
+                ((jsonio.dumps(dep),) for dep in state.get("discovered_dependencies", []))
+            )
+
+    def export_state(self) -> dict:
+        """Reassemble the prd-state.json document, keys in their original order."""
+        state = {}
+        for key, value in self.conn.execute("SELECT key, value FROM document ORDER BY position"):
+            if key == "tasks":
+                state[key] = self.tasks()
+            elif key == "queue":
+                state[key] = {name: self.queue(name) for name in jsonio.loads(value)}
+            elif key == "discovered_dependencies":
+                state[key] = self.discovered_dependencies()
+            else:
+                state[key] = jsonio.loads(value)
+        return state
+
+    # ── Reads ────────────────────────────────────────────────
+
+    def _row(self, key: str) -> Any:
+        row = self.conn.execute("SELECT value FROM document WHERE key = ?", (key,)).fetchone()
+        return jsonio.loads(row[0]) if row and row[0] is not None else None
+
+    def get(self, key: str) -> Any:
+        """One top-level key of the document (None if absent)."""
+        if key == "tasks":
+            return self.tasks()
+        if key == "queue":
+            names = self._row("queue")
+            return None if names is None else {name: self.queue(name) for name in names}
+        if key == "discovered_dependencies":
+            return self.discovered_dependencies()
+        return self._row(key)
+
+    def tasks(self) -> dict[str, dict]:
+        return {
+            task_id: {"status": status, **jsonio.loads(data)}
+            for task_id, status, data in
+            self.conn.execute("SELECT id, status, data FROM tasks ORDER BY position")
+        }
+
+    def task(self, task_id: str) -> dict | None:
+        row = self.conn.execute("SELECT status, data FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return {"status": row[0], **jsonio.loads(row[1])} if row else None
+
+    def queue(self, name: str) -> list[str]:
+        return [row[0] for row in self.conn.execute(
+            "SELECT task_id FROM queue WHERE name = ? ORDER BY position", (name,))]
+
+    def loop_status(self) -> tuple[int | float, int, int]:
+        """(progress percent, ready count, blocked count): what each loop iteration checks."""
+        counts = dict(self.conn.execute(
+            "SELECT name, COUNT(*) FROM queue WHERE name IN ('ready', 'blocked') GROUP BY name"))
+        return ((self.get("summary") or {}).get("progress_percent", 0),
+                counts.get("ready", 0), counts.get("blocked", 0))
+
+    def file_locks(self) -> dict[str, str]:
+        """File -> the in-progress task holding it (the first in state order)."""
+        locks: dict[str, str] = {}
+        for path, task_id in self.conn.execute(
+                "SELECT f.file, t.id FROM tasks t JOIN task_files f ON f.task_id = t.id "
+                "WHERE t.status = 'in_progress' ORDER BY t.position"):
+            locks.setdefault(path, task_id)
+        return locks
+
+    def dispatchable(self, limit: int) -> list[str]:
+        """The first `limit` ready tasks that no file lock holds back (see scheduler.pick_unlocked)."""
+        task_files: dict[str, list[str]] = {}
+        for task_id, path in self.conn.execute(
+                "SELECT f.task_id, f.file FROM queue q JOIN task_files f ON f.task_id = q.task_id "
+                "WHERE q.name = 'ready'"):
+            task_files.setdefault(task_id, []).append(path)
+        return pick_unlocked(self.queue("ready"), task_files, self.file_locks(), limit)
+
+    def discovered_dependencies(self) -> list[dict]:
+        return [jsonio.loads(row[0]) for row in self.conn.execute(
+            "SELECT data FROM discovered_dependencies ORDER BY seq")]
+
+    # ── Low-level writes (call inside a transaction) ─────────
+
+    def _write_queue(self, name: str, ids: list[str], positions: list[int] | None = None) -> None:
+        self.conn.execute("DELETE FROM queue WHERE name = ?", (name,))
+        self.conn.executemany("INSERT INTO queue VALUES (?, ?, ?)",
+                              ((name, position, task_id) for position, task_id in
+                               zip(positions if positions is not None else range(len(ids)), ids)))
+        names = self._row("queue")
+        if names is not None and name not in names:
+            self.conn.execute("UPDATE document SET value = ? WHERE key = 'queue'",
+                              (jsonio.dumps(names + [name]),))
+
+    def _put(self, key: str, value: Any) -> None:
+        """Set a top-level JSON key, appending it after existing keys if new (as jq does)."""
+        updated = self.conn.execute("UPDATE document SET value = ? WHERE key = ?",
+                                    (jsonio.dumps(value), key))
+        if updated.rowcount == 0:
+            self.conn.execute(
+                "INSERT INTO document VALUES (?, (SELECT COALESCE(MAX(position), -1) + 1 FROM document), ?)",
+                (key, jsonio.dumps(value))
+            )
+
+    def _update(self, key: str, change: Callable[[dict], None]) -> None:
+        """Read-modify-write one top-level object."""
+        value = self.get(key) or {}
+        change(value)
+        self._put(key, value)
+
+    def _update_task(self, task_id: str, status: str | None = None, **fields: Any) -> None:
+        """Upsert a task's state; like jq, a missing task entry is created."""
+        row = self.conn.execute("SELECT status, data FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        if row is None:
+            previous = "pending"
+            self.conn.execute(
+                "INSERT INTO tasks VALUES (?, (SELECT COALESCE(MAX(position), -1) + 1 FROM tasks), ?, ?)",
+                (task_id, status or "pending", jsonio.dumps(fields))
+            )
+        else:
+            previous = row[0]
+            data = jsonio.loads(row[1])
+            data.update(fields)
+            self.conn.execute("UPDATE tasks SET status = ?, data = ? WHERE id = ?",
+                              (status or previous, jsonio.dumps(data), task_id))
+        if status and status != previous and self.schedule_current():
+            self._reschedule(task_id, previous, status)
+
+    # ── Scheduling ───────────────────────────────────────────
+
+    def schedule_current(self, policy: str | None = None) -> bool:
+        """
+        True once rebuild_queue has run (for policy, if given) and no update
+        has invalidated its counters.
+        """
+        row = self.conn.execute("SELECT value FROM store_meta WHERE key = 'schedule'").fetchone()
+        return row is not None and policy in (None, row[0])
+
+    def _invalidate_schedule(self) -> None:
+        """The queues were edited directly; the next rebuild_queue starts from scratch."""
+        self.conn.execute("DELETE FROM store_meta WHERE key = 'schedule'")
+
+    def _status(self, task_id: str) -> str:
+        row = self.conn.execute("SELECT status FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return row[0] if row else "pending"
+
+    def _move(self, counts: Counter, task_id: str, source: tuple[str, ...], target: str | None,
+              position: int = 0) -> None:
+        """Take task_id out of the source queues and (if given) into target."""
+        for name in source:
+            counts[name] -= self.conn.execute("DELETE FROM queue WHERE task_id = ? AND name = ?",
+                                              (task_id, name)).rowcount
+        if target is not None:
+            self.conn.execute("INSERT INTO queue VALUES (?, ?, ?)", (target, position, task_id))
+            counts[target] += 1
+
+    def _reschedule(self, task_id: str, previous: str, status: str) -> None:
+        """
+        Apply one status change to the queues and summary.
+
+        Only the task itself and, when it enters or leaves "completed", its
+        direct dependents are touched: each dependent's remaining count
+        moves by one and it crosses between blocked and ready at zero.
+        """
+        conn = self.conn
+        counts: Counter = Counter()
+        position = conn.execute("SELECT position FROM tasks WHERE id = ?", (task_id,)).fetchone()[0]
+
+        if previous in ("pending", "in_progress", "completed"):
+            self._move(counts, task_id, ("ready", "blocked") if previous == "pending" else (previous,), None)
+
+        if "completed" in (previous, status):
+            delta = -1 if status == "completed" else 1
+            dependents = conn.execute(
+                "SELECT s.id, s.remaining + ?, s.ready_rank, s.prd_rank FROM dependents d "
+                "JOIN schedule s ON s.id = d.dependent WHERE d.task_id = ?", (delta, task_id)
+            ).fetchall()
+            for dependent, remaining, ready_rank, prd_rank in dependents:
+                conn.execute("UPDATE schedule SET remaining = ? WHERE id = ?", (remaining, dependent))
+                if dependent == task_id or self._status(dependent) != "pending":
+                    continue  # The task itself is placed below
+                if delta < 0 and remaining == 0:
+                    self._move(counts, dependent, ("blocked",), "ready", ready_rank)
+                elif delta > 0 and remaining == 1:
+                    self._move(counts, dependent, ("ready",), "blocked", prd_rank)
+
+        # Read after the dependents loop: a self-dependency changes its own count
+        row = conn.execute("SELECT remaining, ready_rank, prd_rank FROM schedule WHERE id = ?",
+                           (task_id,)).fetchone()
+        if status == "pending" and row is not None:
+            remaining, ready_rank, prd_rank = row
+            if remaining == 0:
+                self._move(counts, task_id, (), "ready", ready_rank)
+            else:
+                self._move(counts, task_id, (), "blocked", prd_rank)
+        elif status in ("in_progress", "completed"):
+            self._move(counts, task_id, (), status, position)
+
+        self._adjust_summary(counts)
+
+    def _adjust_summary(self, counts: Counter) -> None:
+        if not any(counts.values()):
+            return
+
+        def change(summary: dict) -> None:
+            for name in ("completed", "in_progress", "ready", "blocked"):
+                summary[name] = summary.get(name, 0) + counts[name]
+            summary["progress_percent"] = progress_percent(summary["completed"], summary.get("total_tasks") or 0)
+
+        self._update("summary", change)
+
+    def _touch(self, timestamp: str | None = None) -> None:
+        self._update("session", lambda session: session.update(updated_at=timestamp or self.clock()))
+
+    # ── Operations (one per dispatch.sh state update) ────────
+
+    def set_path(self, path: list[str], value: Any) -> None:
+        """Set document[path[0]][path[1]]..., creating objects on the way (jq's .a[$b] = v)."""
+        with self.transaction():
+            if path[0] == "tasks" and len(path) == 3 and path[2] == "status":
+                self._update_task(path[1], status=value)
+            elif path[0] == "tasks" and len(path) >= 3:
+                field = (self.task(path[1]) or {}).get(path[2])
+                self._update_task(path[1], **{path[2]: _assign(field, path[3:], value)})
+            elif path[0] in TABLE_KEYS:
+                raise ValueError(f"{path[0]} can only be set through its dedicated commands")
+            else:
+                self._put(path[0], _assign(self.get(path[0]), path[1:], value))
+
+    def set_task_status(self, task_id: str, status: str) -> None:
+        with self.transaction():
+            self._update_task(task_id, status=status)
+            self._touch()
+
+    def start_task(self, task_id: str, agent: str, started_at: str | None = None) -> None:
+        """Mark a task in_progress on dispatch, recording agent and start time."""
+        started_at = started_at or self.clock()
+        with self.transaction():
+            self._update_task(task_id, status="in_progress", assigned_to=agent, started_at=started_at)
+            self._touch(started_at)
+
+    def update_session(self, touch: bool = False, **fields: Any) -> None:
+        with self.transaction():
+            self._update("session", lambda session: session.update(fields))
+            if touch:
+                self._touch()
+
+    def rebuild_queue(self, prd: dict, policy: str = "id") -> None:
+        """
+        Recompute queues, summary and scheduler counters from scratch.
+
+        Afterwards status changes maintain all three incrementally, so
+        dispatch.sh only pays for this again after a direct queue edit.
+        """
+        with self.transaction() as conn:
+            rows = conn.execute("SELECT id, status, position FROM tasks ORDER BY position").fetchall()
+            task_position = {task_id: position for task_id, _, position in rows}
+            scheduler = Scheduler.from_prd(prd, {task_id: status for task_id, status, _ in rows},
+                                           applied_dependencies({"discovered_dependencies":
+                                                                 self.discovered_dependencies()}),
+                                           policy)
+
+            conn.execute("DELETE FROM schedule")
+            conn.executemany("INSERT INTO schedule VALUES (?, ?, ?, ?)", (
+                (task_id, scheduler.remaining[task_id], scheduler.ready_rank[task_id], prd_rank)
+                for task_id, prd_rank in scheduler.prd_rank.items()
+            ))
+            conn.execute("DELETE FROM dependents")
+            conn.executemany("INSERT INTO dependents VALUES (?, ?)", (
+                (task_id, dependent)
+                for task_id, dependents in scheduler.dependents.items() for dependent in dependents
+            ))
+            conn.execute("DELETE FROM task_files")
+            conn.executemany("INSERT INTO task_files VALUES (?, ?)", (
+                (task_id, path) for task_id, paths in scheduler.task_files.items() for path in paths
+            ))
+
+            queues = scheduler.queues()
+            self._write_queue("ready", queues["ready"], [scheduler.ready_rank[t] for t in queues["ready"]])
+            self._write_queue("in_progress", queues["in_progress"], [task_position[t] for t in queues["in_progress"]])
+            self._write_queue("blocked", queues["blocked"], [scheduler.prd_rank[t] for t in queues["blocked"]])
+            self._write_queue("completed", queues["completed"], [task_position[t] for t in queues["completed"]])
+
+            def summarize(summary: dict) -> None:
+                summary["completed"] = len(queues["completed"])
+                summary["in_progress"] = len(queues["in_progress"])
+                summary["ready"] = len(queues["ready"])
+                summary["blocked"] = len(queues["blocked"])
+                summary["progress_percent"] = progress_percent(len(queues["completed"]),
+                                                               summary.get("total_tasks") or 0)
+
+            self._update("summary", summarize)
+            conn.execute("INSERT OR REPLACE INTO store_meta VALUES ('schedule', ?)", (policy,))
+
+    def reorder(self, task_ids: list[str]) -> None:
+        with self.transaction():
+            self._write_queue("ready", task_ids)
+            self._invalidate_schedule()
+
+    def record_metric(self, event: str, agent: str = "", duration: float = 0) -> None:
+        """Apply a task_completed / task_failed / retry event to the session metrics."""
+        def change(metrics: dict) -> None:
+            if event == "task_completed":
+                completed = metrics.get("tasks_completed", 0) + 1
+                metrics["tasks_completed"] = completed
+                agent_stats = metrics.setdefault("agents_used", {}).setdefault(agent, {})
+                agent_stats["completed"] = agent_stats.get("completed", 0) + 1
+                agent_stats["duration_seconds"] = json_number(agent_stats.get("duration_seconds", 0) + duration)
+                average = metrics.get("avg_task_duration_seconds", 0)
+                metrics["avg_task_duration_seconds"] = json_number(
+                    (average * (completed - 1) + duration) / completed if completed > 1 else duration
+                )
+            elif event == "task_failed":
+                metrics["tasks_failed"] = metrics.get("tasks_failed", 0) + 1
+                agent_stats = metrics.setdefault("agents_used", {}).setdefault(agent, {})
+                agent_stats["failed"] = agent_stats.get("failed", 0) + 1
+            elif event == "retry":
+                metrics["total_retries"] = metrics.get("total_retries", 0) + 1
+            else:
+                raise ValueError(f"Unknown metric event: {event}")
+
+        with self.transaction():
+            self._update("metrics", change)
+
+    def update_utilization(self, max_parallel: int) -> None:
+        """Fold the current in-progress count into the running parallel utilization."""
+        with self.transaction():
+            active = len(self.queue("in_progress"))
+            iteration = (self.get("session") or {}).get("iteration", 0)
+
+            def change(metrics: dict) -> None:
+                current = active / max_parallel
+                if iteration > 0:
+                    previous = metrics.get("parallel_utilization", 0)
+                    current = (previous * (iteration - 1) + current) / iteration
+                metrics["parallel_utilization"] = json_number(current)
+
+            self._update("metrics", change)
+
+    def adjust_concurrency(self, active: int, min_limit: int, max_limit: int) -> int:
+        """Run the adaptive concurrency controller (see concurrency.py); returns the limit."""
+        with self.transaction():
+            metrics = self.get("metrics") or {}
+            record, changed = concurrency.adjust(metrics.get("concurrency"), metrics, concurrency.sample_host(),
+                                                 active, min_limit, max_limit, datetime.now(timezone.utc))
+            if changed:
+                metrics["concurrency"] = record
+                self._put("metrics", metrics)
+        return record["limit"]
+
+    def record_checkpoint(self, checkpoint_type: str, iteration: int) -> None:
+        timestamp = self.clock()
+
+        def change(checkpoints: dict) -> None:
+            checkpoints["last_queue_planning"] = timestamp
+            checkpoints["last_iteration_at_checkpoint"] = iteration
+            checkpoints["history"] = (checkpoints.get("history") or []) + [
+                {"type": checkpoint_type, "timestamp": timestamp, "iteration": iteration}
+            ]
+
+        with self.transaction():
+            self._update("checkpoints", change)
+
+    def add_dependency(self, from_task: str, to_task: str, confidence: int,
+                       discovered_by: str = "checkpoint", status: str = "applied",
+                       reason: str | None = None, if_new: bool = False) -> bool:
+        """With if_new, skip (and return False) a from/to pair that is already recorded."""
+        dep = {"from": from_task, "to": to_task, "confidence": confidence}
+        if reason is not None:
+            dep["reason"] = reason
+        dep.update(discovered_at=self.clock(), discovered_by=discovered_by, status=status)
+        with self.transaction() as conn:
+            if if_new and conn.execute(
+                    "SELECT 1 FROM discovered_dependencies"
+                    " WHERE json_extract(data, '$.from') = ? AND json_extract(data, '$.to') = ?",
+                    (from_task, to_task)).fetchone():
+                return False
+            conn.execute("INSERT INTO discovered_dependencies (data) VALUES (?)", (jsonio.dumps(dep),))
+            if status == "applied" and self.schedule_current():
+                self._add_edge(from_task, to_task)
+        return True
+
+    def _add_edge(self, from_task: str, to_task: str) -> None:
+        """Make a scheduled task wait for another one as well."""
+        conn = self.conn
+        row = conn.execute("SELECT remaining, prd_rank FROM schedule WHERE id = ?", (from_task,)).fetchone()
+        if row is None or conn.execute("INSERT OR IGNORE INTO dependents VALUES (?, ?)",
+                                       (to_task, from_task)).rowcount == 0:
+            return
+        if self._status(to_task) == "completed":
+            return
+        remaining, prd_rank = row[0] + 1, row[1]
+        conn.execute("UPDATE schedule SET remaining = ? WHERE id = ?", (remaining, from_task))
+        if remaining == 1 and self._status(from_task) == "pending":
+            counts: Counter = Counter()
+            self._move(counts, from_task, ("ready",), "blocked", prd_rank)
+            self._adjust_summary(counts)
+
+    def mark_reviewed(self, section: int) -> None:
+        def change(checkpoints: dict) -> None:
+            checkpoints["reviewed_sections"] = sorted(set(checkpoints.get("reviewed_sections") or []) | {section})
+
+        with self.transaction():
+            self._update("checkpoints", change)
+
+    def unblock(self, task_id: str, strategy: str, details: str = "") -> None:
+        """Apply a blocker-resolution strategy (alternate-agent, skip-and-continue, escalate)."""
+        with self.transaction():
+            # With a current schedule the status change already moves the task
+            scheduled = self.schedule_current()
+            if strategy == "alternate-agent":
+                self._update_task(task_id, status="pending", assigned_to=details)
+                if not scheduled:
+                    self._write_queue("blocked", [t for t in self.queue("blocked") if t != task_id])
+                    self._write_queue("ready", self.queue("ready") + [task_id])
+            elif strategy == "skip-and-continue":
+                self._update_task(task_id, status="skipped")
+                if not scheduled:
+                    self._write_queue("blocked", [t for t in self.queue("blocked") if t != task_id])
+            elif strategy == "escalate":
+                self._update_task(task_id, escalation_reason=details)
+
+    def rework(self, task_ids: list[str], reason: str) -> None:
+        """Send completed tasks back to the ready queue with a rework reason."""
+        with self.transaction():
+            if self.schedule_current():
+                for task_id in task_ids:
+                    self._update_task(task_id, status="pending", rework_reason=reason)
+                return
+            completed = self.queue("completed")
+            ready = self.queue("ready")
+            for task_id in task_ids:
+                self._update_task(task_id, status="pending", rework_reason=reason)
+                completed = [t for t in completed if t != task_id]
+                ready.append(task_id)
+            self._write_queue("completed", completed)
+            self._write_queue("ready", ready)
+
+
+def _assign(target: Any, path: list[str], value: Any) -> Any:
+    """Return target with target[path...] = value, creating objects as needed."""
+    if not path:
+        return value
+    result = dict(target) if isinstance(target, dict) else {}
+    result[path[0]] = _assign(result.get(path[0]), path[1:], value)
+    return result
+
+
+def lookup(store: StateStore, path: list[str]) -> Any:
+    """Resolve a key path, reading only the rows it needs."""
+    key, rest = path[0], path[1:]
+    if key == "tasks" and rest:
+        value, rest = store.task(rest[0]), rest[1:]
+    elif key == "queue" and rest:
+        value, rest = store.queue(rest[0]), rest[1:]
+    else:
+        value = store.get(key)
+    for part in rest:
+        if isinstance(value, dict):
+            value = value.get(part)
+        elif isinstance(value, list) and part.lstrip("-").isdigit():
+            index = int(part)
+            value = value[index] if -len(value) <= index < len(value) else None
+        else:
+            value = None
+    return value
+
+
+def open_state(state_file: Path, db_path: Path, resume: bool) -> str:
+    """
+    Load prd-state.json into the database at session start.
+
+    On resume an existing database for the same PRD and session is kept (it
+    may be newer than the last exported snapshot) and re-exported instead.
+    Returns "imported" or "kept".
+    """
+    state = jsonio.load(state_file)
+    store = StateStore(db_path)
+    try:
+        if resume and not store.is_empty():
+            same_prd = store.get("prd_hash") == state.get("prd_hash")
+            same_session = (store.get("session") or {}).get("id") == state.get("session", {}).get("id")
+            if same_prd and same_session:
+                return "kept"
+        store.import_state(state)
+        return "imported"
+    finally:
+        store.close()
+
+
+def print_value(value: Any, default: str | None) -> None:
+    """Print like jq -r: strings raw, arrays one element per line, objects as JSON."""
+    if value is None:
+        print("null" if default is None else default)
+    elif isinstance(value, list):
+        for item in value:
+            print(item if isinstance(item, str) else jsonio.dumps(item))
+    elif isinstance(value, str):
+        print(value)
+    else:
+        print(jsonio.dumps(value))
+
+
+def build_parser(description: str = "SQLite-backed prd-state.json store"):
+    """The store's command-line interface; daemon.py serves the same commands."""
+    arg_parser = argparse.ArgumentParser(description=description)
+    arg_parser.add_argument("state_file", type=Path, help="Path to prd-state.json")
+    arg_parser.add_argument("--db", type=Path, help="Database path (default: prd-state.db next to the state file)")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("import", help="Load prd-state.json into the database")
+    command.add_argument("--resume", action="store_true",
+                         help="Keep an existing database for the same PRD and session")
+    command = commands.add_parser("export", help="Write the prd-state.json snapshot")
+    command.add_argument("--compact", action="store_true", help="Write without indentation")
+    command.add_argument("--stdout", action="store_true", help="Print instead of writing the state file")
+
+    command = commands.add_parser("get", help="Print a value, e.g. get tasks 1.2 status")
+    command.add_argument("path", nargs="+")
+    command.add_argument("--default", help="Printed when the value is missing or null")
+    commands.add_parser("loop-status", help="Print progress percent, ready count and blocked count")
+    command = commands.add_parser("set", help="Set a value, e.g. set section_prs 2 <url>")
+    command.add_argument("path", nargs="+")
+    command.add_argument("value")
+    command.add_argument("--json", action="store_true", help="Parse the value as JSON")
+
+    command = commands.add_parser("task-status", help="Set a task's status")
+    command.add_argument("task_id")
+    command.add_argument("status")
+    command = commands.add_parser("start-task", help="Mark a task in_progress for an agent")
+    command.add_argument("task_id")
+    command.add_argument("agent")
+    command.add_argument("--started-at", help="Start timestamp (default: now)")
+    command = commands.add_parser("session", help="Update session fields")
+    command.add_argument("--id")
+    command.add_argument("--started-at")
+    command.add_argument("--iteration", type=int)
+    command.add_argument("--status")
+    command.add_argument("--touch", action="store_true", help="Also set updated_at to now")
+    command = commands.add_parser("rebuild-queue", help="Recompute queues and summary if needed")
+    command.add_argument("prd_file", type=Path)
+    command.add_argument("--full", action="store_true", help="Rebuild even if the queues are current")
+    command.add_argument("--policy", choices=QUEUE_POLICIES, default="id", help="Ready queue order (default: id)")
+    command = commands.add_parser("dispatchable", help="Print up to LIMIT ready tasks free of file conflicts")
+    command.add_argument("limit", type=int)
+    command = commands.add_parser("reorder", help="Replace the ready queue")
+    command.add_argument("task_ids", nargs="*")
+    command = commands.add_parser("metric", help="Record a metrics event")
+    command.add_argument("event", choices=("task_completed", "task_failed", "retry"))
+    command.add_argument("agent", nargs="?", default="")
+    command.add_argument("duration", nargs="?", type=float, default=0)
+    command = commands.add_parser("utilization", help="Update running parallel utilization")
+    command.add_argument("max_parallel", type=int)
+    command = commands.add_parser("concurrency", help="Adjust and print the adaptive concurrency limit")
+    command.add_argument("active", type=int)
+    command.add_argument("--min", type=int, default=1, dest="min_limit")
+    command.add_argument("--max", type=int, required=True, dest="max_limit")
+    command = commands.add_parser("checkpoint", help="Record a checkpoint run")
+    command.add_argument("type")
+    command.add_argument("--iteration", type=int, required=True)
+    command = commands.add_parser("add-dependency", help="Record an applied discovered dependency")
+    command.add_argument("from_task")
+    command.add_argument("to_task")
+    command.add_argument("confidence", type=int)
+    command.add_argument("--by", default="checkpoint")
+    command.add_argument("--status", default="applied", choices=("pending_review", "applied", "rejected"))
+    command.add_argument("--reason")
+    command.add_argument("--if-new", action="store_true", help="Skip a from/to pair that is already recorded")
+    command = commands.add_parser("review-section", help="Mark a section as reviewed")
+    command.add_argument("section", type=int)
+    command = commands.add_parser("unblock", help="Apply a blocker-resolution strategy")
+    command.add_argument("task_id")
+    command.add_argument("strategy", choices=("alternate-agent", "skip-and-continue", "escalate"))
+    command.add_argument("details", nargs="?", default="")
+    command = commands.add_parser("rework", help="Send tasks back for rework")
+    command.add_argument("reason")
+    command.add_argument("task_ids", nargs="+")
+    return arg_parser, commands
+
+
+# Commands that never change the state
+READ_COMMANDS = frozenset({"export", "get", "loop-status", "dispatchable"})
+
+
+def run_command(store: StateStore, args: argparse.Namespace, load_prd: Callable[[Path], dict] = jsonio.load) -> bool:
+    """
+    Execute one parsed command (other than import/export) against store.
+    Returns whether it may have changed the state (False for reads and for
+    a rebuild-queue that found the queues current).
+    """
+    if args.command == "get":
+        print_value(lookup(store, args.path), args.default)
+    elif args.command == "loop-status":
+        print(*store.loop_status())
+    elif args.command == "dispatchable":
+        for task_id in store.dispatchable(args.limit):
+            print(task_id)
+    elif args.command == "set":
+        store.set_path(args.path, json.loads(args.value) if args.json else args.value)
+    elif args.command == "task-status":
+        store.set_task_status(args.task_id, args.status)
+    elif args.command == "start-task":
+        store.start_task(args.task_id, args.agent, args.started_at)
+    elif args.command == "session":
+        fields = {"id": args.id, "started_at": args.started_at,
+                  "iteration": args.iteration, "status": args.status}
+        store.update_session(touch=args.touch, **{k: v for k, v in fields.items() if v is not None})
+    elif args.command == "rebuild-queue":
+        # Status changes keep a current schedule up to date without the PRD
+        if not args.full and store.schedule_current(args.policy):
+            return False
+        store.rebuild_queue(load_prd(args.prd_file), args.policy)
+    elif args.command == "reorder":
+        store.reorder([t for arg in args.task_ids for t in arg.split(",") if t])
+    elif args.command == "metric":
+        store.record_metric(args.event, args.agent, json_number(args.duration))
+    elif args.command == "utilization":
+        store.update_utilization(args.max_parallel)
+    elif args.command == "concurrency":
+        print(store.adjust_concurrency(args.active, args.min_limit, args.max_limit))
+    elif args.command == "checkpoint":
+        store.record_checkpoint(args.type, args.iteration)
+    elif args.command == "add-dependency":
+        store.add_dependency(args.from_task, args.to_task, args.confidence, args.by, args.status,
+                             args.reason, args.if_new)
+    elif args.command == "review-section":
+        store.mark_reviewed(args.section)
+    elif args.command == "unblock":
+        store.unblock(args.task_id, args.strategy, args.details)
+    elif args.command == "rework":
+        store.rework(args.task_ids, args.reason)
+    else:
+        raise ValueError(f"Unsupported command: {args.command}")
+    return args.command not in READ_COMMANDS
+
+
+def record_in_journal(journal_file: Path, args: argparse.Namespace) -> None:
+    from journal import Journal  # journal.py replays through this module
+    journal = Journal(journal_file)
+    try:
+        journal.append_command(args)
+    finally:
+        journal.close()
+
+
+def sync_journal(journal_file: Path) -> None:
+    from journal import Journal
+    journal = Journal(journal_file)
+    try:
+        journal.sync()
+    finally:
+        journal.close()
+
+
+def main():
+    arg_parser, _ = build_parser()
+    arg_parser.add_argument("--journal", type=Path, default=os.environ.get("SVAO_JOURNAL") or None,
+                            help="Session journal to record changes in (default: $SVAO_JOURNAL)")
+    args = arg_parser.parse_args()
+
+    db_path = args.db or default_db_path(args.state_file)
+
+    if args.command == "import":
+        if not args.state_file.exists():
+            print(f"❌ State file not found: {args.state_file}", file=sys.stderr)
+            sys.exit(1)
+        result = open_state(args.state_file, db_path, args.resume)
+        if result == "kept":
+            # The database may be ahead of the snapshot; bring the snapshot up to date
+            store = StateStore(db_path)
+            jsonio.write(args.state_file, store.export_state(), pretty=True)
+            store.close()
+        print(f"{result} {db_path}", file=sys.stderr)
+        return
+
+    if not db_path.exists():
+        print(f"❌ State database not found: {db_path} (run: state_store.py {args.state_file} import)",
+              file=sys.stderr)
+        sys.exit(1)
+
+    store = StateStore(db_path)
+    try:
+        if args.command == "export":
+            if args.stdout:
+                jsonio.dump(store.export_state(), sys.stdout, pretty=not args.compact)
+            else:
+                jsonio.write(args.state_file, store.export_state(), pretty=not args.compact)
+                if args.journal:
+                    # An exported snapshot and the journal behind it reach the disk together
+                    sync_journal(args.journal)
+        elif run_command(store, args) and args.journal:
+            record_in_journal(args.journal, args)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
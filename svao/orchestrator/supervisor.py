@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+SVAO Agent Supervisor
+Runs the dispatch loop's `claude --print` workers as asyncio subprocesses.
+Each worker's output is streamed to ${task_id}.output and scanned for stop
+signals as it arrives (see signals.py; dependency discoveries and blockers
+are emitted at once); when the process exits the supervisor writes the
+final status file and sends TASK_COMPLETE or TASK_FAILED on the event
+channel (see events.py). The exit is awaited, not polled, and the supervisor is the only
+writer of .active_pids. A finished worker keeps its slot until the
+dispatch loop has handled its event and releases it, so the loop never
+sees fewer active agents than it has events for.
+
+Commands are served over a Unix socket with daemon.py's protocol (one JSON
+line each way), so daemon_client.py talks to both:
+    spawn TASK_ID AGENT --started-at TS   start a worker on ${task_id}.prompt
+    release TASK_ID                       free a finished worker's slot
+    active                                number of agents holding a slot
+    list                                  PID:NAME per agent holding a slot
+    track PID NAME / untrack NAME         agents started elsewhere (phase reviews)
+    ping / shutdown
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import shutil
+import signal
+import sys
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import dataclass
+from pathlib import Path
+
+import jsonio
+from events import emit_event
+from signals import READ_CHUNK, SignalScanner, load_stop_signals
+
+AGENT_COMMAND = ["claude", "--print", "--permission-mode", "bypassPermissions"]
+
+# Stand-in worker when the Claude CLI is not installed (as dispatch.sh has always done)
+SIMULATED_COMMAND = ["sh", "-c", 'sleep 2; echo "TASK_COMPLETE: $1"', "sh"]
+
+STATUS_WRITER = Path(__file__).parent / "status-writer.sh"
+
+# Seconds between liveness checks of tracked processes we did not start
+TRACK_POLL_INTERVAL = 2.0
+
+
+@dataclass(slots=True)
+class Worker:
+    task_id: str
+    agent: str
+    started_at: str
+    process: asyncio.subprocess.Process
+    scanner: SignalScanner
+
+
+class Supervisor:
+    """
+    Worker processes and event emission for one dispatch session.
+
+    Examples:
+        supervisor = Supervisor(Path("/tmp/svao/svao-20260101-120000"), session_id, event_socket)
+        await supervisor.spawn("1.1", "backend-coder", "2026-01-01T12:00:00Z") -> pid
+    """
+
+    def __init__(self, status_dir: Path, session_id: str, event_socket: Path | None):
+        self.status_dir = status_dir
+        self.session_id = session_id
+        self.event_socket = event_socket
+        self.active_file = status_dir / ".active_pids"
+        self.stop_signals = load_stop_signals()
+
+        self.workers: dict[str, Worker] = {}
+        self.tracked: dict[str, int] = {}
+        self._supervising: set[asyncio.Task] = set()  # Keeps worker tasks referenced
+        # Agents listed by an earlier dispatch run (e.g. still running on --resume)
+        if self.active_file.exists():
+            for line in self.active_file.read_text().splitlines():
+                pid, _, name = line.partition(":")
+                if pid.isdigit() and name:
+                    self.tracked[name] = int(pid)
+
+        self.parser = argparse.ArgumentParser(prog="supervisor", add_help=False)
+        commands = self.parser.add_subparsers(dest="command", required=True)
+        command = commands.add_parser("spawn")
+        command.add_argument("task_id")
+        command.add_argument("agent")
+        command.add_argument("--started-at", required=True)
+        command = commands.add_parser("release")
+        command.add_argument("task_id")
+        commands.add_parser("active")
+        commands.add_parser("list")
+        command = commands.add_parser("track")
+        command.add_argument("pid", type=int)
+        command.add_argument("name")
+        command = commands.add_parser("untrack")
+        command.add_argument("name")
+        commands.add_parser("ping")
+        commands.add_parser("shutdown")
+
+        self.stopping = asyncio.Event()
+
+    def running(self) -> list[tuple[int, str]]:
+        return ([(worker.process.pid, task_id) for task_id, worker in self.workers.items()]
+                + [(pid, name) for name, pid in self.tracked.items()])
+
+    def write_active(self) -> None:
+        """Snapshot running agents to .active_pids (read by status display and --resume)."""
+        jsonio.write_text(self.active_file, "".join(f"{pid}:{name}\n" for pid, name in self.running()))
+
+    async def spawn(self, task_id: str, agent: str, started_at: str) -> int:
+        if task_id in self.workers:
+            raise ValueError(f"Task {task_id} already has a running agent")
+
+        prompt_file = self.status_dir / f"{task_id}.prompt"
+        if shutil.which(AGENT_COMMAND[0]):
+            command = AGENT_COMMAND
+        else:
+            print(f"⚠️ Claude CLI not found, simulating task {task_id}", file=sys.stderr)
+            command = [*SIMULATED_COMMAND, task_id]
+
+        with open(prompt_file, "rb") as prompt:
+            process = await asyncio.create_subprocess_exec(
+                *command, stdin=prompt, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT)
+
+        worker = Worker(task_id, agent, started_at, process, SignalScanner(task_id, self.stop_signals))
+        self.workers[task_id] = worker
+        self.write_active()
+        task = asyncio.create_task(self.supervise(worker))
+        self._supervising.add(task)
+        task.add_done_callback(self._supervising.discard)
+        return process.pid
+
+    async def supervise(self, worker: Worker) -> None:
+        """Stream output until exit, then report the result."""
+        output_file = self.status_dir / f"{worker.task_id}.output"
+        with open(output_file, "wb") as output:
+            while chunk := await worker.process.stdout.read(READ_CHUNK):
+                output.write(chunk)
+                output.flush()
+                for event in worker.scanner.feed(chunk):
+                    await self.emit(event)
+        for event in worker.scanner.finish():
+            await self.emit(event)
+        await worker.process.wait()
+
+        scanner = worker.scanner
+        event = "TASK_FAILED"
+        try:
+            if scanner.completed:
+                await self.write_status(worker, "complete", "TASK_COMPLETE")
+                event = "TASK_COMPLETE"
+            elif scanner.blocked:
+                await self.write_status(worker, "failed", scanner.blocked, "See output file")
+            else:
+                await self.write_status(worker, "failed", "UNKNOWN", "Agent exited without signal")
+        except OSError as e:
+            print(f"❌ Could not write status for task {worker.task_id}: {e}", file=sys.stderr)
+        finally:
+            await self.emit(f"{event}:{worker.task_id}")
+
+    async def emit(self, event: str) -> None:
+        """Send an event; a full channel makes the sender wait, so not on the event loop."""
+        await asyncio.to_thread(emit_event, self.event_socket, event)
+
+    async def write_status(self, worker: Worker, *args: str) -> None:
+        env = dict(os.environ, SVAO_STATUS_DIR=str(self.status_dir), SVAO_SESSION_ID=self.session_id,
+                   SVAO_TASK_ID=worker.task_id, SVAO_AGENT=worker.agent, SVAO_STARTED=worker.started_at)
+        process = await asyncio.create_subprocess_exec(str(STATUS_WRITER), *args, env=env)
+        await process.wait()
+
+    async def watch_tracked(self) -> None:
+        """Processes we did not start can't be awaited; check them periodically."""
+        while True:
+            await asyncio.sleep(TRACK_POLL_INTERVAL)
+            exited = []
+            for name, pid in list(self.tracked.items()):
+                try:
+                    os.kill(pid, 0)
+                except ProcessLookupError:
+                    exited.append(name)
+                except PermissionError:
+                    pass
+            for name in exited:
+                del self.tracked[name]
+            if exited:
+                self.write_active()
+            for name in exited:
+                # Phase reviewers report their own result
+                if not name.startswith("phase-review-"):
+                    await self.emit(f"AGENT_EXITED:{name}")
+
+    async def execute(self, argv: list[str]) -> dict:
+        out, err = io.StringIO(), io.StringIO()
+        status = 0
+        try:
+            with redirect_stdout(out), redirect_stderr(err):
+                args = self.parser.parse_args(argv)
+            if args.command == "spawn":
+                pid = await self.spawn(args.task_id, args.agent, args.started_at)
+                out.write(f"{pid}\n")
+            elif args.command == "release":
+                worker = self.workers.get(args.task_id)
+                if worker is not None and worker.process.returncode is not None:
+                    del self.workers[args.task_id]
+                    self.write_active()
+            elif args.command == "active":
+                out.write(f"{len(self.running())}\n")
+            elif args.command == "list":
+                out.write("".join(f"{pid}:{name}\n" for pid, name in self.running()))
+            elif args.command == "track":
+                self.tracked[args.name] = args.pid
+                self.write_active()
+            elif args.command == "untrack":
+                if self.tracked.pop(args.name, None) is not None:
+                    self.write_active()
+            elif args.command == "ping":
+                out.write("pong\n")
+            elif args.command == "shutdown":
+                self.stopping.set()
+        except SystemExit as e:  # argparse errors
+            status = e.code if isinstance(e.code, int) else 1
+        except (ValueError, OSError) as e:
+            err.write(f"❌ {e}\n")
+            status = 1
+        return {"status": status, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    argv = jsonio.loads(line)["argv"]
+                except (ValueError, KeyError, TypeError):
+                    response = {"status": 1, "stdout": "", "stderr": "❌ Malformed request\n"}
+                else:
+                    response = await self.execute([str(arg) for arg in argv])
+                writer.write(jsonio.dumps(response).encode() + b"\n")
+                await writer.drain()
+                if self.stopping.is_set():
+                    break  # Don't leave a handler waiting on a closing server
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def watch_parent(self, parent_pid: int) -> None:
+        """Shut down if the dispatch loop that started us is gone."""
+        while True:
+            await asyncio.sleep(TRACK_POLL_INTERVAL)
+            try:
+                os.kill(parent_pid, 0)
+            except ProcessLookupError:
+                self.stopping.set()
+                return
+            except PermissionError:
+                pass
+
+    async def serve(self, socket_path: Path, parent_pid: int | None = None) -> None:
+        if socket_path.exists():
+            socket_path.unlink()
+        server = await asyncio.start_unix_server(self.handle_client, path=str(socket_path))
+        os.chmod(socket_path, 0o600)
+
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, self.stopping.set)
+
+        background = [asyncio.create_task(self.watch_tracked())]
+        if parent_pid:
+            background.append(asyncio.create_task(self.watch_parent(parent_pid)))
+
+        async with server:
+            await self.stopping.wait()
+        for task in background:
+            task.cancel()
+        # Workers still running stay in .active_pids, so --resume finds them
+        for worker in self.workers.values():
+            if worker.process.returncode is None:
+                worker.process.terminate()
+        socket_path.unlink(missing_ok=True)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Supervise dispatch agent processes")
+    arg_parser.add_argument("status_dir", type=Path, help="Session status directory (/tmp/svao/<session>)")
+    arg_parser.add_argument("--session-id", required=True, help="Session ID for agent status files")
+    arg_parser.add_argument("--socket", type=Path, required=True, help="Unix socket to listen on")
+    arg_parser.add_argument("--event-socket", type=Path, help="Dispatch loop event socket")
+    arg_parser.add_argument("--parent-pid", type=int, help="Exit when this process exits")
+    args = arg_parser.parse_args()
+
+    if not args.status_dir.is_dir():
+        print(f"❌ Directory not found: {args.status_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    async def run() -> None:
+        await Supervisor(args.status_dir, args.session_id, args.event_socket).serve(args.socket, args.parent_pid)
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -44,8 +44,10 @@ Usage: svao.sh <command> [options]
 
 Commands:
   compile <change-id>        Compile OpenSpec to PRD
+  compile --all              Compile every changed OpenSpec change in parallel
   dispatch <change-id>       Run parallel dispatch for a compiled PRD
   status <change-id>         Show execution status for a change
+  replay <change-id>         Rebuild prd-state.json from the session journal
   checkpoint <type> <id>     Manually invoke a checkpoint
   pr <change-id> <section>   Create PR for a completed section
   run <agent-type> <task>    Run single agent with a task description
@@ -55,17 +57,28 @@ Commands:
 
 Dispatch Options:
   --max-parallel N           Maximum concurrent agents (default: 3)
+  --adaptive                 Adjust concurrency to host load, up to --max-parallel
+  --min-parallel N           Lowest adaptive concurrency (default: 1)
+  --queue-policy P           Ready queue order: id or critical-path (default: id)
   --max-iterations N         Maximum iterations (default: 50)
   --resume                   Resume an interrupted session
 
+Replay Options:
+  --session ID               Session to replay (default: prd-state.json's, else the newest)
+  --stdout                   Print the state instead of writing prd-state.json
+
 Options:
   -h, --help                 Show this help message
 
 Examples:
   svao.sh compile my-feature
+  svao.sh compile --all
   svao.sh dispatch my-feature
   svao.sh dispatch my-feature --max-parallel 5
+  svao.sh dispatch my-feature --adaptive --max-parallel 8
+  svao.sh dispatch my-feature --queue-policy critical-path
   svao.sh status my-feature
+  svao.sh replay my-feature --stdout
   svao.sh run frontend-coder "Create a Button component"
 EOF
   exit 0
@@ -117,18 +130,32 @@ cmd_dispatch() {
 
   # Parse additional options
   local max_parallel=3
+  local min_parallel=1
+  local adaptive=false
+  local queue_policy="${SVAO_QUEUE_POLICY:-id}"
   local max_iterations=50
   local resume=false
 
   while [[ $# -gt 0 ]]; do
     case $1 in
       --max-parallel) max_parallel="$2"; shift 2 ;;
+      --min-parallel) min_parallel="$2"; shift 2 ;;
+      --adaptive) adaptive=true; shift ;;
+      --queue-policy) queue_policy="$2"; shift 2 ;;
       --max-iterations) max_iterations="$2"; shift 2 ;;
       --resume) resume=true; shift ;;
       *) shift ;;
     esac
   done
 
+  case "$queue_policy" in
+    id|critical-path) ;;
+    *)
+      log_error "Unknown queue policy: $queue_policy (expected id or critical-path)"
+      exit 1
+      ;;
+  esac
+
   # Find change directory
   local change_dir=""
   for candidate in "openspec/changes/$change_id" ".claude/changes/$change_id"; do
@@ -172,9 +199,14 @@ cmd_dispatch() {
   log_info "Running SVAO for: $change_id"
   log_info "PRD: $prd_file"
   log_info "Max parallel: $max_parallel"
+  [[ "$adaptive" == "true" ]] && log_info "Adaptive concurrency: $min_parallel-$max_parallel"
+  [[ "$queue_policy" != "id" ]] && log_info "Queue policy: $queue_policy"
   [[ "$resume" == "true" ]] && log_info "Mode: Resume"
 
   export MAX_PARALLEL="$max_parallel"
+  export MIN_PARALLEL="$min_parallel"
+  export SVAO_ADAPTIVE_PARALLEL="$adaptive"
+  export SVAO_QUEUE_POLICY="$queue_policy"
   export MAX_ITERATIONS="$max_iterations"
   export SVAO_RESUME="$resume"
 
@@ -232,6 +264,60 @@ cmd_status() {
   fi
 }
 
+cmd_replay() {
+  local change_id="$1"
+  shift
+
+  local session_id=""
+  local replay_args=()
+
+  while [[ $# -gt 0 ]]; do
+    case $1 in
+      --session) session_id="$2"; shift 2 ;;
+      --stdout) replay_args+=(--stdout); shift ;;
+      *) shift ;;
+    esac
+  done
+
+  local change_dir=""
+  for candidate in "openspec/changes/$change_id" ".claude/changes/$change_id"; do
+    if [[ -d "$candidate" ]]; then
+      change_dir="$candidate"
+      break
+    fi
+  done
+
+  if [[ -z "$change_dir" ]]; then
+    log_error "Change not found: $change_id"
+    exit 1
+  fi
+
+  local prd_file="$change_dir/prd.json"
+  local state_file="$change_dir/prd-state.json"
+  local journal_dir="$change_dir/journal"
+
+  if [[ -z "$session_id" ]]; then
+    session_id=$(jq -r '.session.id // empty' "$state_file" 2>/dev/null || true)
+    if [[ -z "$session_id" || ! -f "$journal_dir/$session_id.ndjson" ]]; then
+      # prd-state.json may be the file that needs rebuilding; take the newest journal
+      local latest
+      latest=$(ls -t "$journal_dir"/*.ndjson 2>/dev/null | head -1 || true)
+      session_id=$(basename "${latest:-none}" .ndjson)
+    fi
+  fi
+
+  local journal_file="$journal_dir/$session_id.ndjson"
+  if [[ ! -f "$journal_file" ]]; then
+    log_error "No session journal found in $journal_dir"
+    exit 1
+  fi
+
+  python3 "$SCRIPT_DIR/journal.py" replay "$journal_file" "$prd_file" "$state_file" \
+    ${replay_args[@]+"${replay_args[@]}"}
+  [[ ${#replay_args[@]} -eq 0 ]] && log_success "Rebuilt $state_file from session $session_id"
+  return 0
+}
+
 cmd_run() {
   local agent_type="$1"
   local task="$2"
@@ -364,7 +450,7 @@ EOF
 case "${1:-}" in
   -h|--help) usage ;;
   compile)
-    [[ $# -lt 2 ]] && log_error "Missing change-id" && exit 1
+    [[ $# -lt 2 ]] && log_error "Missing change-id (or --all)" && exit 1
     shift
     "$SCRIPT_DIR/compile.sh" "$@"
     ;;
@@ -377,6 +463,11 @@ case "${1:-}" in
     [[ $# -lt 2 ]] && log_error "Missing change-id" && exit 1
     cmd_status "$2"
     ;;
+  replay)
+    [[ $# -lt 2 ]] && log_error "Missing change-id" && exit 1
+    shift
+    cmd_replay "$@"
+    ;;
   checkpoint)
     shift
     checkpoint_type="${1:-}"